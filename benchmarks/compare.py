@@ -0,0 +1,49 @@
+"""Compare two benchmark result files and fail on regressions.
+
+Usage:
+    python benchmarks/compare.py BASELINE.json CANDIDATE.json [--threshold 0.2]
+
+Exits with status 1 when any benchmark's median got slower by more than the
+threshold (0.2 = 20%).
+"""
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)['benchmarks']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown of the median as a fraction (default 0.2)')
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+
+    regressions = []
+    for name in sorted(set(baseline) | set(candidate)):
+        if name not in baseline or name not in candidate:
+            print(f"{name:45s} {'only in ' + ('candidate' if name in candidate else 'baseline'):>30s}")
+            continue
+        before = baseline[name]['median']
+        after = candidate[name]['median']
+        change = after / before - 1 if before else 0.0
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -args.threshold:
+            flag = '  faster'
+        print(f"{name:45s} {before * 1e3:10.3f} ms -> {after * 1e3:10.3f} ms  {change:+7.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
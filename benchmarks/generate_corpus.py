@@ -0,0 +1,143 @@
+"""Generate the synthetic benchmark corpus (deterministic; output is checked in).
+
+Usage: python benchmarks/generate_corpus.py
+"""
+import os
+import random
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from html import escape
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+SUBJECTS = [
+    'Deep learning model', 'Artificial intelligence tool', 'Machine learning algorithm',
+    'Hospital system', 'FDA', 'Radiologists', 'Health system', 'AI-powered platform',
+    'Neural network', 'Startup', 'Clinicians', 'Payers'
+]
+VERBS = [
+    'improves', 'accelerates', 'flags', 'triages', 'reduces errors in', 'clears',
+    'expands', 'automates', 'predicts outcomes from', 'streamlines'
+]
+OBJECTS = [
+    'chest x-ray reading', 'CT scan triage', 'MRI reconstruction', 'mammography screening',
+    'patient scheduling', 'clinical documentation', 'EHR workflows', 'ultrasound exams',
+    'nuclear medicine studies', 'medical imaging reports', 'hospital staffing',
+    'prior authorization', 'stroke detection', 'lung nodule follow-up'
+]
+FILLER = [
+    'The study enrolled patients across several hospitals.',
+    'Researchers said the results still need prospective validation.',
+    'The company declined to share pricing details.',
+    'Physicians reported shorter turnaround times during the pilot.',
+    'Regulators are weighing new guidance on clinical decision support.',
+    'The model was trained on more than a million de-identified images.',
+    'Executives maintain the rollout will continue through next year.',
+    'Critics said the algorithm may not generalize to smaller practices.'
+]
+
+def headline(rng):
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+
+def paragraph(rng, sentences=4):
+    return ' '.join(rng.choice(FILLER) for _ in range(sentences))
+
+def rss_feed(rng, name, base_url, count, start):
+    items = []
+    for i in range(count):
+        published = start - timedelta(hours=7 * i)
+        items.append(
+            f"<item><title>{escape(headline(rng))}</title>"
+            f"<link>{base_url}/article/{i}</link>"
+            f"<description>{escape(paragraph(rng, 2))}</description>"
+            f"<pubDate>{format_datetime(published)}</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<rss version="2.0"><channel><title>{name}</title><link>{base_url}</link>\n'
+        + '\n'.join(items) + '\n</channel></rss>\n'
+    )
+
+def acr_listing(rng, count, start):
+    items = []
+    for i in range(count):
+        published = start - timedelta(days=3 * i)
+        items.append(
+            '<div class="news-item">'
+            f'<h3 class="title"><a href="/Media-Center/ACR-News-Releases/{i}">{escape(headline(rng))}</a></h3>'
+            f'<span class="date">{published.strftime("%B %d, %Y")}</span>'
+            f'<p class="summary">{escape(paragraph(rng, 2))}</p>'
+            '</div>'
+        )
+    return (
+        '<html><head><title>ACR News</title>'
+        '<script>var csrf="token-abc123";</script></head><body>'
+        '<nav class="menu">' + '<a href="/x">Menu</a>' * 40 + '</nav>'
+        '<div class="news-listing">' + '\n'.join(items) + '</div>'
+        '<footer>' + '<p>Footer link</p>' * 20 + '</footer></body></html>\n'
+    )
+
+def rsna_toc(rng, count, start):
+    items = []
+    for i in range(count):
+        published = start - timedelta(days=2 * i)
+        items.append(
+            '<div class="issue-item"><div class="item__content">'
+            f'<h5 class="item__title"><a href="/doi/10.1148/ryai.{240000 + i}">{escape(headline(rng))}</a></h5>'
+            f'<span class="article-date">{published.strftime("%B %d, %Y")}</span>'
+            f'<div class="item__abstract">{escape(paragraph(rng, 3))}</div>'
+            '</div></div>'
+        )
+    return (
+        '<html><head><title>Radiology: Artificial Intelligence</title></head><body>'
+        '<div class="toc">' + '\n'.join(items) + '</div></body></html>\n'
+    )
+
+def mh_search(rng, count, start):
+    items = []
+    for i in range(count):
+        published = start - timedelta(days=i)
+        items.append(
+            '<article class="search-result">'
+            f'<h2><a href="/technology/{i}">{escape(headline(rng))}</a></h2>'
+            f'<time datetime="{published.strftime("%Y-%m-%dT%H:%M:%S")}"></time>'
+            f'<p class="summary">{escape(paragraph(rng, 2))}</p>'
+            '</article>'
+        )
+    return '<html><body><div class="results">' + '\n'.join(items) + '</div></body></html>\n'
+
+def article_page(rng, paragraphs=25):
+    body = ''.join(
+        (f'<h2>{escape(headline(rng))}</h2>' if i % 6 == 0 else '') + f'<p>{escape(paragraph(rng, 5))}</p>'
+        for i in range(paragraphs)
+    )
+    return (
+        f'<html><head><title>{escape(headline(rng))}</title></head><body>'
+        '<div class="article__content"><div class="article-section__abstract">'
+        f'<p>{escape(paragraph(rng, 4))}</p></div>'
+        f'<article>{body}</article></div></body></html>\n'
+    )
+
+def main():
+    rng = random.Random(20240101)
+    start = datetime(2024, 6, 3, 12, 0, 0)
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    files = {
+        'stat_feed.xml': rss_feed(rng, 'STAT', 'https://www.statnews.com', 60, start),
+        'auntminnie_feed.xml': rss_feed(rng, 'AuntMinnie', 'https://www.auntminnie.com', 60, start),
+        'beckers_feed.xml': rss_feed(rng, 'Beckers', 'https://www.beckershospitalreview.com', 60, start),
+        'hitn_feed.xml': rss_feed(rng, 'Healthcare IT News', 'https://www.healthcareitnews.com', 60, start),
+        'acr_listing.html': acr_listing(rng, 40, start),
+        'rsna_toc.html': rsna_toc(rng, 30, start),
+        'mh_search.html': mh_search(rng, 25, start)
+    }
+    for i in range(5):
+        files[f'article_{i}.html'] = article_page(rng)
+
+    for name, content in files.items():
+        with open(os.path.join(CORPUS_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+    print(f"Wrote {len(files)} files to {CORPUS_DIR}")
+
+if __name__ == '__main__':
+    main()
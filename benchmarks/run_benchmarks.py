@@ -0,0 +1,242 @@
+"""Offline microbenchmarks for the bot's hot paths.
+
+Times each stage separately against the checked-in synthetic corpus and
+writes the results as JSON so runs can be compared between commits with
+benchmarks/compare.py.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--output FILE] [--sizes 100 1000 10000 100000] [--only PREFIX]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+sys.path[:0] = [ROOT_DIR, BENCH_DIR]
+
+import feedparser
+import numpy as np
+from generate_corpus import headline, paragraph
+from src.aggregator.news_aggregator import NewsAggregator
+from src.filters.content_filter import ContentFilter
+from src.filters.diversity import mmr_select, term_vectors
+from src.filters.prefilter import prefilter, tokenize
+from src.filters.takeaways import TakeawayExtractor
+from src.scrapers.acr_scraper import ACRScraper
+from src.scrapers.fingerprint import fragment_fingerprint
+from src.scrapers.auntminnie_scraper import AuntMinnieScraper
+from src.scrapers.beckers_scraper import BeckersScraper
+from src.scrapers.healthcare_it_news_scraper import HealthcareITNewsScraper
+from src.scrapers.modern_healthcare_scraper import ModernHealthcareScraper
+from src.scrapers.rsna_ai_scraper import RSNAAIScraper
+from src.scrapers.stat_scraper import StatScraper
+from src.storage.trend_history import TrendHistory
+from src.image_generator import create_cover_image
+from src.post_formatter import PostFormatter
+from src.profiling import add_profile_arguments, make_profiler, stage
+
+def read_corpus(name):
+    with open(os.path.join(CORPUS_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+def measure(fn, repeat=5, min_time=0.05):
+    """Per-call timings: calibrate loop count so each sample takes >= min_time"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'number': number,
+        'repeat': repeat
+    }
+
+def synthetic_articles(count, seed=7):
+    """Candidate articles shaped like gather_candidates() output"""
+    rng = random.Random(seed)
+    sources = ['RSNA AI', 'ACR News', 'AuntMinnie', 'STAT', 'ModernHealthcare',
+               'HealthcareITNews', 'Beckers']
+    priorities = {'RSNA AI': 1, 'ACR News': 2, 'AuntMinnie': 3}
+    articles = []
+    for i in range(count):
+        source = sources[i % len(sources)]
+        articles.append({
+            'title': headline(rng),
+            'url': f'https://example.org/{i}',
+            'summary': paragraph(rng, 2),
+            'source': source,
+            'priority': priorities.get(source, 4)
+        })
+    return articles
+
+def build_benchmarks(sizes, workdir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        scrapers = {
+            'stat': StatScraper(), 'auntminnie': AuntMinnieScraper(), 'beckers': BeckersScraper(),
+            'hitn': HealthcareITNewsScraper(), 'acr': ACRScraper(), 'rsna': RSNAAIScraper(),
+            'mh': ModernHealthcareScraper()
+        }
+        aggregator = NewsAggregator()
+        formatter = PostFormatter()
+    content_filter = ContentFilter()
+
+    feeds = {
+        'stat': read_corpus('stat_feed.xml'), 'auntminnie': read_corpus('auntminnie_feed.xml'),
+        'beckers': read_corpus('beckers_feed.xml'), 'hitn': read_corpus('hitn_feed.xml')
+    }
+    acr_html = read_corpus('acr_listing.html')
+    rsna_html = read_corpus('rsna_toc.html')
+    mh_html = read_corpus('mh_search.html')
+
+    texts = [f"{a['title']} {a['summary']}" for a in synthetic_articles(200, seed=11)]
+    digest = aggregator._process_articles(synthetic_articles(200))
+    current_date = datetime(2024, 6, 3)
+
+    benchmarks = {}
+    for name, content in feeds.items():
+        scraper = scrapers[name]
+        benchmarks[f'parse.{name}_feed'] = (
+            lambda scraper=scraper, content=content:
+                scraper._articles_from_entries(feedparser.parse(content).entries)
+        )
+    benchmarks['parse.acr_listing'] = lambda: scrapers['acr']._parse_listing(acr_html)
+    benchmarks['parse.rsna_toc'] = lambda: scrapers['rsna']._parse_toc(rsna_html)
+    benchmarks['parse.mh_search'] = lambda: scrapers['mh']._parse_search_results(mh_html)
+    # What an unchanged listing costs instead of the parse above
+    benchmarks['parse.acr_listing_fingerprint'] = (
+        lambda: fragment_fingerprint(acr_html, ACRScraper.fingerprint_markers['listing'])
+    )
+
+    # Tokens are memoized across calls; clear them so every run tokenizes afresh
+    benchmarks['filter.prefilter[200]'] = (
+        lambda: (tokenize.cache_clear(), [prefilter.check(text, 'ai', 'healthcare') for text in texts])
+    )
+    benchmarks['filter.calculate_relevance_score[200]'] = (
+        lambda: (tokenize.cache_clear(), [content_filter.calculate_relevance_score(text) for text in texts])
+    )
+    benchmarks['filter.is_relevant[200]'] = (
+        lambda: (tokenize.cache_clear(), [content_filter.is_relevant(text) for text in texts])
+    )
+
+    candidates = synthetic_articles(300, seed=13)
+    candidate_texts = [f"{a['title']} {a['summary']}".lower() for a in candidates]
+    vectors = term_vectors(candidate_texts)
+    similarity = vectors @ vectors.T
+    relevance = [random.Random(i).random() for i in range(len(candidates))]
+    sources = [a['source'] for a in candidates]
+    benchmarks['select.term_vectors[300]'] = lambda: term_vectors(candidate_texts)
+    benchmarks['select.mmr[300]'] = lambda: mmr_select(relevance, similarity, sources, 5, 0.3, 3)
+
+    # A fresh extractor per call, so the content-hash cache never hits
+    page_rng = random.Random(17)
+    pages = ['\n'.join(paragraph(page_rng, 4) for _ in range(3)) for _ in range(300)]
+    benchmarks['summarize.takeaways[300]'] = lambda: TakeawayExtractor().extract_many(pages)
+
+    for size in sizes:
+        articles = synthetic_articles(size)
+        benchmarks[f'aggregate.process_articles[{size}]'] = (
+            lambda articles=articles: aggregator._process_articles(articles)
+        )
+
+    # Three years of weekly partitions, 500 articles each; queries memory-map them
+    history = TrendHistory(os.path.join(workdir, 'history'))
+    keywords = aggregator.history_keywords
+    history_rng = np.random.default_rng(19)
+    for week in range(156):
+        batch = [dict(candidates[i % len(candidates)], url=f'https://example.org/{week}/{i}')
+                 for i in range(500)]
+        counts = history_rng.poisson(0.05, (len(keywords), len(batch)))
+        history.append(batch, keywords, counts, seen=datetime(2023, 6, 5) + timedelta(weeks=week))
+    benchmarks['history.mentions[156w]'] = lambda: history.mentions(['mammography', 'fda'])
+    benchmarks['history.source_share[156w]'] = lambda: history.source_share()
+    benchmarks['history.trends'] = lambda: history.trends(history.weeks()[-1], keywords)
+
+    benchmarks['format.format_post'] = lambda: formatter.format_post(digest, current_date)
+    benchmarks['render.create_cover_image'] = lambda: create_cover_image(current_date)
+    return benchmarks
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<git rev>.json)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000],
+                        help='Article counts for the aggregation benchmark (add 100000 for the full sweep)')
+    parser.add_argument('--only', help='Only run benchmarks whose name starts with this prefix')
+    parser.add_argument('--repeat', type=int, default=5)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    revision = git_revision()
+    output = args.output or os.path.join(BENCH_DIR, 'results', f'{revision}.json')
+    # Rendering writes into images/ and the history benchmarks into history/;
+    # keep both out of the working tree
+    workdir = tempfile.TemporaryDirectory()
+    benchmarks = build_benchmarks(args.sizes, workdir.name)
+
+    # Profiles of the fixed corpus are reproducible run to run
+    profiler = make_profiler(args.profile, os.path.join(BENCH_DIR, 'results', 'profiles'),
+                             revision, args.profile_interval)
+
+    results = {}
+    with workdir, profiler.run() if profiler else contextlib.nullcontext():
+        cwd = os.getcwd()
+        os.chdir(workdir.name)
+        try:
+            for name, fn in benchmarks.items():
+                if args.only and not name.startswith(args.only):
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()), stage(profiler, name):
+                    results[name] = measure(fn, repeat=args.repeat)
+                print(f"{name:45s} {results[name]['median'] * 1e3:10.3f} ms  "
+                      f"(min {results[name]['min'] * 1e3:.3f} ms, n={results[name]['number']})")
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        'meta': {
+            'revision': revision,
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor()
+        },
+        'benchmarks': results
+    }
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+if __name__ == '__main__':
+    main()
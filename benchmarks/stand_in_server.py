@@ -0,0 +1,137 @@
+"""Local stand-ins for the external APIs the bot calls, for runs without the network.
+
+Serves NewsAPI's /v2/everything with deterministic synthetic results. Each
+response counts against a daily quota, answering 429 rateLimited once the
+quota is spent, and can be delayed to make concurrent requests overlap.
+
+Under /linkedin it serves the endpoints HttpTransport expects: /login sets a
+session cookie, and /me, /images and /posts require it. Posts are kept in
+memory and listed by GET /linkedin/posts.
+
+GET /stats returns the requests received per endpoint, query, page and status.
+
+Usage:
+    python benchmarks/stand_in_server.py [--port 8766] [--quota 100] [--delay 0.2]
+    NEWS_API_BASE_URL=http://127.0.0.1:8766/v2 NEWS_API_KEY=test \
+    LINKEDIN_BASE_URL=http://127.0.0.1:8766/linkedin PYTHONPATH=. python src/main.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import secrets
+import sys
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from aiohttp import web
+from generate_corpus import headline, paragraph
+
+# Results every query claims to have, so paging runs past the first page
+TOTAL_RESULTS = 250
+
+def newsapi_articles(query, page, page_size):
+    rng = random.Random(zlib.crc32(query.encode('utf-8')))
+    now = datetime(2026, 1, 5, 12)
+    articles = []
+    for i in range((page - 1) * page_size, min(page * page_size, TOTAL_RESULTS)):
+        articles.append({
+            'source': {'id': None, 'name': rng.choice(['Reuters', 'Fierce Healthcare', 'MedCity News'])},
+            'title': headline(rng),
+            'description': paragraph(rng, 2),
+            'url': f'https://news.example.org/{zlib.crc32(query.encode("utf-8"))}/{i}',
+            'publishedAt': (now - timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+    return articles
+
+def make_app(quota, delay):
+    stats = Counter()
+
+    async def everything(request):
+        query = request.query.get('q', '')
+        page = int(request.query.get('page', '1'))
+        page_size = min(int(request.query.get('pageSize', '100')), 100)
+        if not request.headers.get('X-Api-Key'):
+            stats['401'] += 1
+            return web.json_response({'status': 'error', 'code': 'apiKeyMissing',
+                                      'message': 'Your API key is missing.'}, status=401)
+        if stats['200'] >= quota:
+            stats['429'] += 1
+            return web.json_response({'status': 'error', 'code': 'rateLimited',
+                                      'message': 'You have made too many requests recently.'}, status=429)
+        await asyncio.sleep(delay)
+        stats['200'] += 1
+        stats[f'{query}|page={page}'] += 1
+        return web.json_response({'status': 'ok', 'totalResults': TOTAL_RESULTS,
+                                  'articles': newsapi_articles(query, page, page_size)})
+
+    sessions = set()
+    posts = []
+
+    def authenticated(handler):
+        async def wrapper(request):
+            if request.cookies.get('li_at') not in sessions:
+                stats['linkedin 401'] += 1
+                return web.json_response({'message': 'Unauthorized'}, status=401)
+            return await handler(request)
+        return wrapper
+
+    async def login(request):
+        body = await request.json()
+        stats['linkedin login'] += 1
+        if not body.get('username') or not body.get('password'):
+            return web.json_response({'message': 'Bad credentials'}, status=401)
+        token = secrets.token_hex(16)
+        sessions.add(token)
+        response = web.json_response({'status': 'ok'})
+        response.set_cookie('li_at', token, path='/')
+        return response
+
+    @authenticated
+    async def me(request):
+        stats['linkedin me'] += 1
+        return web.json_response({'id': 'stand-in'})
+
+    @authenticated
+    async def upload_image(request):
+        data = await request.read()
+        stats['linkedin images'] += 1
+        return web.json_response({'media_id': f'urn:li:digitalmediaAsset:{zlib.crc32(data)}'})
+
+    @authenticated
+    async def create_post(request):
+        body = await request.json()
+        stats['linkedin posts'] += 1
+        posts.append(body)
+        return web.json_response({'id': f'urn:li:share:{len(posts)}'})
+
+    async def list_posts(request):
+        return web.json_response(posts)
+
+    async def show_stats(request):
+        return web.json_response(dict(stats))
+
+    app = web.Application()
+    app.router.add_get('/v2/everything', everything)
+    app.router.add_post('/linkedin/login', login)
+    app.router.add_get('/linkedin/me', me)
+    app.router.add_post('/linkedin/images', upload_image)
+    app.router.add_post('/linkedin/posts', create_post)
+    app.router.add_get('/linkedin/posts', list_posts)
+    app.router.add_get('/stats', show_stats)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--quota', type=int, default=100, help='NewsAPI requests answered before 429')
+    parser.add_argument('--delay', type=float, default=0.2, help='Seconds before each answer')
+    args = parser.parse_args()
+    web.run_app(make_app(args.quota, args.delay), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
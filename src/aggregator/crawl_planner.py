@@ -0,0 +1,60 @@
+from itertools import groupby
+from typing import Callable, Dict, List, Optional, Tuple
+from ..filters.profiles import DigestProfile
+
+class CrawlPlanner:
+    """Decides which sources can still change a digest, so the rest are not crawled.
+
+    Sources are crawled in tiers by the best priority their articles can
+    carry. Sections are picked greedily by marginal relevance (see
+    filters/diversity.mmr_select), and an article can never score more than
+    its relevance allows: priority tier plus capped keyword score in the
+    domain section, ContentFilter.max_healthcare_score() times the priority
+    multiplier under healthcare. An article that would lose every step of
+    the selection changes nothing, so once every profile's full sections
+    were picked with scores a source's articles cannot reach, that source is
+    skipped.
+    """
+
+    # Scores are sums of float products; only skip on a clear margin
+    EPSILON = 1e-9
+
+    def __init__(self, profiles: List[DigestProfile],
+                 max_relevance: Callable[[DigestProfile, str, int], float]):
+        """``max_relevance(profile, section, priority)`` bounds the selection
+        relevance of any article of ``priority`` or worse in ``section``
+        ('domain' or 'healthcare').
+        """
+        self.profiles = profiles
+        self.max_relevance = max_relevance
+
+    @staticmethod
+    def tiers(sources: List[Tuple[object, int, Optional[List[str]]]]) -> List[List[Tuple]]:
+        """Group (scraper, best priority, source labels) entries by priority, best first"""
+        ordered = sorted(sources, key=lambda source: source[1])
+        return [list(tier) for _, tier in groupby(ordered, key=lambda source: source[1])]
+
+    def can_change(self, rankings: Dict[str, Dict[str, Dict]], priority: int,
+                   labels: Optional[List[str]]) -> bool:
+        """Whether articles of ``priority`` or worse, tagged with one of ``labels``
+        (None: any label), could enter any profile's digest.
+
+        ``rankings`` is NewsAggregator._rank_profiles() over the articles
+        gathered so far.
+        """
+        for profile in self.profiles:
+            ranking = rankings[profile.name]
+            if self._can_enter(ranking[profile.domain_section], profile, 'domain', priority):
+                return True
+            # Articles from the profile's priority sources never reach healthcare
+            if labels is not None and all(profile.is_priority_source(label) for label in labels):
+                continue
+            if self._can_enter(ranking['healthcare'], profile, 'healthcare', priority):
+                return True
+        return False
+
+    def _can_enter(self, section: Dict, profile: DigestProfile, name: str, priority: int) -> bool:
+        if not section['complete'] or len(section['articles']) < profile.max_articles:
+            return True
+        best_gain = (1.0 - profile.diversity) * self.max_relevance(profile, name, priority)
+        return best_gain >= min(section['gains']) - self.EPSILON
@@ -1,6 +1,8 @@
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import logging
 import asyncio
+import numpy as np
 from ..scrapers.auntminnie_scraper import AuntMinnieScraper
 from ..scrapers.beckers_scraper import BeckersScraper
 from ..scrapers.stat_scraper import StatScraper
@@ -8,11 +10,54 @@ from ..scrapers.modern_healthcare_scraper import ModernHealthcareScraper
 from ..scrapers.healthcare_it_news_scraper import HealthcareITNewsScraper
 from ..scrapers.rsna_ai_scraper import RSNAAIScraper
 from ..scrapers.acr_scraper import ACRScraper
-from ..filters.content_filter import ContentFilter
+from ..scrapers.newsapi_scraper import NewsAPIScraper
+from ..scrapers.http_client import http_client
+from ..config import CONFIG
+from ..filters.content_filter import ContentFilter, count_keywords
+from ..filters.diversity import mmr_select, term_vectors
+from ..filters.takeaways import TakeawayExtractor
+from ..filters.profiles import DigestProfile, get_profile, DEFAULT_PROFILE, PROFILE_DEFINITIONS
+from .crawl_planner import CrawlPlanner
+from ..filters.prefilter import article_text, tokenize
+from ..telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+# How far back a source's first sitemap discovery looks
+DISCOVERY_WINDOW = timedelta(days=7)
+
+# Priority of articles from sources without one
+LOWEST_PRIORITY = 5
+# Relevance added per priority level in the domain section; larger than any
+# weighted score, so diversity reorders within a priority but not across
+TIER_WEIGHT = 2.0
+# Section selection only considers this many of the most relevant candidates
+SHORTLIST = 200
 
 class NewsAggregator:
-    def __init__(self):
-        print("Initializing NewsAggregator...")
+    def __init__(self, response_archive=None, discovery_store=None, snapshots=None, fingerprints=None,
+                 history=None):
+        """``discovery_store`` (an ArticleStore) switches sources with a sitemap
+        to incremental discovery: only pages added or changed since the last
+        crawl are fetched, and what they yield is saved to the store.
+        ``snapshots`` (CandidateSnapshots) saves each crawl's candidates for replay().
+        ``fingerprints`` (PageFingerprints) lets scrapers skip parsing listing
+        pages whose listing fragment has not changed.
+        ``history`` (TrendHistory) records every crawl's candidates with their
+        keyword counts, for trend queries.
+        """
+        logger.info("Initializing NewsAggregator...")
+        self.discovery_store = discovery_store
+        self.snapshots = snapshots
+        self.history = history
+        # Every built-in profile's keywords, so the history's columns do not
+        # depend on which profiles a run builds
+        self.history_keywords = list(dict.fromkeys(
+            keyword for name in PROFILE_DEFINITIONS for keyword in get_profile(name).content_filter.keywords
+        ))
+        # Keep every raw body (when given) so parsing and ranking can be re-run offline
+        http_client.configure(archive=response_archive, min_delay=CONFIG['min_crawl_delay'],
+                              respect_robots=CONFIG['respect_robots'])
         # Define source priorities
         self.source_priorities = {
             'RSNA AI': 1,          # Highest priority - academic research
@@ -25,6 +70,13 @@ class NewsAggregator:
             'HealthcareITNews': 4,
             'Beckers': 4
         }
+        # Source labels a scraper's articles can carry, where they differ from
+        # its class name (see _tag_articles); None when they come from the data
+        self.source_labels = {
+            'RSNAAIScraper': ['RSNA AI'],
+            'ACRScraper': ['ACR News'],
+            'NewsAPIScraper': None
+        }
         
         # Initialize scrapers in priority order
         self.scrapers = [
@@ -34,103 +86,376 @@ class NewsAggregator:
             StatScraper(),       # Priority 4
             ModernHealthcareScraper(),
             HealthcareITNewsScraper(),
-            BeckersScraper()
+            BeckersScraper(),
+            NewsAPIScraper()     # Skipped unless NEWS_API_KEY is set
         ]
+        for scraper in self.scrapers:
+            scraper.fingerprints = fingerprints
         self.content_filter = ContentFilter()
-        print(f"Initialized {len(self.scrapers)} scrapers")
+        self.takeaway_extractor = TakeawayExtractor(cache_path=CONFIG['takeaway_cache_path'])
+        # Scraper that found each article URL, for enrich()
+        self.article_scrapers = {}
+        self.default_profile = get_profile(DEFAULT_PROFILE)
+        logger.info(f"Initialized {len(self.scrapers)} scrapers")
 
     async def gather_news(self) -> Dict[str, List[Dict]]:
         """Gather and categorize healthcare AI news"""
-        print("Starting news gathering process...")
+        articles = await self.gather_candidates()
+        if self._history_due():
+            self._record_history(articles)
+        digests = {}
+        try:
+            digests[self.default_profile.name] = self._process_articles(articles)
+            if CONFIG['enrich_articles']:
+                await self.enrich(digests)
+        finally:
+            self._save_snapshot(articles, digests, planned=False)
+        return digests[self.default_profile.name]
+
+    async def gather_profiles(self, profiles: List[DigestProfile]) -> Dict[str, Dict[str, List[Dict]]]:
+        """Crawl once and build one digest per profile from the shared candidates.
+
+        A crawl that is due to be recorded in the trend history crawls every
+        source, or source shares and keyword mentions would shift with
+        whatever the planner skipped. Every other crawl is planned.
+        """
+        record = self._history_due()
+        planned = CONFIG['crawl_planner'] and not record
+        articles = await self.gather_candidates(profiles if planned else None)
+        if record:
+            self._record_history(articles)
+        digests = {}
+        try:
+            digests = self._process_profiles(articles, profiles)
+            if CONFIG['enrich_articles']:
+                await self.enrich(digests)
+        finally:
+            self._save_snapshot(articles, digests, planned=planned)
+        return digests
+
+    def replay(self, snapshot: Dict, profiles: List[DigestProfile]) -> Dict[str, Dict[str, List[Dict]]]:
+        """Rebuild the profiles' digests from a saved candidate snapshot, without the network.
+
+        Selected articles get the takeaways fetched for them when the
+        snapshot was taken, where there are any.
+        """
+        with metrics.span('replay'):
+            digests = self._process_profiles(snapshot['articles'], profiles)
+        for sections in digests.values():
+            for articles in sections.values():
+                for article in articles:
+                    if article['url'] in snapshot['takeaways']:
+                        article['takeaways'] = snapshot['takeaways'][article['url']]
+        return digests
+
+    def _history_due(self) -> bool:
+        """Whether this crawl is the periodic full crawl the trend history records"""
+        if self.history is None:
+            return False
+        try:
+            return self.history.due(datetime.utcnow(), CONFIG['history_interval_weeks'])
+        except Exception as e:
+            logger.warning(f"Could not read trend history: {str(e)}")
+            return False
+
+    def _record_history(self, articles: List[Dict]):
+        if self.history is None or not articles:
+            return
+        try:
+            with metrics.span('history'):
+                # Tokens are shared with scoring, so counting is lookups only
+                counts = [count_keywords(tokenize(article_text(article)), self.history_keywords)
+                          for article in articles]
+                matrix = np.array([[article_counts[keyword] for article_counts in counts]
+                                   for keyword in self.history_keywords], dtype=np.uint16)
+                self.history.append(articles, self.history_keywords, matrix)
+        except Exception as e:
+            logger.warning(f"Could not record trend history: {str(e)}")
+
+    def _save_snapshot(self, articles: List[Dict], digests: Dict[str, Dict[str, List[Dict]]], planned: bool):
+        if self.snapshots is None:
+            return
+        takeaways = {
+            article['url']: article['takeaways']
+            for sections in digests.values() for section in sections.values() for article in section
+            if article.get('takeaways')
+        }
+        try:
+            # A planned crawl skips sources that could not change the digest
+            # under the current filters, so its candidates are incomplete
+            path = self.snapshots.save(articles, takeaways, meta={'planned': planned})
+            logger.info(f"Saved {len(articles)} candidates to {path}", extra={'snapshot': path})
+        except Exception as e:
+            logger.warning(f"Could not save candidate snapshot: {str(e)}")
+
+    async def enrich(self, digests: Dict[str, Dict[str, List[Dict]]]):
+        """Fetch every selected article's page and add takeaways to it.
+
+        Pages are fetched concurrently; the extractive takeaways of all of them
+        are then computed in one batch. Takeaways a page states itself (RSNA
+        key points) are kept instead.
+        """
+        selected = {}
+        for sections in digests.values():
+            for articles in sections.values():
+                for article in articles:
+                    selected.setdefault(article['url'], []).append(article)
+        urls = [url for url in selected if url in self.article_scrapers]
+
+        logger.info(f"Enriching {len(urls)} articles...")
+        try:
+            with metrics.span('enrich'):
+                contents = await asyncio.gather(
+                    *[self.article_scrapers[url].extract_content(url) for url in urls], return_exceptions=True
+                )
+        finally:
+            await http_client.close()
+        pages = {url: content for url, content in zip(urls, contents) if isinstance(content, dict)}
+
+        with metrics.span('takeaways'):
+            extracted = self.takeaway_extractor.extract_many([page.get('text') or '' for page in pages.values()])
+        self.takeaway_extractor.save()
+        for (url, page), takeaways in zip(pages.items(), extracted):
+            for article in selected[url]:
+                article['takeaways'] = page.get('takeaways') or takeaways
+        metrics.inc('articles_enriched', len(pages))
+
+    async def gather_candidates(self, profiles: List[DigestProfile] = None) -> List[Dict]:
+        """Crawl the sources once and return the unfiltered candidate set.
+
+        Without ``profiles`` every source is crawled concurrently. With them,
+        sources are crawled in priority tiers and those that can no longer
+        change any of the profiles' digests are skipped (see CrawlPlanner);
+        the digests come out the same, but the candidate set may be smaller.
+        """
+        logger.info("Starting news gathering process...")
         all_articles = []
         
-        # Gather articles from all sources concurrently
-        tasks = [self._gather_from_scraper(scraper) for scraper in self.scrapers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            if profiles:
+                results = await self._gather_planned(profiles)
+            else:
+                # Gather articles from all sources concurrently
+                results = await self._gather_all(self.scrapers)
+        finally:
+            await http_client.close()
         
         # Process results
         for result in results:
             if isinstance(result, list):
                 all_articles.extend(result)
             elif isinstance(result, Exception):
-                print(f"Error during gathering: {str(result)}")
+                logger.warning(f"Error during gathering: {str(result)}")
 
-        print(f"Total articles gathered: {len(all_articles)}")
-        return self._process_articles(all_articles)
+        logger.info(f"Total articles gathered: {len(all_articles)}", extra={'articles': len(all_articles)})
+        return all_articles
+
+    async def _gather_all(self, scrapers) -> List:
+        tasks = [self._gather_from_scraper(scraper) for scraper in scrapers]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _gather_planned(self, profiles: List[DigestProfile]) -> List:
+        """Crawl tier by tier, skipping scrapers the planner rules out"""
+        planner = CrawlPlanner(profiles, self._max_relevance)
+        results = {}
+        for tier in planner.tiers([(scraper, *self._source_bounds(scraper)) for scraper in self.scrapers]):
+            runnable = [scraper for scraper, _, _ in tier]
+            if results:
+                # Scraper order, as in an unplanned crawl, so ties rank the same
+                gathered = [article for scraper in self.scrapers
+                            for article in self._articles(results.get(scraper))]
+                rankings = self._rank_profiles(gathered, profiles)
+                runnable = [scraper for scraper, priority, labels in tier
+                            if planner.can_change(rankings, priority, labels)]
+                for scraper, _, _ in tier:
+                    if scraper not in runnable:
+                        logger.info(f"Skipping {scraper.__class__.__name__}: it cannot change any digest",
+                                    extra={'source': scraper.__class__.__name__})
+                        metrics.inc('sources_skipped', source=scraper.__class__.__name__)
+            results.update(zip(runnable, await self._gather_all(runnable)))
+        return [results[scraper] for scraper in self.scrapers if scraper in results]
+
+    @staticmethod
+    def _articles(result) -> List[Dict]:
+        return result if isinstance(result, list) else []
+
+    def _source_bounds(self, scraper) -> Tuple[int, Optional[List[str]]]:
+        """Best priority a scraper's articles can carry, and their possible source labels"""
+        name = scraper.__class__.__name__
+        labels = self.source_labels.get(name, [name.replace('Scraper', '')])
+        if labels is None:
+            return min(self.source_priorities.values()), None
+        return min(self.source_priorities.get(label, LOWEST_PRIORITY) for label in labels), labels
+
+    def _max_priority_multiplier(self, priority: int) -> float:
+        """Largest score multiplier of any priority from ``priority`` down"""
+        priorities = set(self.source_priorities.values()) | {LOWEST_PRIORITY}
+        return max(self._get_priority_multiplier(p) for p in priorities if p >= priority)
 
     async def _gather_from_scraper(self, scraper) -> List[Dict]:
         """Gather articles from a single scraper with error handling"""
         try:
-            print(f"Fetching articles from {scraper.__class__.__name__}...")
-            articles = await scraper.get_articles()
+            logger.info(f"Fetching articles from {scraper.__class__.__name__}...")
+            discover = self.discovery_store is not None and scraper.sitemap_url is not None
+            with metrics.span('scrape', source=scraper.__class__.__name__):
+                if discover:
+                    articles = await scraper.discover(self.discovery_store, datetime.utcnow() - DISCOVERY_WINDOW)
+                else:
+                    articles = await scraper.get_articles()
+            metrics.inc('articles_gathered', len(articles), source=scraper.__class__.__name__)
             
-            # Add source information and priority to each article
+            self._tag_articles(scraper.__class__.__name__, articles)
             for article in articles:
-                source = scraper.__class__.__name__.replace('Scraper', '')
-                if 'source' not in article:
-                    article['source'] = source
-                article['priority'] = self.source_priorities.get(article['source'], 5)
-            
-            print(f"Found {len(articles)} articles from {scraper.__class__.__name__}")
+                self.article_scrapers[article['url']] = scraper
+            if discover:
+                self.discovery_store.upsert_articles(articles)
+            logger.info(f"Found {len(articles)} articles from {scraper.__class__.__name__}",
+                        extra={'source': scraper.__class__.__name__, 'articles': len(articles)})
             return articles
             
         except Exception as e:
-            print(f'Error gathering news from {scraper.__class__.__name__}: {str(e)}')
-            import traceback
-            print(traceback.format_exc())
+            logger.exception(f'Error gathering news from {scraper.__class__.__name__}: {str(e)}',
+                             extra={'source': scraper.__class__.__name__})
             return []
 
-    def _process_articles(self, articles: List[Dict]) -> Dict[str, List[Dict]]:
-        """Process and categorize articles with priority weighting"""
-        rad_articles = []
-        healthcare_articles = []
-        
-        print(f"Processing {len(articles)} articles...")
+    def _tag_articles(self, scraper_name: str, articles: List[Dict]) -> List[Dict]:
+        """Add source information and priority to each article"""
+        source = scraper_name.replace('Scraper', '')
         for article in articles:
-            try:
-                text = f"{article['title']} {article.get('summary', '')}"
-                relevance = self.content_filter.is_relevant(text)
-                
-                # Calculate base relevance scores
-                article['relevance_scores'] = self.content_filter.calculate_relevance_score(text)
-                
-                # Apply priority weighting
-                priority_multiplier = self._get_priority_multiplier(article['priority'])
-                for key in article['relevance_scores']:
-                    article['relevance_scores'][key] *= priority_multiplier
-                
-                # Categorize articles
-                if self._is_priority_source(article['source']):
-                    # Priority sources automatically go to radiology section
-                    rad_articles.append(article)
-                elif relevance['is_relevant']:
-                    if relevance['is_radiology']:
-                        rad_articles.append(article)
-                    elif relevance['is_general_healthcare']:
-                        healthcare_articles.append(article)
-                        
-            except Exception as e:
-                print(f"Error processing article: {str(e)}")
-                print(f"Problematic article: {article}")
-        
-        # Sort articles by weighted relevance score
-        rad_articles.sort(key=lambda x: (
-            x['priority'],  # First sort by priority (lower number = higher priority)
-            x['relevance_scores']['combined']  # Then by relevance score
-        ))
-        healthcare_articles.sort(key=lambda x: x['relevance_scores']['combined'], reverse=True)
-        
-        print(f"Found {len(rad_articles)} radiology AI articles")
-        print(f"Found {len(healthcare_articles)} healthcare AI articles")
-        
+            if 'source' not in article:
+                article['source'] = source
+            article['priority'] = self.source_priorities.get(article['source'], LOWEST_PRIORITY)
+        return articles
+
+    def _process_articles(self, articles: List[Dict], profile: DigestProfile = None) -> Dict[str, List[Dict]]:
+        """Process and categorize articles with priority weighting"""
+        profile = profile or self.default_profile
+        return self._process_profiles(articles, [profile])[profile.name]
+
+    def _process_profiles(self, articles: List[Dict],
+                          profiles: List[DigestProfile]) -> Dict[str, Dict[str, List[Dict]]]:
+        """Score every candidate once for all profiles and categorize per profile"""
+        rankings = self._rank_profiles(articles, profiles)
         return {
-            'radiology': rad_articles[:5],    # Top 5 radiology AI articles
-            'healthcare': healthcare_articles[:5]  # Top 5 general healthcare AI articles
+            profile.name: {section: ranking['articles'] for section, ranking in rankings[profile.name].items()}
+            for profile in profiles
         }
 
+    def _rank_profiles(self, articles: List[Dict],
+                       profiles: List[DigestProfile]) -> Dict[str, Dict[str, Dict]]:
+        """Per profile and section: the selected articles, the marginal score each
+        was selected with, and whether selection saw every candidate
+        """
+        # Union of all profile keywords, counted on each article's shared tokens
+        keywords = list(dict.fromkeys(
+            keyword for profile in profiles for keyword in profile.content_filter.keywords
+        ))
+        # Per profile and section: (index into texts, scored article)
+        sections = {profile.name: {'domain': [], 'healthcare': []} for profile in profiles}
+        texts = []
+
+        logger.info(f"Processing {len(articles)} articles for {len(profiles)} profile(s)...")
+        with metrics.span('score'):
+            for article in articles:
+                try:
+                    # Usually already tokenized by the scraper's prefilter
+                    tokens = tokenize(article_text(article))
+                    counts = count_keywords(tokens, keywords)
+                    priority_multiplier = self._get_priority_multiplier(article['priority'])
+                    row = len(texts)
+                    texts.append(tokens.text)
+
+                    for profile in profiles:
+                        content_filter = profile.content_filter
+                        scores = content_filter.calculate_relevance_score(tokens, counts)
+                        relevance = content_filter.is_relevant(tokens, scores=scores)
+
+                        # Apply priority weighting on a per-profile copy of the article
+                        scored = dict(article)
+                        scored['relevance_scores'] = {
+                            key: value * priority_multiplier if not isinstance(value, bool) else value
+                            for key, value in scores.items()
+                        }
+
+                        # Categorize articles
+                        bucket = sections[profile.name]
+                        if profile.is_priority_source(article['source']):
+                            # Priority sources automatically go to the domain section
+                            bucket['domain'].append((row, scored))
+                        elif relevance['is_relevant']:
+                            if relevance['is_radiology']:
+                                bucket['domain'].append((row, scored))
+                            elif relevance['is_general_healthcare']:
+                                bucket['healthcare'].append((row, scored))
+
+                except Exception as e:
+                    logger.warning(f"Error processing article: {str(e)}", extra={'url': article.get('url')})
+
+        with metrics.span('select'):
+            shortlists = {
+                (profile.name, section): self._shortlist(candidates, tiered=section == 'domain')
+                for profile in profiles for section, candidates in sections[profile.name].items()
+            }
+            # Each shortlisted text is vectorized once, however many sections it is in
+            rows = sorted({
+                sections[name][section][index][0]
+                for (name, section), (keep, _, _) in shortlists.items() for index in keep
+            })
+            vectors = term_vectors([texts[row] for row in rows])
+            positions = {row: position for position, row in enumerate(rows)}
+
+            results = {}
+            for profile in profiles:
+                results[profile.name] = {}
+                for section, candidates in sections[profile.name].items():
+                    keep, relevance, complete = shortlists[(profile.name, section)]
+                    section_vectors = vectors[[positions[candidates[index][0]] for index in keep]]
+                    chosen, gains = mmr_select(
+                        relevance, section_vectors @ section_vectors.T,
+                        [candidates[index][1]['source'] for index in keep],
+                        profile.max_articles, profile.diversity, profile.max_per_source, profile.source_caps
+                    )
+                    key = profile.domain_section if section == 'domain' else section
+                    results[profile.name][key] = {
+                        'articles': [candidates[keep[index]][1] for index in chosen],
+                        'gains': gains,
+                        'complete': complete
+                    }
+
+                domain, healthcare = len(sections[profile.name]['domain']), len(sections[profile.name]['healthcare'])
+                logger.info(f"[{profile.name}] Found {domain} {profile.domain_section} AI articles "
+                            f"and {healthcare} healthcare AI articles",
+                            extra={'profile': profile.name, 'domain': domain, 'healthcare': healthcare})
+        return results
+
+    def _shortlist(self, candidates: List[Tuple[int, Dict]], tiered: bool) -> Tuple[List[int], np.ndarray, bool]:
+        """The SHORTLIST most relevant candidates (indices, in candidate order),
+        their relevance, and whether every candidate made it
+        """
+        relevance = np.array([self._section_relevance(scored, tiered) for _, scored in candidates],
+                             dtype=np.float64)
+        if len(candidates) <= SHORTLIST:
+            return list(range(len(candidates))), relevance, True
+        keep = np.sort(np.argsort(-relevance, kind='stable')[:SHORTLIST])
+        return keep.tolist(), relevance[keep], False
+
+    def _section_relevance(self, article: Dict, tiered: bool) -> float:
+        """Relevance for selection; in the domain section priority comes first"""
+        relevance = article['relevance_scores']['combined']
+        if tiered:
+            relevance += TIER_WEIGHT * (LOWEST_PRIORITY - article['priority'])
+        return relevance
+
+    def _max_relevance(self, profile: DigestProfile, section: str, priority: int) -> float:
+        """Highest selection relevance an article of ``priority`` or worse can have"""
+        if section == 'healthcare':
+            return profile.content_filter.max_healthcare_score() * self._max_priority_multiplier(priority)
+        # Combined scores are capped at 1.0 before the priority multiplier
+        return TIER_WEIGHT * (LOWEST_PRIORITY - priority) + self._max_priority_multiplier(priority)
+
     def _is_priority_source(self, source: str) -> bool:
         """Check if source is a priority radiology source"""
-        return source in ['RSNA AI', 'ACR News', 'ACR AI-LAB', 'ACR AI Central']
+        return self.default_profile.is_priority_source(source)
 
     def _get_priority_multiplier(self, priority: int) -> float:
         """Get relevance score multiplier based on source priority"""
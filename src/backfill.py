@@ -0,0 +1,123 @@
+import logging
+import argparse
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from src.config import CONFIG
+from src.scrapers.http_client import http_client
+from src.scrapers.acr_scraper import ACRScraper
+from src.scrapers.modern_healthcare_scraper import ModernHealthcareScraper
+from src.scrapers.rsna_ai_scraper import RSNAAIScraper
+from src.scrapers.stat_scraper import StatScraper
+from src.storage.article_store import ArticleStore
+from src.storage.response_archive import ResponseArchive
+from src.telemetry import configure_logging, metrics
+
+logger = logging.getLogger(__name__)
+
+# Sources with a pageable archive
+BACKFILL_SCRAPERS = {
+    'rsna': RSNAAIScraper,
+    'acr': ACRScraper,
+    'stat': StatScraper,
+    'modernhealthcare': ModernHealthcareScraper
+}
+
+async def backfill_stream(scraper, stream: str, since: datetime, until: datetime,
+                          store: ArticleStore, job: str) -> int:
+    """Page one archive stream into the store, resuming from its checkpoint"""
+    name = scraper.__class__.__name__
+    key = f"{name}:{stream}"
+    checkpoint = store.get_checkpoint(job, key)
+    if checkpoint and checkpoint['done']:
+        logger.info(f"{key}: already complete, skipping")
+        return 0
+
+    resume = checkpoint['cursor'] if checkpoint else None
+    if resume:
+        logger.info(f"{key}: resuming after page {resume}")
+
+    stored = 0
+    source = name.replace('Scraper', '')
+    async for cursor, articles in scraper.iter_archive(stream, since, until, resume):
+        for article in articles:
+            article.setdefault('source', source)
+        # Each page is committed together with its cursor, so nothing is held in memory
+        store.save_page(job, key, cursor, articles)
+        stored += len(articles)
+        logger.info(f"{key}: page {cursor} -> {len(articles)} articles")
+
+    store.mark_done(job, key)
+    logger.info(f"{key}: complete ({stored} articles)")
+    return stored
+
+def resume_until(store: ArticleStore, since: datetime, keys: List[str]) -> Optional[datetime]:
+    """The ``until`` of an unfinished backfill from ``since`` over these streams, if any"""
+    for job in reversed(store.jobs(f"backfill-{since:%Y%m%d}-")):
+        if not all((store.get_checkpoint(job, key) or {}).get('done') for key in keys):
+            return datetime.strptime(job.rsplit('-', 1)[1], '%Y%m%d')
+    return None
+
+async def run_backfill(since: datetime, until: Optional[datetime], sources, max_concurrency: int,
+                       per_host_limit: int) -> int:
+    """Backfill every archive stream of the selected sources concurrently.
+
+    ``until`` is inclusive. Without it, an unfinished backfill from the same
+    ``since`` is resumed with its own ``until``; otherwise the backfill runs
+    up to today.
+    """
+    archive = ResponseArchive(CONFIG['response_archive_dir']) if CONFIG['archive_responses'] else None
+    http_client.configure(max_concurrency=max_concurrency, per_host_limit=per_host_limit, archive=archive,
+                         min_delay=CONFIG['min_crawl_delay'], respect_robots=CONFIG['respect_robots'])
+    store = ArticleStore(CONFIG['article_store_path'])
+    streams = [(scraper, stream) for scraper in (BACKFILL_SCRAPERS[source]() for source in sources)
+               for stream in scraper.archive_streams()]
+    if until is None:
+        keys = [f"{scraper.__class__.__name__}:{stream}" for scraper, stream in streams]
+        until = resume_until(store, since, keys)
+        if until:
+            logger.info(f"Resuming the unfinished backfill up to {until:%Y-%m-%d}")
+        else:
+            until = datetime.combine(datetime.now().date(), datetime.min.time())
+    job = f"backfill-{since:%Y%m%d}-{until:%Y%m%d}"
+
+    tasks = [backfill_stream(scraper, stream, since, until, store, job) for scraper, stream in streams]
+
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await http_client.close()
+
+    total = 0
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Backfill stream failed (rerun to resume): {str(result)}")
+        else:
+            total += result
+    logger.info(f"Backfill stored {total} articles; store now holds {store.count()}")
+    store.close()
+    return total
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Backfill historical radiology AI news')
+    parser.add_argument('--since', required=True, type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help='Oldest publication date to collect (YYYY-MM-DD)')
+    parser.add_argument('--until', type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help='Newest publication date to collect, inclusive (YYYY-MM-DD; default: the '
+                             'until of an unfinished backfill from the same --since, else today)')
+    parser.add_argument('--sources', nargs='+', choices=sorted(BACKFILL_SCRAPERS),
+                        default=sorted(BACKFILL_SCRAPERS))
+    parser.add_argument('--max-concurrency', type=int, default=8,
+                        help='Maximum in-flight requests across all sources')
+    parser.add_argument('--per-host', type=int, default=2,
+                        help='Maximum in-flight requests per host')
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    configure_logging()
+    args = parse_args()
+    try:
+        asyncio.run(run_backfill(args.since, args.until, args.sources,
+                                 args.max_concurrency, args.per_host))
+    finally:
+        metrics.write(CONFIG['metrics_dir'], 'backfill')
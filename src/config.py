@@ -3,10 +3,64 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+DATA_DIR = os.getenv('BOT_DATA_DIR', 'data')
+
 CONFIG = {
+    'data_dir': DATA_DIR,
+    'article_store_path': os.path.join(DATA_DIR, 'articles.db'),
+    'outbox_path': os.path.join(DATA_DIR, 'outbox.db'),
+    # publisher.py only retries digests queued within this many days
+    'outbox_max_age_days': int(os.getenv('OUTBOX_MAX_AGE_DAYS', '3')),
+    # Crawl worker queue and shared per-host pacing (see crawl_workers.py)
+    'job_queue_path': os.path.join(DATA_DIR, 'jobs.db'),
+    'archive_dir': os.path.join(DATA_DIR, 'archive'),
+    # Raw response bodies for offline reprocessing (see storage/response_archive.py)
+    'archive_responses': os.getenv('ARCHIVE_RESPONSES', 'true').lower() == 'true',
+    'response_archive_dir': os.path.join(DATA_DIR, 'responses'),
+    # Seconds between requests to a host whose robots.txt sets no Crawl-delay
+    'min_crawl_delay': float(os.getenv('MIN_CRAWL_DELAY', '0.5')),
+    'respect_robots': os.getenv('RESPECT_ROBOTS', 'true').lower() == 'true',
+    # Crawl sources in priority tiers and skip those that cannot change the digest
+    # (except on the trend history's periodic full crawl, see history_interval_weeks)
+    'crawl_planner': os.getenv('CRAWL_PLANNER', 'true').lower() == 'true',
+    # Find ACR, RSNA and Modern Healthcare articles from sitemap diffs instead of listing pages
+    'sitemap_discovery': os.getenv('SITEMAP_DISCOVERY', 'false').lower() == 'true',
+    # Fetch the selected articles' pages and add extractive takeaways (see filters/takeaways.py)
+    'enrich_articles': os.getenv('ENRICH_ARTICLES', 'true').lower() == 'true',
+    'takeaway_cache_path': os.path.join(DATA_DIR, 'takeaway_cache.json'),
+    # Each crawl's raw candidates, for `test_bot.py --from-snapshot` (see storage/snapshot.py)
+    'candidate_snapshots': os.getenv('CANDIDATE_SNAPSHOTS', 'true').lower() == 'true',
+    'snapshot_dir': os.path.join(DATA_DIR, 'snapshots'),
+    # Reuse a listing page's articles while its listing fragment is unchanged (see scrapers/fingerprint.py)
+    'listing_fingerprints': os.getenv('LISTING_FINGERPRINTS', 'true').lower() == 'true',
+    'fingerprint_path': os.path.join(DATA_DIR, 'fingerprints.db'),
+    # Weekly columnar history of crawled articles and their keyword counts (see storage/trend_history.py)
+    'trend_history': os.getenv('TREND_HISTORY', 'true').lower() == 'true',
+    'history_dir': os.path.join(DATA_DIR, 'history'),
+    # Record the history from one full crawl every N weeks; the crawls in between are planned
+    'history_interval_weeks': int(os.getenv('HISTORY_INTERVAL_WEEKS', '4')),
+    # Add a "trends this week" section to posts when the history has earlier weeks
+    'post_trends': os.getenv('POST_TRENDS', 'true').lower() == 'true',
+    # Per-run JSON report and Prometheus textfile (see telemetry.py)
+    'metrics_dir': os.getenv('BOT_METRICS_DIR', os.path.join(DATA_DIR, 'metrics')),
+    # --profile output: collapsed CPU stacks and memory snapshots per stage (see profiling.py)
+    'profile_dir': os.getenv('BOT_PROFILE_DIR', os.path.join(DATA_DIR, 'profiles')),
+    # Comma-separated publish sinks: linkedin, archive, webhook
+    'publish_sinks': [
+        name.strip() for name in os.getenv('PUBLISH_SINKS', 'linkedin,archive').split(',') if name.strip()
+    ],
+    'webhook_url': os.getenv('PUBLISH_WEBHOOK_URL'),
     'news_api_key': os.getenv('NEWS_API_KEY'),
     'linkedin_username': os.getenv('LINKEDIN_USERNAME'),
     'linkedin_password': os.getenv('LINKEDIN_PASSWORD'),
+    'linkedin_session_path': os.path.join(DATA_DIR, 'linkedin_session.enc'),
+    # Post through HttpTransport to this endpoint instead of LinkedIn, e.g. the local
+    # stand-in in benchmarks/stand_in_server.py (http://127.0.0.1:8766/linkedin)
+    'linkedin_base_url': os.getenv('LINKEDIN_BASE_URL'),
+    # Comma-separated digest profiles built from one shared crawl (see filters/profiles.py)
+    'digest_profiles': [
+        name.strip() for name in os.getenv('DIGEST_PROFILES', 'radiology').split(',') if name.strip()
+    ],
     'search_terms': {
         'ai_applications': 'artificial intelligence applications healthcare',
         'radiology_ai': 'artificial intelligence radiology research'
@@ -0,0 +1,259 @@
+"""Crawl with several worker processes sharing a durable local job queue.
+
+    PYTHONPATH=. python src/crawl_workers.py enqueue-backfill --since 2025-01-01 [--sources rsna acr]
+    PYTHONPATH=. python src/crawl_workers.py enqueue-crawl
+    PYTHONPATH=. python src/crawl_workers.py work --processes 4
+    PYTHONPATH=. python src/crawl_workers.py status
+
+The enqueue commands only plan: they add one 'fetch' job per request to the
+queue in CONFIG['job_queue_path']. A worker that runs a fetch job enqueues a
+'parse' job carrying the raw body; the parse job stores its articles and
+enqueues the next archive page, if there is one. Host pacing lives in the
+same SQLite file, so every worker on every machine sharing it draws from one
+schedule per host. Workers exit once the queue is drained; running `work`
+again picks up whatever is left.
+"""
+import argparse
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import socket
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.config import CONFIG
+from src.scrapers.acr_scraper import ACRScraper
+from src.scrapers.auntminnie_scraper import AuntMinnieScraper
+from src.scrapers.beckers_scraper import BeckersScraper
+from src.scrapers.healthcare_it_news_scraper import HealthcareITNewsScraper
+from src.scrapers.host_scheduler import SharedHostScheduler
+from src.scrapers.http_client import RobotsDisallowed, http_client
+from src.scrapers.modern_healthcare_scraper import ModernHealthcareScraper
+from src.scrapers.rsna_ai_scraper import RSNAAIScraper
+from src.scrapers.stat_scraper import StatScraper
+from src.storage.article_store import ArticleStore
+from src.storage.job_queue import JobQueue
+from src.storage.response_archive import ResponseArchive
+from src.telemetry import configure_logging, metrics
+
+logger = logging.getLogger(__name__)
+
+# NewsAPI stays with the in-process crawl, which manages its daily quota
+WORKER_SCRAPERS = {
+    'rsna': RSNAAIScraper,
+    'acr': ACRScraper,
+    'auntminnie': AuntMinnieScraper,
+    'stat': StatScraper,
+    'modernhealthcare': ModernHealthcareScraper,
+    'healthcareitnews': HealthcareITNewsScraper,
+    'beckers': BeckersScraper
+}
+
+# Parse jobs run first: they release their body and may chain the next page
+PARSE_PRIORITY = 1
+
+def _request_key(plan: str, source: str, request: Dict) -> str:
+    params = '&'.join(f"{key}={value}" for key, value in sorted(request.get('params', {}).items()))
+    return f"{plan}:{source}:{request['url']}?{params}"
+
+def enqueue_requests(queue: JobQueue, plan: str, source: str, requests: List[Dict],
+                     since: Optional[str] = None, until: Optional[str] = None) -> int:
+    """Add fetch jobs; requests already planned under ``plan`` are skipped"""
+    added = 0
+    for request in requests:
+        payload = {'plan': plan, 'source': source, 'request': request, 'since': since, 'until': until}
+        added += queue.enqueue('fetch', payload, key=_request_key(plan, source, request))
+    return added
+
+def enqueue_crawl(queue: JobQueue, sources: List[str]) -> int:
+    """Plan today's crawl of every source's listings"""
+    plan = f"crawl-{datetime.utcnow():%Y%m%d}"
+    return sum(enqueue_requests(queue, plan, source, WORKER_SCRAPERS[source]().crawl_requests())
+               for source in sources)
+
+def enqueue_backfill(queue: JobQueue, since: datetime, until: datetime, sources: List[str]) -> int:
+    """Plan the first requests of every archive stream"""
+    plan = f"backfill-{since:%Y%m%d}-{until:%Y%m%d}"
+    added = 0
+    for source in sources:
+        scraper = WORKER_SCRAPERS[source]()
+        for stream in scraper.archive_streams():
+            added += enqueue_requests(queue, plan, source, scraper.backfill_requests(stream, since, until),
+                                      since.isoformat(), until.isoformat())
+    return added
+
+class Worker:
+    """Runs ``concurrency`` jobs at a time on one event loop until the queue is drained"""
+
+    def __init__(self, queue: JobQueue, store: ArticleStore, kinds: List[str] = None,
+                 concurrency: int = 8, poll_interval: float = 1.0):
+        self.queue = queue
+        self.store = store
+        self.kinds = kinds
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.scrapers = {}
+
+    def _scraper(self, source: str):
+        if source not in self.scrapers:
+            self.scrapers[source] = WORKER_SCRAPERS[source]()
+        return self.scrapers[source]
+
+    async def run(self):
+        try:
+            await asyncio.gather(*[self._lane() for _ in range(self.concurrency)])
+        finally:
+            await http_client.close()
+
+    async def _lane(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await loop.run_in_executor(None, self.queue.lease, self.owner, self.kinds)
+            if job is None:
+                # Jobs leased elsewhere may still chain new ones
+                if self.queue.unfinished() == 0:
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict):
+        loop = asyncio.get_running_loop()
+        work = asyncio.create_task(self._work(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job['id']))
+        try:
+            await asyncio.wait([work, heartbeat], return_when=asyncio.FIRST_COMPLETED)
+            if not work.done():
+                # The lease expired and the job may be running elsewhere; nothing more is committed here
+                work.cancel()
+                logger.warning(f"{job['kind']} job {job['id']} lost its lease, leaving it to its new owner",
+                               extra={'job': job['id'], 'kind': job['kind']})
+                metrics.inc('jobs_lease_lost', kind=job['kind'])
+                return
+            work.result()
+            await loop.run_in_executor(None, self.queue.complete, job['id'], self.owner)
+        except RobotsDisallowed as e:
+            await loop.run_in_executor(None, functools.partial(self.queue.fail, job['id'], self.owner,
+                                                               str(e), retry=False))
+        except Exception as e:
+            logger.warning(f"{job['kind']} job {job['id']} failed (attempt {job['attempt']}): {str(e)}",
+                           extra={'job': job['id'], 'kind': job['kind']})
+            await loop.run_in_executor(None, self.queue.fail, job['id'], self.owner, str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def _work(self, job: Dict):
+        with metrics.span('job', kind=job['kind']):
+            if job['kind'] == 'fetch':
+                await self._fetch(job['payload'])
+            else:
+                await self._parse(job['payload'], job['body'])
+
+    async def _heartbeat(self, job_id: int):
+        """Renew the job's lease until cancelled; returns once the lease is lost"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                if not await loop.run_in_executor(None, self.queue.heartbeat, job_id, self.owner):
+                    return
+            except Exception as e:
+                # A busy database is retried at the next beat, well within the lease
+                logger.warning(f"Heartbeat for job {job_id} failed: {str(e)}", extra={'job': job_id})
+
+    async def _fetch(self, payload: Dict):
+        content = await self._scraper(payload['source']).fetch_request(payload['request'])
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.queue.enqueue, 'parse', payload,
+                                    body=zlib.compress(content.encode('utf-8')), priority=PARSE_PRIORITY)
+        )
+
+    async def _parse(self, payload: Dict, body: bytes):
+        scraper = self._scraper(payload['source'])
+        content = zlib.decompress(body).decode('utf-8')
+        since = datetime.fromisoformat(payload['since']) if payload['since'] else None
+        # Parsing runs on a thread so this worker's fetches keep flowing
+        with metrics.span('parse', source=scraper.__class__.__name__):
+            articles, follow = await asyncio.get_running_loop().run_in_executor(
+                None, scraper.parse_request, payload['request'], content, since
+            )
+        if since:
+            articles = scraper._in_date_range(articles, since, datetime.fromisoformat(payload['until']))
+        source = scraper.__class__.__name__.replace('Scraper', '')
+        for article in articles:
+            article.setdefault('source', source)
+        self.store.upsert_articles(articles)
+        metrics.inc('articles_stored', len(articles), source=scraper.__class__.__name__)
+        if follow:
+            await asyncio.get_running_loop().run_in_executor(
+                None, enqueue_requests, self.queue, payload['plan'], payload['source'], [follow],
+                payload['since'], payload['until']
+            )
+
+def run_worker(index: int, kinds: List[str], concurrency: int):
+    """Entry point of one worker process"""
+    configure_logging()
+    queue = JobQueue(CONFIG['job_queue_path'])
+    store = ArticleStore(CONFIG['article_store_path'])
+    archive = ResponseArchive(CONFIG['response_archive_dir']) if CONFIG['archive_responses'] else None
+    scheduler = SharedHostScheduler(CONFIG['job_queue_path'], min_delay=CONFIG['min_crawl_delay'])
+    http_client.configure(archive=archive, respect_robots=CONFIG['respect_robots'], scheduler=scheduler)
+    try:
+        asyncio.run(Worker(queue, store, kinds, concurrency).run())
+    finally:
+        metrics.write(CONFIG['metrics_dir'], f'worker-{index}')
+        scheduler.close()
+        store.close()
+        queue.close()
+
+def run_workers(processes: int, kinds: List[str], concurrency: int):
+    if processes == 1:
+        run_worker(0, kinds, concurrency)
+        return
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=run_worker, args=(index, kinds, concurrency), name=f'crawl-worker-{index}')
+               for index in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Plan crawls into the job queue and run crawl workers')
+    commands = parser.add_subparsers(dest='command', required=True)
+    date = lambda s: datetime.strptime(s, '%Y-%m-%d')
+
+    crawl = commands.add_parser('enqueue-crawl', help="Plan today's listing crawl")
+    crawl.add_argument('--sources', nargs='+', choices=sorted(WORKER_SCRAPERS), default=sorted(WORKER_SCRAPERS))
+
+    backfill = commands.add_parser('enqueue-backfill', help='Plan a backfill of source archives')
+    backfill.add_argument('--since', required=True, type=date, help='Oldest publication date (YYYY-MM-DD)')
+    backfill.add_argument('--until', default=datetime.combine(datetime.now().date(), datetime.min.time()), type=date,
+                          help='Newest publication date, inclusive (YYYY-MM-DD, default today)')
+    backfill.add_argument('--sources', nargs='+', choices=sorted(WORKER_SCRAPERS), default=sorted(WORKER_SCRAPERS))
+
+    work = commands.add_parser('work', help='Run workers until the queue is drained')
+    work.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    work.add_argument('--concurrency', type=int, default=8, help='Jobs in flight per worker')
+    work.add_argument('--kinds', nargs='+', choices=['fetch', 'parse'], help='Only run these job kinds')
+
+    commands.add_parser('status', help='Show job counts')
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    configure_logging()
+    args = parse_args()
+    if args.command == 'work':
+        run_workers(args.processes, args.kinds, args.concurrency)
+    else:
+        queue = JobQueue(CONFIG['job_queue_path'])
+        if args.command == 'enqueue-crawl':
+            logger.info(f"Enqueued {enqueue_crawl(queue, args.sources)} fetch jobs")
+        elif args.command == 'enqueue-backfill':
+            logger.info(f"Enqueued {enqueue_backfill(queue, args.since, args.until, args.sources)} fetch jobs")
+        for kind, statuses in sorted(queue.counts().items()):
+            print(f"{kind}: " + ', '.join(f"{status}={count}" for status, count in sorted(statuses.items())))
+        queue.close()
@@ -1,17 +1,38 @@
-from typing import Dict, List
-import re
+from typing import Dict, List, Union
+from .prefilter import Tokens, as_tokens
+
+# Looser AI terms accepted for domain articles without a required phrase
+LENIENT_AI_TERMS = ['ai', 'algorithm', 'automated', 'computer-aided']
+
+def count_keywords(text: Union[str, Tokens], keywords: List[str]) -> Dict[str, int]:
+    """Count whole-word matches of each keyword.
+
+    ``text`` is tokenized once through the shared prefilter cache (or passed
+    as its Tokens), so every keyword is a lookup rather than a scan.
+    """
+    tokens = as_tokens(text)
+    return {keyword: tokens.count(keyword) for keyword in keywords}
 
 class ContentFilter:
-    def __init__(self):
-        # Primary keywords for different healthcare domains
-        self.rad_keywords = [
+    # Weights of the domain, healthcare and AI scores in the combined score
+    DOMAIN_WEIGHT = 0.4
+    HEALTHCARE_WEIGHT = 0.3
+    AI_WEIGHT = 0.3
+    # Minimum score in each area for is_relevant()
+    RELEVANCE_THRESHOLD = 0.15
+
+    def __init__(self, rad_keywords: List[str] = None, healthcare_keywords: List[str] = None,
+                 ai_keywords: List[str] = None):
+        # Primary keywords for different healthcare domains.
+        # rad_keywords is the profile's domain keyword set (radiology by default).
+        self.rad_keywords = rad_keywords or [
             'radiology', 'imaging', 'radiologist', 'x-ray', 'ct', 'mri', 'pacs',
             'diagnostic imaging', 'nuclear medicine', 'ultrasound', 'mammography',
             'interventional radiology', 'image analysis', 'scan', 'chest x-ray',
             'medical imaging', 'image recognition', 'radiograph', 'imaging systems'
         ]
         
-        self.healthcare_keywords = [
+        self.healthcare_keywords = healthcare_keywords or [
             'healthcare', 'medical', 'clinical', 'hospital', 'physician',
             'patient', 'diagnosis', 'treatment', 'care', 'health system',
             'ehr', 'emr', 'digital health', 'telemedicine', 'medical records',
@@ -19,7 +40,7 @@ class ContentFilter:
             'medical device', 'fda', 'health tech', 'digital medicine'
         ]
         
-        self.ai_keywords = [
+        self.ai_keywords = ai_keywords or [
             'artificial intelligence', 'machine learning', 'deep learning',
             'neural network', 'algorithm', 'ai-powered', 'ml', 'nlp',
             'predictive analytics', 'computer vision', 'decision support',
@@ -39,17 +60,28 @@ class ContentFilter:
             'ai model'
         ]
 
-    def calculate_relevance_score(self, text: str) -> Dict[str, float]:
-        """Calculate relevance scores with more lenient matching"""
-        text = text.lower()
+    @property
+    def keywords(self) -> List[str]:
+        """All keywords this filter scores against"""
+        return self.rad_keywords + self.healthcare_keywords + self.ai_keywords
+
+    def calculate_relevance_score(self, text: Union[str, Tokens], counts: Dict[str, int] = None) -> Dict[str, float]:
+        """Calculate relevance scores with more lenient matching.
+
+        ``counts`` may carry keyword match counts precomputed with
+        ``count_keywords`` so several filters can share one scan of the text.
+        """
+        tokens = as_tokens(text)
+        if counts is None:
+            counts = count_keywords(tokens, self.keywords)
         
         # Calculate base scores
-        rad_score = self._calculate_keyword_score(text, self.rad_keywords)
-        healthcare_score = self._calculate_keyword_score(text, self.healthcare_keywords)
-        ai_score = self._calculate_keyword_score(text, self.ai_keywords)
+        rad_score = self._calculate_keyword_score(counts, self.rad_keywords)
+        healthcare_score = self._calculate_keyword_score(counts, self.healthcare_keywords)
+        ai_score = self._calculate_keyword_score(counts, self.ai_keywords)
         
         # Check for required AI phrases for healthcare articles
-        has_required_ai = any(phrase in text for phrase in self.required_ai_phrases)
+        has_required_ai = tokens.has_any(self.required_ai_phrases)
         if not has_required_ai:
             ai_score *= 0.5  # Significantly reduce AI score if no required phrases found
         
@@ -62,22 +94,21 @@ class ContentFilter:
         
         # Calculate combined score
         scores['combined'] = min((
-            rad_score * 0.4 +      # Higher weight for radiology
-            healthcare_score * 0.3 + # Medium weight for healthcare
-            ai_score * 0.3          # Base weight for AI
+            rad_score * self.DOMAIN_WEIGHT +           # Higher weight for radiology
+            healthcare_score * self.HEALTHCARE_WEIGHT + # Medium weight for healthcare
+            ai_score * self.AI_WEIGHT                   # Base weight for AI
         ), 1.0)
         
         return scores
 
-    def _calculate_keyword_score(self, text: str, keywords: List[str]) -> float:
+    def _calculate_keyword_score(self, counts: Dict[str, int], keywords: List[str]) -> float:
         """Calculate keyword match score with more lenient matching"""
         total_matches = 0
         unique_matches = set()
         
         # Look for exact matches first
         for keyword in keywords:
-            # Count both exact matches and matches within words
-            exact_matches = len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
+            exact_matches = counts.get(keyword, 0)
             if exact_matches > 0:
                 unique_matches.add(keyword)
                 total_matches += exact_matches
@@ -88,21 +119,31 @@ class ContentFilter:
         
         return min((frequency_score * 0.3 + variety_score * 0.7), 1.0)
 
-    def is_relevant(self, text: str) -> Dict[str, bool]:
+    def is_relevant(self, text: Union[str, Tokens], counts: Dict[str, int] = None,
+                    scores: Dict[str, float] = None) -> Dict[str, bool]:
         """Determine article relevance with stricter AI requirements"""
-        text = text.lower()
-        scores = self.calculate_relevance_score(text)
+        tokens = as_tokens(text)
+        if scores is None:
+            scores = self.calculate_relevance_score(tokens, counts)
         
+        threshold = self.RELEVANCE_THRESHOLD
+
         # For healthcare articles, must have a required AI phrase
-        is_healthcare_ai = scores['healthcare'] > 0.15 and scores['ai'] > 0.15 and scores['has_required_ai']
+        is_healthcare_ai = scores['healthcare'] > threshold and scores['ai'] > threshold and scores['has_required_ai']
         
         # Radiology articles can be slightly more lenient but still need good AI relevance
-        is_rad_ai = (scores['radiology'] > 0.15 and scores['ai'] > 0.15 and 
+        is_rad_ai = (scores['radiology'] > threshold and scores['ai'] > threshold and 
                     (scores['has_required_ai'] or 
-                     any(term in text for term in ['ai', 'algorithm', 'automated', 'computer-aided'])))
+                     tokens.has_any(LENIENT_AI_TERMS)))
         
         return {
             'is_relevant': is_rad_ai or is_healthcare_ai,
             'is_radiology': is_rad_ai,
             'is_general_healthcare': is_healthcare_ai and not is_rad_ai
-        }
\ No newline at end of file
+        }
+
+    def max_healthcare_score(self) -> float:
+        """Highest combined score an article filed under general healthcare can have"""
+        # Such an article has a required AI phrase, so it is only kept out of
+        # the domain section by a domain score at or below the threshold
+        return self.DOMAIN_WEIGHT * self.RELEVANCE_THRESHOLD + self.HEALTHCARE_WEIGHT + self.AI_WEIGHT
@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+import re
+import zlib
+import numpy as np
+
+# Hashed term space; collisions only add a little similarity between texts
+DIMENSIONS = 1024
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+@lru_cache(maxsize=65536)
+def _bucket(token: str) -> int:
+    # crc32 rather than hash(), which is salted per process
+    return zlib.crc32(token.encode('utf-8')) % DIMENSIONS
+
+def term_vectors(texts: Sequence[str], stopwords: FrozenSet[str] = frozenset()) -> np.ndarray:
+    """L2-normalised hashed term-frequency vectors of lowercased texts, one row each"""
+    rows, columns = [], []
+    for row, text in enumerate(texts):
+        buckets = [_bucket(token) for token in TOKEN_PATTERN.findall(text) if token not in stopwords]
+        rows.extend([row] * len(buckets))
+        columns.extend(buckets)
+    vectors = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+    np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def mmr_select(relevance: np.ndarray, similarity: np.ndarray, sources: Sequence[str], k: int,
+               diversity: float = 0.3, max_per_source: Optional[int] = None,
+               source_caps: Dict[str, int] = None) -> Tuple[List[int], List[float]]:
+    """Pick up to ``k`` candidates by maximal marginal relevance.
+
+    Each step takes the candidate with the best
+    ``(1 - diversity) * relevance - diversity * (max similarity to those already picked)``,
+    skipping sources that reached their cap (``source_caps`` per source,
+    else ``max_per_source``). Ties go to the earlier candidate, so with
+    ``diversity=0`` and no caps this is a stable sort by relevance. Returns
+    the picked indices in order and the marginal score each was picked with.
+    """
+    source_caps = source_caps or {}
+    names = list(dict.fromkeys(sources))
+    codes = np.array([names.index(source) for source in sources], dtype=np.intp)
+    caps = [source_caps.get(name, max_per_source) for name in names]
+    picked_per_source = [0] * len(names)
+
+    weighted = (1.0 - diversity) * np.asarray(relevance, dtype=np.float64)
+    penalty = np.zeros(len(weighted))
+    available = np.ones(len(weighted), dtype=bool)
+    for code, cap in enumerate(caps):
+        if cap is not None and cap <= 0:
+            available[codes == code] = False
+
+    picked, gains = [], []
+    while len(picked) < k and available.any():
+        scores = np.where(available, weighted - diversity * penalty, -np.inf)
+        best = int(np.argmax(scores))
+        picked.append(best)
+        gains.append(float(scores[best]))
+        available[best] = False
+        code = codes[best]
+        picked_per_source[code] += 1
+        if caps[code] is not None and picked_per_source[code] >= caps[code]:
+            available[codes == code] = False
+        np.maximum(penalty, similarity[best], out=penalty)
+    return picked, gains
@@ -0,0 +1,94 @@
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple, Union
+import re
+
+# Words are runs of letters and digits: 'ai' is a word in 'AI-powered' but
+# not in 'said' or 'maintain'
+WORD = re.compile(r'[^\W_]+')
+# Longest keyword phrase, in words, that is looked up instead of scanned for
+MAX_NGRAM = 4
+
+class Tokens:
+    """A lowercased text split into words once, with its phrases of up to
+    MAX_NGRAM words counted, so any number of keywords are checked without
+    scanning the text again
+    """
+
+    __slots__ = ('text', 'words', 'ngrams')
+
+    def __init__(self, text: str):
+        self.text = text.lower()
+        self.words = tuple(WORD.findall(self.text))
+        self.ngrams = Counter()
+        for size in range(1, MAX_NGRAM + 1):
+            self.ngrams.update(zip(*(self.words[start:] for start in range(size))))
+
+    def count(self, keyword: str) -> int:
+        """Whole-word occurrences of a keyword or phrase"""
+        words = phrase(keyword)
+        if not words:
+            return 0
+        if len(words) <= MAX_NGRAM:
+            return self.ngrams.get(words, 0)
+        size = len(words)
+        return sum(1 for start in range(len(self.words) - size + 1) if self.words[start:start + size] == words)
+
+    def has_any(self, keywords: Iterable[str]) -> bool:
+        return any(self.count(keyword) for keyword in keywords)
+
+@lru_cache(maxsize=4096)
+def phrase(keyword: str) -> Tuple[str, ...]:
+    return tuple(WORD.findall(keyword.lower()))
+
+@lru_cache(maxsize=8192)
+def tokenize(text: str) -> Tokens:
+    """Tokens of a text, memoized so the scraper prefilter and ContentFilter share them"""
+    return Tokens(text)
+
+def as_tokens(text: Union[str, Tokens]) -> Tokens:
+    return text if isinstance(text, Tokens) else tokenize(text)
+
+def article_text(article: Dict) -> str:
+    """The text an article is filtered and scored on"""
+    return f"{article['title']} {article.get('summary', '')}"
+
+AI_TERMS = [
+    'artificial intelligence', 'ai', 'machine learning', 'deep learning', 'neural network',
+    'neural networks', 'algorithm', 'algorithms', 'automation', 'computer-aided', 'data science'
+]
+HEALTHCARE_TERMS = [
+    'health', 'healthcare', 'telehealth', 'medical', 'medicine', 'clinical', 'clinician', 'clinicians',
+    'patient', 'patients', 'hospital', 'hospitals', 'doctor', 'doctors', 'physician', 'physicians',
+    'diagnosis', 'diagnostic', 'treatment', 'treatments', 'care', 'provider', 'providers'
+]
+RADIOLOGY_TERMS = [
+    'radiology', 'radiologist', 'radiologists', 'imaging', 'x-ray', 'x-rays', 'ct', 'mri',
+    'radiograph', 'radiographs', 'mammography', 'ultrasound', 'nuclear medicine', 'scan', 'scans'
+]
+
+class Prefilter:
+    """Entry-level relevance check every scraper runs on its listing items.
+
+    Each named group is a keyword list; an item passes when it mentions at
+    least one keyword of every group asked for. Matching is on whole words,
+    through the same memoized tokens ContentFilter scores later.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = {name: tuple(keywords) for name, keywords in groups.items()}
+
+    def check(self, text: Union[str, Tokens], *groups: str) -> bool:
+        tokens = as_tokens(text)
+        return all(tokens.has_any(self.groups[group]) for group in groups)
+
+    def matches(self, article: Dict, *groups: str) -> bool:
+        """Check an article's title and summary"""
+        return self.check(article_text(article), *groups)
+
+# Shared by every scraper
+prefilter = Prefilter({
+    'ai': AI_TERMS,
+    'healthcare': HEALTHCARE_TERMS + RADIOLOGY_TERMS,
+    'radiology': RADIOLOGY_TERMS
+})
@@ -0,0 +1,125 @@
+from typing import Dict, List
+from .content_filter import ContentFilter
+
+# Built-in digest profiles. Each profile re-uses the shared crawl and only
+# differs in its domain keywords, the sources it trusts for its domain
+# section, and how the post is titled.
+PROFILE_DEFINITIONS = {
+    'radiology': {
+        'title': 'Healthcare AI News Update',
+        'domain_section': 'radiology',
+        'domain_heading': '🔬 Radiology AI Highlights:',
+        'healthcare_heading': '🏥 Healthcare AI Innovations:',
+        'domain_keywords': None,  # ContentFilter defaults are radiology keywords
+        'priority_sources': ['RSNA AI', 'ACR News', 'ACR AI-LAB', 'ACR AI Central'],
+        'hashtags': (
+            "#HealthcareAI #RadiologyAI #ArtificialIntelligence "
+            "#HealthTech #DigitalHealth #MedicalImaging #Healthcare "
+            "#Innovation #AI #Radiology"
+        )
+    },
+    'cardiology': {
+        'title': 'Cardiology AI News Update',
+        'domain_section': 'cardiology',
+        'domain_heading': '🫀 Cardiology AI Highlights:',
+        'healthcare_heading': '🏥 Healthcare AI Innovations:',
+        'domain_keywords': [
+            'cardiology', 'cardiologist', 'cardiac', 'heart', 'ecg', 'ekg',
+            'echocardiography', 'echocardiogram', 'arrhythmia', 'atrial fibrillation',
+            'heart failure', 'coronary', 'cardiovascular', 'cardiac imaging',
+            'cardiac mri', 'cardiac ct', 'stroke'
+        ],
+        'priority_sources': [],
+        'hashtags': (
+            "#HealthcareAI #CardiologyAI #ArtificialIntelligence "
+            "#HealthTech #DigitalHealth #Cardiology #AI"
+        )
+    },
+    'oncology': {
+        'title': 'Oncology Imaging AI News Update',
+        'domain_section': 'oncology',
+        'domain_heading': '🎗️ Oncology Imaging AI Highlights:',
+        'healthcare_heading': '🏥 Healthcare AI Innovations:',
+        'domain_keywords': [
+            'oncology', 'oncologist', 'cancer', 'tumor', 'tumour', 'lesion',
+            'mammography', 'breast cancer', 'lung cancer', 'lung nodule',
+            'prostate cancer', 'screening', 'pet', 'pet/ct', 'biopsy',
+            'radiation oncology', 'pathology', 'metastasis'
+        ],
+        'priority_sources': [],
+        'hashtags': (
+            "#HealthcareAI #OncologyAI #ArtificialIntelligence "
+            "#CancerImaging #Oncology #MedicalImaging #AI"
+        )
+    },
+    'policy': {
+        'title': 'Healthcare AI Policy Update',
+        'domain_section': 'policy',
+        'domain_heading': '⚖️ AI Policy & Regulation:',
+        'healthcare_heading': '🏥 Healthcare AI Innovations:',
+        'domain_keywords': [
+            'fda', 'cms', 'onc', 'regulation', 'regulatory', 'policy',
+            'clearance', '510(k)', 'approval', 'reimbursement', 'payment',
+            'legislation', 'congress', 'guidance', 'executive order',
+            'advocacy', 'medicare', 'liability', 'governance'
+        ],
+        'priority_sources': ['ACR AI Central'],
+        'hashtags': (
+            "#HealthcareAI #AIPolicy #ArtificialIntelligence "
+            "#HealthPolicy #FDA #DigitalHealth #AI"
+        )
+    }
+}
+
+class DigestProfile:
+    def __init__(self, name: str, title: str, domain_section: str, domain_heading: str,
+                 healthcare_heading: str, domain_keywords: List[str] = None,
+                 priority_sources: List[str] = None, hashtags: str = '',
+                 max_articles: int = 5, diversity: float = 0.3, max_per_source: int = 3,
+                 source_caps: Dict[str, int] = None):
+        self.name = name
+        self.title = title
+        self.domain_section = domain_section
+        self.domain_heading = domain_heading
+        self.healthcare_heading = healthcare_heading
+        self.priority_sources = priority_sources or []
+        self.hashtags = hashtags
+        self.max_articles = max_articles
+        # Section selection (see filters/diversity.mmr_select): how much
+        # near-duplicates are held back, and how many picks one source may take
+        self.diversity = diversity
+        self.max_per_source = max_per_source
+        self.source_caps = source_caps or {}
+        self.content_filter = ContentFilter(rad_keywords=domain_keywords)
+
+    @property
+    def sections(self) -> List[Dict[str, str]]:
+        """Ordered post sections with their headings and empty-section notes"""
+        return [
+            {
+                'key': self.domain_section,
+                'heading': self.domain_heading,
+                'empty': f"No major {self.domain_section} AI updates this week."
+            },
+            {
+                'key': 'healthcare',
+                'heading': self.healthcare_heading,
+                'empty': "No major healthcare AI updates this week."
+            }
+        ]
+
+    def is_priority_source(self, source: str) -> bool:
+        """Check if source feeds the domain section regardless of keywords"""
+        return source in self.priority_sources
+
+def get_profile(name: str) -> DigestProfile:
+    """Build a profile from its built-in definition"""
+    if name not in PROFILE_DEFINITIONS:
+        raise ValueError(f"Unknown digest profile: {name}")
+    return DigestProfile(name, **PROFILE_DEFINITIONS[name])
+
+def get_profiles(names: List[str]) -> List[DigestProfile]:
+    """Build several profiles, preserving the requested order"""
+    return [get_profile(name) for name in names]
+
+DEFAULT_PROFILE = 'radiology'
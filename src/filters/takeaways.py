@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Sequence
+import hashlib
+import json
+import logging
+import os
+import re
+import numpy as np
+from .diversity import term_vectors
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends: terminal punctuation (and closing quotes) before a capital,
+# digit or opening quote; paragraph breaks always end a sentence
+SENTENCE_END = re.compile(r'(?<=[.!?])["”\')\]]*\s+(?=["“(\[]?[A-Z0-9])')
+PARAGRAPH_BREAK = re.compile(r'\s*\n\s*')
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset([
+    'dr', 'mr', 'mrs', 'ms', 'prof', 'st', 'jr', 'sr', 'inc', 'corp', 'co', 'ltd',
+    'vs', 'etc', 'e.g', 'i.e', 'u.s', 'u.k', 'no', 'fig', 'al', 'jan', 'feb', 'mar',
+    'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+])
+# Function words carry no topic, so they should not link sentences
+STOPWORDS = frozenset('''
+    a an and are as at be been but by can could did do does for from had has have he her his how i if in
+    into is it its may more most new not of on or our she so than that the their them there these they
+    this those to was we were what when which who will with would you your said says also after about
+    over up out one two all its been being just than then
+'''.split())
+
+def split_sentences(text: str) -> List[str]:
+    """Split plain text into sentences without a tokenizer model"""
+    sentences = []
+    for paragraph in PARAGRAPH_BREAK.split(text.strip()):
+        start = 0
+        for match in SENTENCE_END.finditer(paragraph):
+            candidate = paragraph[start:match.start()].rstrip()
+            last_word = candidate.rsplit(None, 1)[-1].rstrip('.').lower() if candidate else ''
+            if last_word in ABBREVIATIONS or len(last_word) == 1:
+                continue
+            sentences.append(paragraph[start:match.end()].strip())
+            start = match.end()
+        if paragraph[start:].strip():
+            sentences.append(paragraph[start:].strip())
+    return sentences
+
+def _textrank(vectors: np.ndarray, damping: float, iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+    """PageRank over the sentences' cosine similarity graph"""
+    count = len(vectors)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    weights = similarity.sum(axis=1, keepdims=True)
+    # A sentence sharing no terms with any other links to all of them evenly
+    transition = np.where(weights > 0, similarity / np.maximum(weights, 1e-12), 1.0 / count)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(iterations):
+        updated = (1.0 - damping) / count + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+class TakeawayExtractor:
+    """Picks each text's most central sentences as its takeaways (TextRank).
+
+    Sentences become hashed term vectors (filters/diversity.term_vectors),
+    all of a batch's in one pass, and are ranked by PageRank over their
+    cosine similarity graph. Results are cached by content hash, in
+    ``cache_path`` across runs when one is given.
+    """
+
+    def __init__(self, max_takeaways: int = 3, min_length: int = 40, max_length: int = 300,
+                 damping: float = 0.85, cache_path: Optional[str] = None, cache_size: int = 5000):
+        self.max_takeaways = max_takeaways
+        self.min_length = min_length
+        self.max_length = max_length
+        self.damping = damping
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.cache: Dict[str, List[str]] = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, List[str]]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        if not self.cache_path:
+            return
+        # Most recently used entries are last; keep the newest cache_size
+        entries = list(self.cache.items())[-self.cache_size:]
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(entries), f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _key(self, text: str) -> str:
+        settings = f"{self.max_takeaways}:{self.min_length}:{self.max_length}:{self.damping}"
+        return hashlib.sha1(f"{settings}\0{text}".encode('utf-8')).hexdigest()
+
+    def extract(self, text: str) -> List[str]:
+        return self.extract_many([text])[0]
+
+    def extract_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """Ranked takeaway sentences for each text"""
+        keys = [self._key(text or '') for text in texts]
+        missing = {key: text for key, text in zip(keys, texts) if key not in self.cache}
+
+        # Every new text's candidate sentences are vectorized together
+        spans, sentences = {}, []
+        for key, text in missing.items():
+            # Repeated sentences (pull quotes, captions) count once
+            candidates = [sentence for sentence in dict.fromkeys(split_sentences(text or ''))
+                          if self.min_length <= len(sentence) <= self.max_length]
+            spans[key] = (len(sentences), len(sentences) + len(candidates))
+            sentences.extend(candidates)
+        vectors = term_vectors([sentence.lower() for sentence in sentences], STOPWORDS)
+
+        for key, (start, end) in spans.items():
+            if end - start <= self.max_takeaways:
+                self.cache[key] = sentences[start:end]
+                continue
+            scores = _textrank(vectors[start:end], self.damping)
+            # Best first; earlier sentences win ties
+            ranked = np.argsort(-scores, kind='stable')[:self.max_takeaways]
+            self.cache[key] = [sentences[start + index] for index in ranked]
+
+        results = []
+        for key in keys:
+            # Move hits to the end so save() keeps them
+            results.append(self.cache.pop(key))
+            self.cache[key] = results[-1]
+        return results
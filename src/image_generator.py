@@ -1,50 +1,172 @@
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List
+import hashlib
+import json
+import numpy as np
 import os
 from datetime import datetime
+from .telemetry import metrics
 
-def create_cover_image(date: datetime) -> str:
-    """Create a professional cover image for the news update"""
-    # Create directory if it doesn't exist
-    os.makedirs('images', exist_ok=True)
-    
-    # Create new image with gradient background
-    img = Image.new('RGB', (1200, 630))
-    draw = ImageDraw.Draw(img)
-    
-    # Create gradient background (professional blue)
-    for y in range(630):
-        color = int(255 * (1 - y/630))  # Gradient from light to darker blue
-        draw.line([(0, y), (1200, y)], fill=(color, color + 20, 255))
-    
+# Vertical gradients as (top RGB, bottom RGB); channels are clipped to 0-255
+# after interpolation, so a channel can start saturated
+THEMES = {
+    # Professional blue (default): green runs 20 above red, as on the original covers
+    'blue': ((255, 275, 255), (0, 20, 255)),
+    'navy': ((40, 70, 140), (5, 15, 60)),
+    'teal': ((120, 210, 210), (0, 80, 100)),
+    'slate': ((110, 120, 140), (20, 25, 35))
+}
+
+DEFAULT_TITLE = 'Healthcare AI News Update'
+
+@lru_cache(maxsize=32)
+def _gradient_template(width: int, height: int, theme: str) -> Image.Image:
+    """Render a theme's gradient background once per size.
+
+    Row ``y`` is ``bottom + int((top - bottom) * (1 - y / height))``, the ramp
+    truncated before the offset is added, as the original per-row drawing
+    computed it, so covers match it pixel for pixel.
+    """
+    top, bottom = (np.array(color, dtype=np.int64) for color in THEMES[theme])
+    level = (1 - np.arange(height, dtype=np.float64) / height)[:, None]
+    rows = np.clip(bottom + ((top - bottom) * level).astype(np.int64), 0, 255).astype(np.uint8)
+    pixels = np.broadcast_to(rows[:, None, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+
+@lru_cache(maxsize=16)
+def _load_font(name: str, size: int) -> ImageFont.ImageFont:
+    """Resolve a TrueType font once, falling back to PIL's default font"""
     try:
-        # Try to use a professional font
-        title_font = ImageFont.truetype('DejaVuSans-Bold.ttf', 60)
-        date_font = ImageFont.truetype('DejaVuSans.ttf', 40)
-    except:
-        # Fallback to default font
-        title_font = ImageFont.load_default()
-        date_font = ImageFont.load_default()
-    
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default()
+
+def render_cover(date: datetime, width: int = 1200, height: int = 630, theme: str = 'blue',
+                 title: str = DEFAULT_TITLE, title_size: int = 60, date_size: int = 40,
+                 highlights: List[str] = None) -> Image.Image:
+    """Composite the title and date over the cached gradient template"""
+    img = _gradient_template(width, height, theme).copy()
+    draw = ImageDraw.Draw(img)
+
     # Add title
     draw.text(
         (100, 100),
-        'Healthcare AI News Update',
-        font=title_font,
+        title,
+        font=_load_font('DejaVuSans-Bold.ttf', title_size),
         fill='white'
     )
-    
+
     # Add date
     draw.text(
         (100, 200),
         date.strftime('%B %d, %Y'),
-        font=date_font,
+        font=_load_font('DejaVuSans.ttf', date_size),
         fill='white'
     )
-    
-    # Add icons representing different sections
-    # (You might want to add small medical/AI-related icons here)
-    
-    # Save image
-    filename = f'images/cover_{date.strftime("%Y%m%d")}.png'
-    img.save(filename)
-    return filename
\ No newline at end of file
+
+    # Add article highlights, one line each, until we run out of room
+    highlight_font = _load_font('DejaVuSans.ttf', 28)
+    y = 300
+    for highlight in highlights or []:
+        if y > height - 60:
+            break
+        text = highlight if len(highlight) <= 70 else highlight[:67] + '...'
+        draw.text((100, y), f"• {text}", font=highlight_font, fill='white')
+        y += 45
+    return img
+
+def save_image(img: Image.Image, path: str, fmt: str = 'png'):
+    """Encode with settings tuned for small uploads.
+
+    PNG covers stay full-colour, since a palette bands the gradient; JPEG
+    uses optimized Huffman tables.
+    """
+    if fmt == 'jpeg':
+        img.save(path, 'JPEG', quality=85, optimize=True, progressive=True)
+    else:
+        img.save(path, 'PNG', compress_level=6)
+
+def create_cover_image(date: datetime, theme: str = 'blue', title: str = DEFAULT_TITLE,
+                       fmt: str = 'png', width: int = 1200, height: int = 630) -> str:
+    """Create a professional cover image for the news update"""
+    # Create directory if it doesn't exist
+    os.makedirs('images', exist_ok=True)
+
+    with metrics.span('render', target='cover'):
+        img = render_cover(date, width, height, theme, title)
+
+        # Save image
+        extension = 'jpg' if fmt == 'jpeg' else 'png'
+        filename = f'images/cover_{date.strftime("%Y%m%d")}.{extension}'
+        save_image(img, filename, fmt)
+    return filename
+
+def _normalize_spec(spec: Dict) -> Dict:
+    """Fill spec defaults so equal renders hash equally"""
+    date = spec.get('date') or datetime.now()
+    if isinstance(date, datetime):
+        date = date.strftime('%Y-%m-%d')
+    return {
+        'width': int(spec.get('width', 1200)),
+        'height': int(spec.get('height', 630)),
+        'theme': spec.get('theme', 'blue'),
+        'title': spec.get('title', DEFAULT_TITLE),
+        'date': date,
+        'highlights': list(spec.get('highlights') or []),
+        'fmt': spec.get('fmt', 'png')
+    }
+
+def spec_key(spec: Dict) -> str:
+    """Content address of a normalized render spec"""
+    canonical = json.dumps(spec, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:20]
+
+def _render_spec_to_file(spec: Dict, path: str) -> str:
+    """Render one spec and publish it with an atomic rename"""
+    img = render_cover(
+        datetime.strptime(spec['date'], '%Y-%m-%d'), spec['width'], spec['height'],
+        spec['theme'], spec['title'], highlights=spec['highlights']
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    save_image(img, tmp_path, spec['fmt'])
+    os.replace(tmp_path, path)
+    return path
+
+def render_batch(specs: List[Dict], output_dir: str = 'images/variants',
+                 max_workers: int = None) -> List[str]:
+    """Render many cover variants in parallel.
+
+    Each spec is a dict with optional width, height, theme, title, date,
+    highlights and fmt keys. Outputs are named by the spec's content hash,
+    so identical specs (in this batch or an earlier one) are rendered once.
+    Returns the output path of every spec, in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    with metrics.span('render', target='cover'):
+        return _render_pending(specs, output_dir, max_workers)
+
+def _render_pending(specs: List[Dict], output_dir: str, max_workers: int = None) -> List[str]:
+    paths = []
+    pending = {}
+    for spec in specs:
+        normalized = _normalize_spec(spec)
+        extension = 'jpg' if normalized['fmt'] == 'jpeg' else 'png'
+        path = os.path.join(output_dir, f"{spec_key(normalized)}.{extension}")
+        paths.append(path)
+        if path not in pending and not os.path.exists(path):
+            pending[path] = normalized
+
+    if len(pending) == 1:
+        # Not worth starting a pool for a single render
+        path, spec = next(iter(pending.items()))
+        _render_spec_to_file(spec, path)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_render_spec_to_file, spec, path) for path, spec in pending.items()]
+            for future in futures:
+                future.result()
+
+    return paths
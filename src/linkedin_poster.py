@@ -1,23 +1,213 @@
+import logging
+import asyncio
+import base64
+import hashlib
+import json
 import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+import requests
+from cryptography.fernet import Fernet, InvalidToken
 from linkedin_api import Linkedin
+from .config import CONFIG
+from .telemetry import metrics
 from datetime import datetime
 
-class LinkedInPoster:
+logger = logging.getLogger(__name__)
+
+class LinkedInTransport:
+    """How LinkedInPoster talks to LinkedIn. Swap it out to test against a fake endpoint."""
+
+    def login(self, username: str, password: str):
+        """Full username/password login"""
+        raise NotImplementedError
+
+    def restore(self, username: str, cookies: List[Dict]):
+        """Re-create an authenticated client from saved cookies without logging in"""
+        raise NotImplementedError
+
+    def is_valid(self) -> bool:
+        """Cheap probe that the current session is still authenticated"""
+        raise NotImplementedError
+
+    def export_cookies(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def upload_image(self, data: bytes):
+        raise NotImplementedError
+
+    def create_post(self, text: str, media_id=None):
+        raise NotImplementedError
+
+def _cookies_to_list(jar) -> List[Dict]:
+    return [
+        {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+         'expires': c.expires, 'secure': c.secure}
+        for c in jar
+    ]
+
+def _cookies_from_list(cookies: List[Dict]) -> requests.cookies.RequestsCookieJar:
+    jar = requests.cookies.RequestsCookieJar()
+    for c in cookies:
+        jar.set(c['name'], c['value'], domain=c['domain'], path=c['path'],
+                expires=c['expires'], secure=c['secure'])
+    return jar
+
+class LinkedInApiTransport(LinkedInTransport):
+    """Talks to LinkedIn through the linkedin_api client"""
+
     def __init__(self):
+        self.api = None
+
+    def login(self, username, password):
+        # linkedin_api caches cookies in plaintext; point it at a throwaway
+        # directory since we keep our own encrypted copy.
+        with tempfile.TemporaryDirectory() as cookies_dir:
+            self.api = Linkedin(username, password, refresh_cookies=True,
+                                cookies_dir=cookies_dir + os.sep)
+
+    def restore(self, username, cookies):
+        self.api = Linkedin(username, '', cookies=_cookies_from_list(cookies))
+
+    def is_valid(self):
+        try:
+            response = self.api.client.session.get(
+                f"{self.api.client.API_BASE_URL}/me", timeout=10, allow_redirects=False
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    def export_cookies(self):
+        return _cookies_to_list(self.api.client.session.cookies)
+
+    def upload_image(self, data):
+        return self.api.upload_image(data)
+
+    def create_post(self, text, media_id=None):
+        return self.api.create_post(text=text, media_id=media_id)
+
+class HttpTransport(LinkedInTransport):
+    """Plain JSON-over-HTTP transport for a local fake LinkedIn endpoint
+    (LINKEDIN_BASE_URL, served by benchmarks/stand_in_server.py).
+
+    Expects POST /login, GET /me, POST /images (returns {"media_id"}) and
+    POST /posts on ``base_url``.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def login(self, username, password):
+        response = self.session.post(f"{self.base_url}/login",
+                                     json={'username': username, 'password': password}, timeout=10)
+        response.raise_for_status()
+
+    def restore(self, username, cookies):
+        self.session.cookies = _cookies_from_list(cookies)
+
+    def is_valid(self):
+        try:
+            return self.session.get(f"{self.base_url}/me", timeout=10).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def export_cookies(self):
+        return _cookies_to_list(self.session.cookies)
+
+    def upload_image(self, data):
+        response = self.session.post(f"{self.base_url}/images", data=data, timeout=30)
+        response.raise_for_status()
+        return response.json()['media_id']
+
+    def create_post(self, text, media_id=None):
+        response = self.session.post(f"{self.base_url}/posts",
+                                     json={'text': text, 'media_id': media_id}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+class SessionStore:
+    """Encrypted on-disk storage for session cookies.
+
+    Uses LINKEDIN_SESSION_KEY (a Fernet key) when set, otherwise derives a key
+    from the account credentials so the file is useless without them.
+    """
+
+    def __init__(self, path: str, username: str, password: str):
+        self.path = path
+        key = os.getenv('LINKEDIN_SESSION_KEY')
+        if not key:
+            derived = hashlib.pbkdf2_hmac('sha256', (password or '').encode(),
+                                          (username or '').encode(), 200000)
+            key = base64.urlsafe_b64encode(derived)
+        self.fernet = Fernet(key)
+
+    def load(self) -> Optional[List[Dict]]:
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except (OSError, InvalidToken, ValueError):
+            return None
+
+    def save(self, cookies: List[Dict]):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.fernet.encrypt(json.dumps(cookies).encode()))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class LinkedInPoster:
+    def __init__(self, transport: LinkedInTransport = None, session_path: str = None):
         self.username = os.getenv('LINKEDIN_USERNAME')
         self.password = os.getenv('LINKEDIN_PASSWORD')
-        self.api = None
+        if transport is None:
+            transport = (HttpTransport(CONFIG['linkedin_base_url']) if CONFIG['linkedin_base_url']
+                         else LinkedInApiTransport())
+        self.transport = transport
+        self.session_path = session_path or CONFIG['linkedin_session_path']
+        self.connected = False
+        # Concurrent deliveries run in executor threads; only one may log in
+        self._connect_lock = threading.Lock()
 
     def _connect(self):
-        """Initialize LinkedIn API connection"""
-        if not self.api:
-            if not self.username or not self.password:
-                raise ValueError("LinkedIn credentials not found in environment")
-            
+        """Reuse the saved session if it is still valid, otherwise log in"""
+        with self._connect_lock:
+            self._connect_locked()
+
+    def _connect_locked(self):
+        if self.connected:
+            return
+        if not self.username or not self.password:
+            raise ValueError("LinkedIn credentials not found in environment")
+
+        store = SessionStore(self.session_path, self.username, self.password)
+        cookies = store.load()
+        if cookies:
             try:
-                self.api = Linkedin(self.username, self.password)
+                self.transport.restore(self.username, cookies)
+                if self.transport.is_valid():
+                    logger.info("Reusing saved LinkedIn session")
+                    self.connected = True
+                    return
             except Exception as e:
-                raise Exception(f"Failed to connect to LinkedIn: {str(e)}")
+                logger.warning(f"Saved LinkedIn session unusable: {str(e)}")
+            logger.info("Saved LinkedIn session expired, logging in again")
+            store.clear()
+
+        try:
+            with metrics.span('login', service='linkedin'):
+                self.transport.login(self.username, self.password)
+        except Exception as e:
+            raise Exception(f"Failed to connect to LinkedIn: {str(e)}")
+        store.save(self.transport.export_cookies())
+        self.connected = True
 
     def post(self, content, image_path=None):
         """Post content to LinkedIn"""
@@ -27,14 +217,20 @@ class LinkedInPoster:
             # Upload image if provided
             media_id = None
             if image_path and os.path.exists(image_path):
-                with open(image_path, 'rb') as image:
-                    media_id = self.api.upload_image(image.read())
+                with open(image_path, 'rb') as image, metrics.span('post', step='upload_image'):
+                    media_id = self.transport.upload_image(image.read())
 
             # Create post
-            self.api.create_post(
-                text=content,
-                media_id=media_id if media_id else None
-            )
+            with metrics.span('post', step='create_post'):
+                self.transport.create_post(content, media_id if media_id else None)
 
         except Exception as e:
             raise Exception(f"Failed to post to LinkedIn: {str(e)}")
+
+    async def connect_async(self):
+        """Establish the session without blocking the event loop"""
+        await asyncio.get_running_loop().run_in_executor(None, self._connect)
+
+    async def post_async(self, content, image_path=None):
+        """Post from async code; the blocking HTTP calls run in an executor"""
+        await asyncio.get_running_loop().run_in_executor(None, self.post, content, image_path)
@@ -1,43 +1,122 @@
+import argparse
+import logging
 import asyncio
 from datetime import datetime
 import pytz
-from aggregator.news_aggregator import NewsAggregator
-from image_generator import create_cover_image
-from linkedin_poster import LinkedInPoster
-from post_formatter import PostFormatter
+from src.aggregator.news_aggregator import NewsAggregator
+from src.config import CONFIG
+from src.filters.profiles import get_profiles
+from src.image_generator import render_batch
+from src.linkedin_poster import LinkedInPoster
+from src.post_formatter import PostFormatter
+from src.publisher import Publisher, build_sinks
+from src.storage.article_store import ArticleStore
+from src.storage.outbox import Outbox
+from src.storage.page_fingerprints import PageFingerprints
+from src.storage.response_archive import ResponseArchive
+from src.storage.snapshot import CandidateSnapshots
+from src.storage.trend_history import TrendHistory
+from src.profiling import add_profile_arguments, make_profiler
+from src.stage_graph import StageGraph
+from src.telemetry import configure_logging, metrics
 
-async def main():
+logger = logging.getLogger(__name__)
+
+async def main(profiler=None, discover=False):
     # Initialize components
-    aggregator = NewsAggregator()
+    archive = ResponseArchive(CONFIG['response_archive_dir']) if CONFIG['archive_responses'] else None
+    store = ArticleStore(CONFIG['article_store_path']) if discover else None
+    snapshots = CandidateSnapshots(CONFIG['snapshot_dir']) if CONFIG['candidate_snapshots'] else None
+    fingerprints = PageFingerprints(CONFIG['fingerprint_path']) if CONFIG['listing_fingerprints'] else None
+    history = TrendHistory(CONFIG['history_dir']) if CONFIG['trend_history'] else None
+    aggregator = NewsAggregator(archive, store, snapshots, fingerprints, history)
     linkedin_poster = LinkedInPoster()
-    post_formatter = PostFormatter()
+    post_formatter = PostFormatter(history if CONFIG['post_trends'] else None)
+    outbox = Outbox(CONFIG['outbox_path'])
+    publisher = Publisher(outbox, build_sinks(linkedin_poster))
+    profiles = get_profiles(CONFIG['digest_profiles'])
 
     # Get current date in ET
     et_tz = pytz.timezone('US/Eastern')
     current_date = datetime.now(et_tz)
 
-    try:
-        # Gather news
-        print("Gathering news...")
-        news = await aggregator.gather_news()
+    async def gather():
+        # Gather news once for every profile
+        logger.info("Gathering news...")
+        return await aggregator.gather_profiles(profiles)
+
+    def cover():
+        # Independent of the news, so it renders while the crawl runs; one variant per profile
+        logger.info("Generating cover images...")
+        paths = render_batch([{'date': current_date, 'title': profile.title} for profile in profiles])
+        return {profile.name: path for profile, path in zip(profiles, paths)}
+
+    async def login():
+        # Warm the LinkedIn session during the crawl; a failure here is retried when publishing
+        try:
+            await linkedin_poster.connect_async()
+        except Exception as e:
+            logger.warning(f"LinkedIn login failed, retrying at publish time: {str(e)}")
 
-        # Generate cover image
-        print("Generating cover image...")
-        image_path = create_cover_image(current_date)
+    def format_posts(gather, cover):
+        keys = []
+        for profile in profiles:
+            # Format post content for every channel and record it in the outbox
+            logger.info(f"Formatting post for profile '{profile.name}'...")
+            renders = post_formatter.render_targets(gather[profile.name], current_date, profile)
+            key, new = outbox.enqueue(current_date.strftime('%Y-%m-%d'), profile.name, renders,
+                                      cover[profile.name], list(publisher.sinks))
+            if new:
+                logger.info(f"Queued digest {key}")
+            else:
+                # A rerun in the same week only completes the deliveries still missing
+                logger.info(f"Digest {key} is already queued; keeping the queued version")
+            keys.append(key)
+        return keys
 
-        # Format post content
-        print("Formatting post...")
-        post_content = post_formatter.format_post(news, current_date)
+    async def publish(**results):
+        # Deliver this run's digests only; failed sinks can be retried with `python src/publisher.py`
+        logger.info("Publishing...")
+        return await publisher.publish_pending(keys=results['format'])
 
-        # Post to LinkedIn
-        print("Posting to LinkedIn...")
-        linkedin_poster.post(post_content, image_path)
+    # Crawling, rendering the cover and logging in overlap; the critical path is logged at the end
+    graph = StageGraph(profiler)
+    graph.add('gather', gather)
+    graph.add('cover', cover, executor='thread')
+    publish_after = ['format']
+    if 'linkedin' in publisher.sinks:
+        graph.add('login', login)
+        publish_after.append('login')
+    graph.add('format', format_posts, after=['gather', 'cover'])
+    graph.add('publish', publish, after=publish_after)
 
-        print("Successfully posted weekly update")
+    try:
+        summary = (await graph.run())['publish']
+        if summary['failed']:
+            raise Exception(f"{summary['failed']} deliveries failed; rerun publisher.py to retry")
+
+        logger.info("Successfully posted weekly update")
 
     except Exception as e:
-        print(f"Error in main execution: {str(e)}")
+        logger.error(f"Error in main execution: {str(e)}")
         raise
 
+    finally:
+        graph.log_report()
+        paths = metrics.write(CONFIG['metrics_dir'])
+        logger.info(f"Wrote run report to {paths['report']}", extra=paths)
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Build and publish the weekly digest')
+    parser.add_argument('--discover', action='store_true', default=CONFIG['sitemap_discovery'],
+                        help='Find new articles from sitemap diffs where a source has a sitemap')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    configure_logging()
+
+    profiler = make_profiler(args.profile, CONFIG['profile_dir'], 'main', args.profile_interval)
+    if profiler:
+        with profiler.run():
+            asyncio.run(main(profiler, args.discover))
+    else:
+        asyncio.run(main(discover=args.discover))
@@ -1,23 +1,70 @@
+import logging
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime
 from newspaper import Article
 from PIL import Image, ImageDraw, ImageFont
 import requests
 from linkedin_api import Linkedin
+from src.config import CONFIG
+from src.filters.takeaways import TakeawayExtractor
+from src.telemetry import configure_logging, metrics
+
+logger = logging.getLogger(__name__)
+
+def _parse_html(url, html):
+    """Parse downloaded HTML into title and text (runs in a worker process)"""
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    
+    return {
+        'title': article.title,
+        'summary': article.text.split('\n')[0],  # First paragraph
+        'text': article.text
+    }
+
+def _download_html(url):
+    """Download an article page (runs in a thread)"""
+    article = Article(url)
+    article.download()
+    return article.html
 
 class RadiologyAINewsBot:
-    def __init__(self):
+    def __init__(self, max_downloads=8, parse_workers=None):
         self.api_key = os.environ.get('NEWS_API_KEY')
         self.linkedin_username = os.environ.get('LINKEDIN_USERNAME')
         self.linkedin_password = os.environ.get('LINKEDIN_PASSWORD')
+        self.max_downloads = max_downloads
+        self.parse_workers = parse_workers
+        self.takeaway_extractor = TakeawayExtractor(cache_path=CONFIG['takeaway_cache_path'])
+        self.session = requests.Session()
+        self.cache_path = os.path.join(os.environ.get('BOT_DATA_DIR', 'data'), 'summary_cache.json')
+        self.summary_cache = self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.summary_cache, f)
+        os.replace(tmp_path, self.cache_path)
 
     def fetch_news(self):
         """Fetch news from various sources using NewsAPI"""
-        # AI Applications in general
-        ai_apps_news = self._fetch_news_category("artificial intelligence applications healthcare")
-        # AI Research in Radiology
-        rad_ai_news = self._fetch_news_category("artificial intelligence radiology research")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # AI Applications in general
+            ai_apps = executor.submit(self._fetch_news_category, "artificial intelligence applications healthcare")
+            # AI Research in Radiology
+            rad_ai = executor.submit(self._fetch_news_category, "artificial intelligence radiology research")
+            ai_apps_news, rad_ai_news = ai_apps.result(), rad_ai.result()
         
         return ai_apps_news[:5], rad_ai_news[:5]
 
@@ -30,27 +77,55 @@ class RadiologyAINewsBot:
             'language': 'en',
             'apiKey': self.api_key
         }
-        response = requests.get(url, params=params)
+        with metrics.span('http', host='newsapi.org'):
+            response = self.session.get(url, params=params, timeout=30)
+        metrics.inc('http_requests', host='newsapi.org', status=response.status_code)
+        metrics.inc('http_response_bytes', len(response.content), host='newsapi.org')
         return response.json()['articles']
 
     def create_summary(self, article_url):
         """Create a summary for a single article"""
-        article = Article(article_url)
-        article.download()
-        article.parse()
-        article.nlp()
-        
-        # Get the main summary
-        summary = article.summary.split('\n')[0]  # First paragraph
-        
-        # Extract key points
-        takeaways = article.keywords[:3]  # Top 3 keywords as takeaways
-        
-        return {
-            'title': article.title,
-            'summary': summary,
-            'takeaways': takeaways
-        }
+        return self.create_summaries([article_url])[article_url]
+
+    def create_summaries(self, urls):
+        """Summarize many articles at once.
+
+        Downloads run concurrently in a thread pool and parsing runs in a
+        process pool; takeaways for all parsed pages are then extracted in one
+        batch. Results are cached by URL across runs.
+        """
+        missing = [url for url in dict.fromkeys(urls) if url not in self.summary_cache]
+        metrics.inc('summary_cache_hits', len(set(urls)) - len(missing))
+        metrics.inc('summary_cache_misses', len(missing))
+        if missing:
+            with metrics.span('enrich'):
+                with ThreadPoolExecutor(max_workers=self.max_downloads) as downloads, \
+                        ProcessPoolExecutor(max_workers=self.parse_workers) as parsers:
+                    # Each page goes to the parse pool as soon as its download finishes
+                    pages = {downloads.submit(_download_html, url): url for url in missing}
+                    parsing = {}
+                    for page in as_completed(pages):
+                        url = pages[page]
+                        try:
+                            parsing[url] = parsers.submit(_parse_html, url, page.result())
+                        except Exception as e:
+                            logger.warning(f"Error downloading {url}: {str(e)}")
+                    parsed = {}
+                    for url, result in parsing.items():
+                        try:
+                            parsed[url] = result.result()
+                        except Exception as e:
+                            logger.warning(f"Error parsing {url}: {str(e)}")
+                takeaways = self.takeaway_extractor.extract_many([page['text'] for page in parsed.values()])
+                for (url, page), page_takeaways in zip(parsed.items(), takeaways):
+                    self.summary_cache[url] = {'title': page['title'], 'summary': page['summary'],
+                                               'takeaways': page_takeaways}
+                self.takeaway_extractor.save()
+                self._save_cache()
+
+        # Failed articles are not cached so the next run retries them
+        empty = {'title': '', 'summary': '', 'takeaways': []}
+        return {url: self.summary_cache.get(url, dict(empty, title=url)) for url in urls}
 
     def create_cover_image(self, date):
         """Create a cover image for the update"""
@@ -73,9 +148,11 @@ class RadiologyAINewsBot:
         """Format the news into a LinkedIn post"""
         post = f"📰 Weekly Radiology AI News Update - {date.strftime('%B %d, %Y')}\n\n"
         
+        summaries = self.create_summaries([news['url'] for news in ai_apps_news + rad_ai_news])
+        
         post += "🔬 Top AI Applications in Healthcare:\n\n"
         for i, news in enumerate(ai_apps_news, 1):
-            summary = self.create_summary(news['url'])
+            summary = summaries[news['url']]
             post += f"{i}. {summary['title']}\n"
             post += f"{summary['summary']}\n"
             post += "Key takeaways:\n"
@@ -85,7 +162,7 @@ class RadiologyAINewsBot:
         
         post += "🏥 Latest in Radiology AI Research:\n\n"
         for i, news in enumerate(rad_ai_news, 1):
-            summary = self.create_summary(news['url'])
+            summary = summaries[news['url']]
             post += f"{i}. {summary['title']}\n"
             post += f"{summary['summary']}\n"
             post += "Key takeaways:\n"
@@ -105,17 +182,25 @@ class RadiologyAINewsBot:
         current_date = datetime.now()
         
         # Fetch news
-        ai_apps_news, rad_ai_news = self.fetch_news()
+        with metrics.span('fetch'):
+            ai_apps_news, rad_ai_news = self.fetch_news()
         
         # Create cover image
-        image_path = self.create_cover_image(current_date)
+        with metrics.span('render', target='cover'):
+            image_path = self.create_cover_image(current_date)
         
-        # Format post
-        post_content = self.format_linkedin_post(ai_apps_news, rad_ai_news, current_date)
+        # Format post (summaries are created here, see the 'enrich' span)
+        with metrics.span('render', target='linkedin'):
+            post_content = self.format_linkedin_post(ai_apps_news, rad_ai_news, current_date)
         
         # Post to LinkedIn
-        self.post_to_linkedin(post_content, image_path)
+        with metrics.span('post', sink='linkedin'):
+            self.post_to_linkedin(post_content, image_path)
 
 if __name__ == "__main__":
+    configure_logging()
     bot = RadiologyAINewsBot()
-    bot.run()
\ No newline at end of file
+    try:
+        bot.run()
+    finally:
+        metrics.write(CONFIG['metrics_dir'])
\ No newline at end of file
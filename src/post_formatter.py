@@ -1,62 +1,45 @@
 from datetime import datetime
 from typing import Dict, List
+import logging
+from .filters.profiles import DigestProfile, get_profile, DEFAULT_PROFILE
+from .post_templates import PostTemplateEngine
+from .storage.trend_history import week_of
+from .telemetry import metrics
+
+logger = logging.getLogger(__name__)
 
 class PostFormatter:
-    def __init__(self):
+    def __init__(self, history=None):
+        """``history`` (TrendHistory) adds a "trends this week" section to each post"""
+        self.history = history
         self.max_takeaways = 3
         self.max_summary_length = 300
-
-    def format_post(self, news: Dict[str, List[Dict]], current_date: datetime) -> str:
-        """Format news into a LinkedIn post"""
-        # Header
-        post = f"📰 Healthcare AI News Update - {current_date.strftime('%B %d, %Y')}\n\n"
-
-        # Radiology AI Section
-        post += "🔬 Radiology AI Highlights:\n\n"
-        if news['radiology']:
-            post += self._format_articles(news['radiology'])
-        else:
-            post += "No major radiology AI updates this week.\n\n"
-
-        # Healthcare AI Section
-        post += "🏥 Healthcare AI Innovations:\n\n"
-        if news['healthcare']:
-            post += self._format_articles(news['healthcare'])
-        else:
-            post += "No major healthcare AI updates this week.\n\n"
-
-        # Add hashtags
-        post += self._get_hashtags()
-        return post
-
-    def _format_articles(self, articles: List[Dict]) -> str:
-        """Format a list of articles"""
-        formatted = ""
-        for i, article in enumerate(articles, 1):
-            # Title and source
-            formatted += f"{i}. {article['title']}\n"
-            formatted += f"Source: {article['source']}\n"
-
-            # Summary (if available)
-            if 'summary' in article:
-                summary = article['summary']
-                if len(summary) > self.max_summary_length:
-                    summary = summary[:self.max_summary_length] + '...'
-                formatted += f"{summary}\n"
-
-            # Key takeaways (if available)
-            if article.get('takeaways'):
-                formatted += "Key takeaways:\n"
-                for takeaway in article['takeaways'][:self.max_takeaways]:
-                    formatted += f"• {takeaway}\n"
-
-            formatted += "\n"
-        return formatted
-
-    def _get_hashtags(self) -> str:
-        """Generate relevant hashtags"""
-        return (
-            "#HealthcareAI #RadiologyAI #ArtificialIntelligence "
-            "#HealthTech #DigitalHealth #MedicalImaging #Healthcare "
-            "#Innovation #AI #Radiology"
-        )
\ No newline at end of file
+        self.default_profile = get_profile(DEFAULT_PROFILE)
+        # Templates are compiled once here and reused for every render
+        self.engine = PostTemplateEngine(self.max_takeaways, self.max_summary_length)
+
+    def format_post(self, news: Dict[str, List[Dict]], current_date: datetime,
+                    profile: DigestProfile = None) -> str:
+        """Format news into a LinkedIn post that fits LinkedIn's length limit"""
+        return self.render_targets(news, current_date, profile, ['linkedin'])['linkedin']
+
+    def render_targets(self, news: Dict[str, List[Dict]], current_date: datetime,
+                       profile: DigestProfile = None, targets: List[str] = None) -> Dict[str, str]:
+        """Render the digest as LinkedIn text, Markdown, HTML email and JSON in one pass"""
+        profile = profile or self.default_profile
+        trends = self.trends(current_date, profile)
+        with metrics.span('render', target='post', profile=profile.name):
+            return self.engine.render(news, current_date, profile, targets, trends)
+
+    def trends(self, current_date: datetime, profile: DigestProfile) -> List[Dict]:
+        """The profile's domain and healthcare keywords that are rising in this week's crawls"""
+        if self.history is None:
+            return []
+        keywords = profile.content_filter.rad_keywords + profile.content_filter.healthcare_keywords
+        try:
+            with metrics.span('trends', profile=profile.name):
+                return self.history.trends(week_of(current_date), keywords)
+        except Exception as e:
+            # The post goes out without the section rather than not at all
+            logger.warning(f"Could not compute trends: {str(e)}")
+            return []
@@ -0,0 +1,343 @@
+from datetime import datetime
+from html import escape as html_escape
+from string import Formatter
+from typing import Callable, Dict, List, Optional
+import json
+
+class CompiledTemplate:
+    """A format string parsed once into literal/field pieces"""
+
+    def __init__(self, source: str, escape: Callable[[str], str] = None):
+        self.pieces = [(literal, field) for literal, field, _, _ in Formatter().parse(source)]
+        self.escape = escape
+
+    def render(self, values: Dict) -> str:
+        out = []
+        for literal, field in self.pieces:
+            out.append(literal)
+            if field is not None:
+                value = str(values[field])
+                out.append(self.escape(value) if self.escape else value)
+        return ''.join(out)
+
+def _markdown_escape(text: str) -> str:
+    for char in '\\`*_[]':
+        text = text.replace(char, '\\' + char)
+    return text
+
+def _utf16_length(text: str) -> int:
+    """LinkedIn counts characters in UTF-16 code units (emoji count as two)"""
+    return len(text.encode('utf-16-le')) // 2
+
+# Template sources per target. Every key must be present for each target.
+TARGET_TEMPLATES = {
+    'linkedin': {
+        'header': "📰 {title} - {date}\n\n",
+        'heading': "{heading}\n\n",
+        'empty': "{empty}\n\n",
+        'items_start': "",
+        'items_end': "",
+        'article': "{index}. {title}\nSource: {source}\n",
+        'summary': "{summary}\n",
+        'takeaways_start': "Key takeaways:\n",
+        'takeaway': "• {takeaway}\n",
+        'takeaways_end': "",
+        'article_end': "\n",
+        'trends_start': "📈 Trends this week:\n",
+        'trend': "• {keyword}: {mentions} articles ({change_text})\n",
+        'trends_end': "\n",
+        'footer': "{hashtags}"
+    },
+    'markdown': {
+        'header': "# 📰 {title} - {date}\n\n",
+        'heading': "## {heading}\n\n",
+        'empty': "_{empty}_\n\n",
+        'items_start': "",
+        'items_end': "",
+        'article': "{index}. **[{title}]({url})** ({source})\n",
+        'summary': "   {summary}\n",
+        'takeaways_start': "   Key takeaways:\n",
+        'takeaway': "   - {takeaway}\n",
+        'takeaways_end': "",
+        'article_end': "\n",
+        'trends_start': "## 📈 Trends this week\n\n",
+        'trend': "- **{keyword}**: {mentions} articles ({change_text})\n",
+        'trends_end': "\n",
+        'footer': "{hashtags}\n"
+    },
+    'html': {
+        'header': "<html><body>\n<h1>📰 {title} - {date}</h1>\n",
+        'heading': "<h2>{heading}</h2>\n",
+        'empty': "<p><em>{empty}</em></p>\n",
+        'items_start': "<ol>\n",
+        'items_end': "</ol>\n",
+        'article': "<li><p><a href=\"{url}\">{title}</a><br><small>Source: {source}</small></p>\n",
+        'summary': "<p>{summary}</p>\n",
+        'takeaways_start': "<ul>\n",
+        'takeaway': "<li>{takeaway}</li>\n",
+        'takeaways_end': "</ul>\n",
+        'article_end': "</li>\n",
+        'trends_start': "<h2>📈 Trends this week</h2>\n<ul>\n",
+        'trend': "<li><strong>{keyword}</strong>: {mentions} articles ({change_text})</li>\n",
+        'trends_end': "</ul>\n",
+        'footer': "<p>{hashtags}</p>\n</body></html>\n"
+    }
+}
+
+TARGET_ESCAPES = {
+    'linkedin': None,
+    'markdown': _markdown_escape,
+    'html': html_escape
+}
+
+# Character budgets; None means unlimited
+DEFAULT_LIMITS = {
+    'linkedin': 3000,
+    'markdown': None,
+    'html': None,
+    'json': None
+}
+
+TARGET_MEASURES = {
+    'linkedin': _utf16_length
+}
+
+# Article renderings from richest to barest, with the share of value each keeps
+VARIANTS = [
+    {'name': 'full', 'summary_length': None, 'takeaways': None, 'value': 1.0},
+    {'name': 'compact', 'summary_length': 140, 'takeaways': 1, 'value': 0.75},
+    {'name': 'brief', 'summary_length': 0, 'takeaways': 0, 'value': 0.5}
+]
+
+class PostTemplateEngine:
+    """Renders one digest into several output targets in a single pass.
+
+    Templates are compiled when the engine is built. Targets with a character
+    budget are packed up front: every article's candidate renderings are
+    measured once and a small knapsack picks the most valuable combination
+    that fits, so nothing is rendered, measured and retried.
+    """
+
+    def __init__(self, max_takeaways: int = 3, max_summary_length: int = 300,
+                 limits: Dict[str, Optional[int]] = None, budget_unit: int = 10):
+        self.max_takeaways = max_takeaways
+        self.max_summary_length = max_summary_length
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.budget_unit = budget_unit
+        self.templates = {
+            target: {
+                key: CompiledTemplate(source, TARGET_ESCAPES[target])
+                for key, source in sources.items()
+            }
+            for target, sources in TARGET_TEMPLATES.items()
+        }
+
+    def render(self, news: Dict[str, List[Dict]], current_date: datetime, profile,
+               targets: List[str] = None, trends: List[Dict] = None) -> Dict[str, str]:
+        """Render the digest for each requested target.
+
+        ``trends`` are TrendHistory.trends() entries, rendered after the sections.
+        """
+        targets = targets or list(DEFAULT_LIMITS)
+        digest = self._build_model(news, current_date, profile, trends)
+
+        outputs = {}
+        for target in targets:
+            if target == 'json':
+                outputs[target] = json.dumps(self._public_digest(digest), ensure_ascii=False, indent=2)
+                continue
+            variants = self._pack(digest, target)
+            outputs[target] = self._fit(self._render_target(digest, target, variants), target)
+        return outputs
+
+    def _fit(self, text: str, target: str) -> str:
+        """Cut ``text`` to the target's limit. Packing keeps posts under it
+        unless even the barest rendering of the lead articles is too long.
+        """
+        limit = self.limits.get(target)
+        measure = TARGET_MEASURES.get(target, len)
+        if not limit or measure(text) <= limit:
+            return text
+        # Every character counts at least one unit, so cutting the excess converges
+        cut = limit - 1
+        while measure(text[:cut]) > limit - 1:
+            cut -= measure(text[:cut]) - (limit - 1)
+        return text[:cut] + '…'
+
+    def _build_model(self, news: Dict[str, List[Dict]], current_date: datetime, profile,
+                     trends: List[Dict] = None) -> Dict:
+        """Walk the digest once into the neutral model every target renders from"""
+        sections = []
+        for section in profile.sections:
+            articles = []
+            for rank, article in enumerate(news.get(section['key']) or [], 1):
+                articles.append({
+                    'title': article['title'],
+                    'source': article['source'],
+                    'url': article.get('url', ''),
+                    # None (no summary key) renders no line; '' renders an empty line
+                    'summary': article.get('summary'),
+                    'takeaways': list(article.get('takeaways') or [])[:self.max_takeaways],
+                    'value': 1.0 / rank
+                })
+            sections.append({
+                'key': section['key'],
+                'heading': section['heading'],
+                'empty': section['empty'],
+                'articles': articles
+            })
+        return {
+            'title': profile.title,
+            'date': current_date.strftime('%B %d, %Y'),
+            'sections': sections,
+            'trends': [
+                dict(trend, change_text=('new this week' if trend['change'] is None
+                                         else f"+{trend['change']:.0%} vs recent weeks"))
+                for trend in trends or []
+            ],
+            'hashtags': profile.hashtags
+        }
+
+    def _public_digest(self, digest: Dict) -> Dict:
+        """The JSON target's schema; packing fields such as ``value`` stay internal"""
+        return {
+            'title': digest['title'],
+            'date': digest['date'],
+            'articles': [
+                {
+                    'title': article['title'],
+                    'url': article['url'],
+                    'source': article['source'],
+                    'takeaways': article['takeaways'],
+                    'section': section['key']
+                }
+                for section in digest['sections'] for article in section['articles']
+            ],
+            'trends': [
+                {'keyword': trend['keyword'], 'mentions': trend['mentions'], 'change': trend['change']}
+                for trend in digest['trends']
+            ]
+        }
+
+    def _truncate(self, text: str, length: int) -> str:
+        if len(text) > length:
+            return text[:length] + '...'
+        return text
+
+    def _render_article(self, templates: Dict, article: Dict, index: int, variant: Dict) -> str:
+        parts = [templates['article'].render({
+            'index': index, 'title': article['title'],
+            'source': article['source'], 'url': article['url']
+        })]
+
+        summary_length = variant['summary_length']
+        if article['summary'] is not None and summary_length != 0:
+            limit = min(summary_length or self.max_summary_length, self.max_summary_length)
+            parts.append(templates['summary'].render({'summary': self._truncate(article['summary'], limit)}))
+
+        takeaways = article['takeaways']
+        if variant['takeaways'] is not None:
+            takeaways = takeaways[:variant['takeaways']]
+        if takeaways:
+            parts.append(templates['takeaways_start'].render({}))
+            parts.extend(templates['takeaway'].render({'takeaway': takeaway}) for takeaway in takeaways)
+            parts.append(templates['takeaways_end'].render({}))
+
+        parts.append(templates['article_end'].render({}))
+        return ''.join(parts)
+
+    def _render_target(self, digest: Dict, target: str, variants: Dict) -> str:
+        templates = self.templates[target]
+        parts = [templates['header'].render(digest)]
+        for s, section in enumerate(digest['sections']):
+            parts.append(templates['heading'].render(section))
+            chosen = [
+                (article, variants.get((s, a), VARIANTS[0]))
+                for a, article in enumerate(section['articles'])
+                if variants.get((s, a), VARIANTS[0]) is not None
+            ]
+            if not chosen:
+                parts.append(templates['empty'].render(section))
+                continue
+            parts.append(templates['items_start'].render({}))
+            for index, (article, variant) in enumerate(chosen, 1):
+                parts.append(self._render_article(templates, article, index, variant))
+            parts.append(templates['items_end'].render({}))
+        parts.append(self._render_trends(templates, digest))
+        parts.append(templates['footer'].render(digest))
+        return ''.join(parts)
+
+    def _render_trends(self, templates: Dict, digest: Dict) -> str:
+        if not digest['trends']:
+            return ''
+        return (templates['trends_start'].render({})
+                + ''.join(templates['trend'].render(trend) for trend in digest['trends'])
+                + templates['trends_end'].render({}))
+
+    def _pack(self, digest: Dict, target: str) -> Dict:
+        """Choose a variant (or omission) per article to fit the target budget.
+
+        Returns {(section_index, article_index): variant or None}. The lead
+        article of each section is never dropped. Costs are rounded up to
+        ``budget_unit`` characters, which keeps the knapsack small while
+        guaranteeing the packed post stays under the limit. When even the
+        barest lead articles do not fit, every other article is dropped and
+        render() cuts the post to the limit.
+        """
+        limit = self.limits.get(target)
+        if not limit:
+            return {}
+
+        templates = self.templates[target]
+        measure = TARGET_MEASURES.get(target, len)
+        unit = self.budget_unit
+
+        fixed = (measure(templates['header'].render(digest)) + measure(self._render_trends(templates, digest))
+                 + measure(templates['footer'].render(digest)))
+        items = []
+        for s, section in enumerate(digest['sections']):
+            fixed += measure(templates['heading'].render(section))
+            if not section['articles']:
+                # Rendered as the section's empty text; leads are never dropped, so only here
+                fixed += measure(templates['empty'].render(section))
+                continue
+            fixed += measure(templates['items_start'].render({})) + measure(templates['items_end'].render({}))
+            for a, article in enumerate(section['articles']):
+                options = []
+                for variant in VARIANTS:
+                    cost = measure(self._render_article(templates, article, a + 1, variant))
+                    options.append((-(-cost // unit), article['value'] * variant['value'], variant))
+                if a > 0:
+                    options.append((0, 0.0, None))
+                items.append(((s, a), options))
+
+        budget = (limit - fixed) // unit
+        if budget < 0:
+            # Even the skeleton is over budget; fall back to the barest renderings
+            return {key: (options[-1][2] if key[1] > 0 else VARIANTS[-1]) for key, options in items}
+
+        # Multiple-choice knapsack: best[b] is the best value using at most b units
+        NEG = float('-inf')
+        best = [0.0] * (budget + 1)
+        choices = []
+        for key, options in items:
+            new_best = [NEG] * (budget + 1)
+            choice = [None] * (budget + 1)
+            for b in range(budget + 1):
+                for o, (cost, value, _) in enumerate(options):
+                    if cost <= b and best[b - cost] != NEG and best[b - cost] + value > new_best[b]:
+                        new_best[b] = best[b - cost] + value
+                        choice[b] = o
+            best = new_best
+            choices.append(choice)
+
+        if best[budget] == NEG:
+            return {key: (options[-1][2] if key[1] > 0 else VARIANTS[-1]) for key, options in items}
+
+        selected = {}
+        b = budget
+        for (key, options), choice in zip(reversed(items), reversed(choices)):
+            o = choice[b]
+            selected[key] = options[o][2]
+            b -= options[o][0]
+        return selected
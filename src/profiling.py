@@ -0,0 +1,241 @@
+import json
+import logging
+import os
+import re
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames of threads parked waiting: the event loop in select, idle
+# executor workers, Event/Condition waits. Used where threads have no CPU clock.
+WAITING_FRAMES = {
+    ('select', 'selectors.py'), ('poll', 'selectors.py'), ('_worker', 'thread.py'),
+    ('wait', 'threading.py'), ('get', 'queue.py'), ('_wait_for_tstate_lock', 'threading.py')
+}
+
+class StackSampler:
+    """CPU sampling profiler that runs in a background thread.
+
+    Every ``interval`` seconds it records the Python stack of every other
+    thread that used CPU since the previous sample, tagged with the current
+    stage. Threads blocked in I/O or waiting for work are left out, so the
+    samples show where CPU went rather than where threads waited. Nothing is
+    traced per call, so the overhead stays around a percent at the default
+    200 Hz.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stage = 'idle'
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._code_names = {}
+        self._cpu_times = {}
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or not self._busy(thread_id, frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                stack.append(self.stage)
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def _busy(self, thread_id: int, frame) -> bool:
+        """Whether the thread used CPU since its previous sample"""
+        try:
+            cpu = time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+        except (AttributeError, OSError):
+            # No per-thread CPU clock here: judge by the frame the thread is in
+            code = frame.f_code
+            return (code.co_name, os.path.basename(code.co_filename)) not in WAITING_FRAMES
+        previous = self._cpu_times.get(thread_id)
+        self._cpu_times[thread_id] = cpu
+        return previous is not None and cpu > previous
+
+    def _frame_name(self, code) -> str:
+        # Formatting is cached per code object; stacks repeat a lot
+        name = self._code_names.get(code)
+        if name is None:
+            name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._code_names[code] = name
+        return name
+
+    def collapsed(self, stage: str = None) -> str:
+        """Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope, inferno)"""
+        lines = [f"{stack} {count}" for stack, count in sorted(self.samples.items())
+                 if stage is None or stack.split(';', 1)[0] == stage]
+        return '\n'.join(lines) + '\n' if lines else ''
+
+class Profiler:
+    """Per-stage CPU samples and memory snapshots for one run.
+
+    ``stage(name)`` marks a stage boundary: samples taken inside are tagged
+    with the stage and peak RSS is recorded when it ends. With ``memory`` a
+    tracemalloc snapshot is taken too, showing the stage's top allocators;
+    tracing slows allocation-heavy code several times over, so it is opt-in
+    while CPU sampling is cheap enough for production runs.
+
+    The traced peak is process-wide, so a stage only gets its own peak when
+    no other stage ran during it; memory.json always has the run's peak.
+    """
+
+    def __init__(self, output_dir: str, interval: float = 0.005, memory: bool = False,
+                 traceback_frames: int = 1, top: int = 15):
+        self.output_dir = output_dir
+        self.sampler = StackSampler(interval)
+        self.memory = memory
+        self.traceback_frames = traceback_frames
+        self.top = top
+        self.stages = []
+        self.stage_order = []
+        self._active = []
+        self._overlapped = set()
+        self._run_peak = 0
+        self._previous_snapshot = None
+
+    @contextmanager
+    def run(self):
+        """Profile everything inside the block and write the results at the end"""
+        if self.memory:
+            tracemalloc.start(self.traceback_frames)
+        self.sampler.start()
+        try:
+            yield self
+        finally:
+            self.sampler.stop()
+            if self.memory:
+                self._run_peak = max(self._run_peak, tracemalloc.get_traced_memory()[1])
+            paths = self.write()
+            if self.memory:
+                tracemalloc.stop()
+            logger.info(f"Wrote profile to {paths['directory']}", extra=paths)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Tag samples with ``name`` until the block ends.
+
+        Stages may overlap (see stage_graph.StageGraph); samples are then
+        tagged with the most recently started stage still running.
+        """
+        if self._active:
+            self._overlapped.update(self._active + [name])
+        elif self.memory:
+            self._run_peak = max(self._run_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._active.append(name)
+        self.sampler.stage = name
+        if name not in self.stage_order:
+            self.stage_order.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._active.remove(name)
+            self.sampler.stage = self._active[-1] if self._active else 'idle'
+            self.stages.append(self._stage_record(name, elapsed, name in self._overlapped))
+            self._overlapped.discard(name)
+
+    def _stage_record(self, name: str, elapsed: float, overlapped: bool) -> Dict:
+        record = {'stage': name, 'seconds': round(elapsed, 6), 'max_rss_bytes': _max_rss()}
+        if not self.memory:
+            return record
+
+        current, peak = tracemalloc.get_traced_memory()
+        self._run_peak = max(self._run_peak, peak)
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')
+        ])
+        record.update({
+            'current_bytes': current,
+            # Overlapping stages share the peak, so it is not theirs alone
+            'peak_bytes': None if overlapped else peak,
+            'overlapped': overlapped,
+            'top_lines': self._top(snapshot.statistics('lineno')),
+            'top_files': self._top(snapshot.statistics('filename'))
+        })
+        if self._previous_snapshot is not None:
+            record['growth'] = [
+                {'where': str(stat.traceback), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                for stat in snapshot.compare_to(self._previous_snapshot, 'lineno')[:self.top]
+            ]
+        self._previous_snapshot = snapshot
+        return record
+
+    def _top(self, stats) -> List[Dict]:
+        return [{'where': str(stat.traceback), 'size': stat.size, 'count': stat.count}
+                for stat in stats[:self.top]]
+
+    def write(self) -> Dict[str, str]:
+        """Write cpu.collapsed, cpu_<stage>.collapsed and memory.json"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = {'directory': self.output_dir, 'cpu': os.path.join(self.output_dir, 'cpu.collapsed')}
+        with open(paths['cpu'], 'w') as f:
+            f.write(self.sampler.collapsed())
+        for stage in self.stage_order:
+            filename = re.sub(r'[^\w.-]+', '_', stage)
+            with open(os.path.join(self.output_dir, f'cpu_{filename}.collapsed'), 'w') as f:
+                f.write(self.sampler.collapsed(stage))
+
+        paths['memory'] = os.path.join(self.output_dir, 'memory.json')
+        with open(paths['memory'], 'w') as f:
+            json.dump({
+                'interval_seconds': self.sampler.interval,
+                'tracemalloc': self.memory,
+                'peak_bytes': self._run_peak if self.memory else None,
+                'samples': sum(self.sampler.samples.values()),
+                'stages': self.stages
+            }, f, indent=2)
+        return paths
+
+def _max_rss() -> int:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def make_profiler(mode: Optional[str], base_dir: str, run: str, interval: float = 0.005) -> Optional[Profiler]:
+    """A Profiler writing to ``<base_dir>/<run>-<timestamp>``, or None when ``mode`` is unset"""
+    if not mode:
+        return None
+    stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+    return Profiler(os.path.join(base_dir, f'{run}-{stamp}'), interval=interval, memory=mode == 'all')
+
+def stage(profiler: Optional[Profiler], name: str):
+    """``profiler.stage(name)``, or a no-op when profiling is off"""
+    return profiler.stage(name) if profiler else nullcontext()
+
+def add_profile_arguments(parser):
+    """The --profile flags shared by main.py, test_bot.py and the benchmarks"""
+    parser.add_argument('--profile', nargs='?', const='cpu', choices=['cpu', 'all'],
+                        help='Sample CPU stacks per stage in collapsed format; '
+                             "'all' also takes tracemalloc snapshots (slower)")
+    parser.add_argument('--profile-interval', type=float, default=0.005,
+                        help='Seconds between stack samples (default 0.005)')
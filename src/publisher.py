@@ -0,0 +1,120 @@
+import logging
+import asyncio
+import json
+import os
+from datetime import timedelta
+from typing import Dict, List
+import aiohttp
+from src.config import CONFIG
+from src.storage.outbox import Outbox
+from src.telemetry import configure_logging, metrics
+
+logger = logging.getLogger(__name__)
+
+class LinkedInSink:
+    name = 'linkedin'
+
+    def __init__(self, poster):
+        self.poster = poster
+
+    async def deliver(self, message: Dict):
+        await self.poster.post_async(message['payload']['linkedin'], message['image_path'])
+
+class MarkdownArchiveSink:
+    name = 'archive'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    async def deliver(self, message: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{message['date']}_{message['profile']}.md")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(message['payload'].get('markdown') or message['payload']['linkedin'])
+        os.replace(tmp_path, path)
+
+class WebhookSink:
+    name = 'webhook'
+
+    def __init__(self, url: str, timeout: int = 30):
+        self.url = url
+        self.timeout = timeout
+
+    async def deliver(self, message: Dict):
+        body = {
+            'key': message['key'],
+            'date': message['date'],
+            'profile': message['profile'],
+            'content': message['payload']
+        }
+        # Receivers can de-duplicate on the header if a retry races a slow success
+        headers = {'Idempotency-Key': message['key'], 'Content-Type': 'application/json'}
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            async with session.post(self.url, data=json.dumps(body), headers=headers) as response:
+                if response.status >= 300:
+                    raise Exception(f"Webhook returned status {response.status}")
+
+def build_sinks(linkedin_poster=None) -> List:
+    """Instantiate the sinks enabled in CONFIG['publish_sinks']"""
+    sinks = []
+    for name in CONFIG['publish_sinks']:
+        if name == 'linkedin':
+            if linkedin_poster is None:
+                from src.linkedin_poster import LinkedInPoster
+                linkedin_poster = LinkedInPoster()
+            sinks.append(LinkedInSink(linkedin_poster))
+        elif name == 'archive':
+            sinks.append(MarkdownArchiveSink(CONFIG['archive_dir']))
+        elif name == 'webhook':
+            if not CONFIG['webhook_url']:
+                raise ValueError("PUBLISH_WEBHOOK_URL must be set for the webhook sink")
+            sinks.append(WebhookSink(CONFIG['webhook_url']))
+        else:
+            raise ValueError(f"Unknown publish sink: {name}")
+    return sinks
+
+class Publisher:
+    """Delivers outbox messages to every sink concurrently.
+
+    Failures are recorded per sink, so a retry only resends to the sinks that
+    have not delivered yet and never needs a new crawl.
+    """
+
+    def __init__(self, outbox: Outbox, sinks: List):
+        self.outbox = outbox
+        self.sinks = {sink.name: sink for sink in sinks}
+
+    async def _deliver(self, message: Dict) -> bool:
+        sink = self.sinks[message['sink']]
+        try:
+            with metrics.span('publish', sink=sink.name):
+                await sink.deliver(message)
+        except Exception as e:
+            logger.warning(f"Delivery of {message['key']} to {sink.name} failed: {str(e)}",
+                           extra={'key': message['key'], 'sink': sink.name, 'attempt': message['attempts'] + 1})
+            self.outbox.mark_failed(message['key'], sink.name, str(e))
+            return False
+        logger.info(f"Delivered {message['key']} to {sink.name}", extra={'key': message['key'], 'sink': sink.name})
+        self.outbox.mark_delivered(message['key'], sink.name)
+        return True
+
+    async def publish_pending(self, keys: List[str] = None, max_age: timedelta = None) -> Dict[str, int]:
+        """Deliver what is pending for the configured sinks, limited to
+        ``keys`` and to messages queued within ``max_age``
+        """
+        pending = [message for message in self.outbox.pending(keys, max_age) if message['sink'] in self.sinks]
+        results = await asyncio.gather(*(self._deliver(message) for message in pending))
+        delivered = sum(results)
+        return {'delivered': delivered, 'failed': len(results) - delivered}
+
+if __name__ == "__main__":
+    # Retry pending deliveries without re-crawling. Digests queued too long ago
+    # are left alone, so an old week never goes out next to the current one.
+    configure_logging()
+    outbox = Outbox(CONFIG['outbox_path'])
+    max_age = timedelta(days=CONFIG['outbox_max_age_days'])
+    summary = asyncio.run(Publisher(outbox, build_sinks()).publish_pending(max_age=max_age))
+    logger.info(f"Delivered {summary['delivered']}, failed {summary['failed']}", extra=summary)
+    metrics.write(CONFIG['metrics_dir'], 'publish')
+    exit(1 if summary['failed'] else 0)
@@ -0,0 +1,143 @@
+"""Re-run scraper parsing and ranking over archived responses without the network.
+
+Reads raw bodies from the response archive (memory-mapped), parses them with
+each scraper's parse_response() in a process pool, then filters and ranks the
+result for every digest profile exactly as a live run would.
+
+    PYTHONPATH=. python src/reprocess.py --since 2024-01-01 --sources StatScraper ACRScraper
+"""
+import argparse
+import json
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List
+from src.aggregator.news_aggregator import NewsAggregator
+from src.config import CONFIG
+from src.filters.profiles import get_profiles
+from src.scrapers.acr_scraper import ACRScraper
+from src.scrapers.auntminnie_scraper import AuntMinnieScraper
+from src.scrapers.beckers_scraper import BeckersScraper
+from src.scrapers.healthcare_it_news_scraper import HealthcareITNewsScraper
+from src.scrapers.modern_healthcare_scraper import ModernHealthcareScraper
+from src.scrapers.newsapi_scraper import NewsAPIScraper
+from src.scrapers.rsna_ai_scraper import RSNAAIScraper
+from src.scrapers.stat_scraper import StatScraper
+from src.storage.article_store import ArticleStore
+from src.storage.response_archive import ResponseArchive, SegmentReader
+from src.telemetry import configure_logging, metrics
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS = {cls.__name__: cls for cls in (
+    ACRScraper, AuntMinnieScraper, BeckersScraper, HealthcareITNewsScraper,
+    ModernHealthcareScraper, NewsAPIScraper, RSNAAIScraper, StatScraper
+)}
+
+# Response kinds that yield candidates; extract_content() pages ('article') do not
+LISTING_KINDS = ['feed', 'listing', 'toc', 'journal_home', 'search', 'page']
+
+# Per-process state, created once by _init_worker
+_worker = {}
+
+def _init_worker(directory: str):
+    _worker['reader'] = SegmentReader(directory)
+    _worker['scrapers'] = {}
+
+def _decode(body: bytes, content_type: str) -> str:
+    match = re.search(r'charset=([\w-]+)', content_type or '')
+    try:
+        return body.decode(match.group(1) if match else 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+def _parse_batch(entries: List[Dict]) -> Dict:
+    """Parse a batch of archived responses (runs in a worker process)"""
+    reader, scrapers = _worker['reader'], _worker['scrapers']
+    parsed, errors = [], 0
+    for entry in entries:
+        if entry['source'] not in scrapers:
+            scrapers[entry['source']] = SCRAPERS[entry['source']]()
+        record = reader.read(entry['segment'], entry['offset'], entry['length'])
+        try:
+            articles = scrapers[entry['source']].parse_response(
+                entry['kind'], _decode(record['body'], record['headers'].get('Content-Type')), entry['url']
+            )
+        except Exception:
+            errors += 1
+            continue
+        for article in articles:
+            parsed.append({'scraper': entry['source'], 'fetched': entry['fetched'], 'article': article})
+    return {'parsed': parsed, 'records': len(entries), 'errors': errors}
+
+def reprocess(since: datetime = None, until: datetime = None, sources: List[str] = None,
+              kinds: List[str] = None, profile_names: List[str] = None, workers: int = None,
+              batch_size: int = 64) -> Dict:
+    """Parse archived responses in parallel and build one digest per profile"""
+    archive = ResponseArchive(CONFIG['response_archive_dir'])
+    entries = [entry for entry in archive.records(since, until, sources, kinds or LISTING_KINDS)
+               if entry['source'] in SCRAPERS]
+    archive.close()
+    logger.info(f"Reprocessing {len(entries)} archived responses", extra={'records': len(entries)})
+
+    # Entries are ordered by (segment, offset), so a batch touches few segments
+    batches = [entries[i:i + batch_size] for i in range(0, len(entries), batch_size)]
+    latest = {}
+    errors = 0
+    with metrics.span('reprocess_parse'), \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(CONFIG['response_archive_dir'],)) as pool:
+        for future in as_completed([pool.submit(_parse_batch, batch) for batch in batches]):
+            result = future.result()
+            errors += result['errors']
+            for item in result['parsed']:
+                # The most recently fetched copy of an article wins
+                url = item['article']['url']
+                if url not in latest or item['fetched'] > latest[url]['fetched']:
+                    latest[url] = item
+    if errors:
+        logger.warning(f"{errors} archived responses failed to parse", extra={'errors': errors})
+
+    aggregator = NewsAggregator()
+    candidates = [aggregator._tag_articles(item['scraper'], [item['article']])[0]
+                  for item in latest.values()]
+    profiles = get_profiles(profile_names or CONFIG['digest_profiles'])
+    with metrics.span('reprocess_rank'):
+        digests = aggregator._process_profiles(candidates, profiles)
+    return {'candidates': candidates, 'digests': digests, 'records': len(entries), 'errors': errors}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Re-run parsing and ranking over archived responses')
+    date = lambda s: datetime.strptime(s, '%Y-%m-%d')
+    parser.add_argument('--since', type=date, help='Oldest fetch date to include (YYYY-MM-DD)')
+    parser.add_argument('--until', type=date, help='Newest fetch date to include, inclusive (YYYY-MM-DD)')
+    parser.add_argument('--sources', nargs='+', choices=sorted(SCRAPERS), help='Scrapers to re-run')
+    parser.add_argument('--kinds', nargs='+', default=LISTING_KINDS, help='Response kinds to parse')
+    parser.add_argument('--profiles', nargs='+', help='Digest profiles (default DIGEST_PROFILES)')
+    parser.add_argument('--workers', type=int, help='Parser processes (default: CPU count)')
+    parser.add_argument('--output', help='Write every parsed candidate to this JSON-lines file')
+    parser.add_argument('--store', action='store_true', help='Upsert candidates into the article store')
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    configure_logging()
+    args = parse_args()
+    result = reprocess(args.since, args.until, args.sources, args.kinds, args.profiles, args.workers)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for article in result['candidates']:
+                f.write(json.dumps(article) + '\n')
+    if args.store:
+        store = ArticleStore(CONFIG['article_store_path'])
+        store.upsert_articles(result['candidates'])
+        store.close()
+
+    for name, sections in result['digests'].items():
+        print(f"\n=== {name} ===")
+        for section, articles in sections.items():
+            print(f"{section}:")
+            for article in articles:
+                print(f"  [{article['source']}] {article['title']}")
+    metrics.write(CONFIG['metrics_dir'], 'reprocess')
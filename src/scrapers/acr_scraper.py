@@ -1,11 +1,20 @@
 from .base_scraper import BaseScraper
+from ..filters.prefilter import prefilter
 from bs4 import BeautifulSoup
 from datetime import datetime
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class ACRScraper(BaseScraper):
+    # Listing items are any of the classes _parse_listing() looks for
+    fingerprint_markers = {
+        'listing': ((b'news-item', b'list-item', b'content-item', b'media-item'), (b'</article>', b'</div>'))
+    }
+
     def __init__(self):
-        super().__init__(rate_limit=2)
+        super().__init__()
         self.base_url = 'https://www.acr.org'
         self.news_endpoints = [
             '/Media-Center/ACR-News-Releases',
@@ -13,92 +22,144 @@ class ACRScraper(BaseScraper):
             '/Clinical-Resources/Informatics',
             '/Research/AI-LAB/News'
         ]
-        print(f"Initialized {self.__class__.__name__}")
+        self.max_archive_pages = 200
+        # Discovery: article pages live under the listing endpoints
+        self.sitemap_url = f'{self.base_url}/sitemap.xml'
+        self.discovery_patterns = {
+            'page': [f'^{re.escape(endpoint)}/.+' for endpoint in self.news_endpoints]
+        }
+        logger.debug(f"Initialized {self.__class__.__name__}")
 
     async def get_articles(self):
         """Fetch articles from ACR website"""
-        print(f"{self.__class__.__name__}: Starting article fetch...")
+        logger.info(f"{self.__class__.__name__}: Starting article fetch...")
         all_articles = []
 
         for endpoint in self.news_endpoints:
             try:
                 url = f"{self.base_url}{endpoint}"
-                content = await self._make_request(url)
-                soup = BeautifulSoup(content, 'html.parser')
+                content = await self._make_request(url, kind='listing')
+                with self._span('parse'):
+                    all_articles.extend(self._parse_fingerprinted('listing', content, url))
+
+            except Exception as e:
+                logger.warning(f"Error fetching ACR endpoint {endpoint}: {str(e)}")
+                continue
+
+        logger.info(f"{self.__class__.__name__}: Found {len(all_articles)} articles",
+                    extra={'source': self.__class__.__name__, 'articles': len(all_articles)})
+        return all_articles[:5]
+
+    def parse_response(self, kind, content, url=None):
+        """AI-related items of a listing page, or a discovered article page"""
+        if kind == 'listing':
+            return [article for article in self._parse_listing(content)
+                    if prefilter.check(article['title'], 'ai')]
+        if kind == 'page':
+            return [dict(article, source='ACR News') for article in self._parse_page(content, url)
+                    if prefilter.check(article['title'], 'ai')]
+        return []
+
+    def _parse_listing(self, content):
+        """Parse every news item on an ACR listing page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        all_articles = []
+
+        # Find content area
+        content_area = soup.find('div', class_=['content', 'main-content', 'news-listing'])
+        if not content_area:
+            return all_articles
 
-                # Find content area
-                content_area = soup.find('div', class_=['content', 'main-content', 'news-listing'])
-                if not content_area:
+        # Look for articles/news items in different formats
+        articles = content_area.find_all(['article', 'div'], class_=[
+            'news-item', 'list-item', 'content-item', 'media-item'
+        ])
+
+        for article in articles:
+            try:
+                # Find title and link
+                title_elem = article.find(['h2', 'h3', 'h4', 'a'], class_=['title', 'heading'])
+                if not title_elem:
                     continue
 
-                # Look for articles/news items in different formats
-                articles = content_area.find_all(['article', 'div'], class_=[
-                    'news-item', 'list-item', 'content-item', 'media-item'
-                ])
-
-                for article in articles:
-                    try:
-                        # Find title and link
-                        title_elem = article.find(['h2', 'h3', 'h4', 'a'], class_=['title', 'heading'])
-                        if not title_elem:
-                            continue
-
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Get link
-                        link = None
-                        if title_elem.name == 'a':
-                            link = title_elem['href']
-                        else:
-                            link_elem = title_elem.find('a')
-                            if link_elem:
-                                link = link_elem['href']
-
-                        if not link:
-                            continue
-
-                        # Make link absolute
-                        if not link.startswith('http'):
-                            link = f"{self.base_url}{link}"
-
-                        # Check if AI-related
-                        if self._is_ai_related(title):
-                            # Get date if available
-                            date_elem = article.find(['time', 'span'], class_=['date', 'timestamp'])
-                            pub_date = date_elem.get_text(strip=True) if date_elem else None
-
-                            # Get summary/description
-                            summary_elem = article.find(['p', 'div'], class_=['summary', 'description', 'excerpt'])
-                            summary = summary_elem.get_text(strip=True) if summary_elem else ''
-
-                            all_articles.append({
-                                'title': title,
-                                'url': link,
-                                'published_date': pub_date,
-                                'summary': summary,
-                                'source': 'ACR News'
-                            })
-
-                    except Exception as e:
-                        print(f"Error processing ACR article: {str(e)}")
-                        continue
+                title = title_elem.get_text(strip=True)
+                
+                # Get link
+                link = None
+                if title_elem.name == 'a':
+                    link = title_elem['href']
+                else:
+                    link_elem = title_elem.find('a')
+                    if link_elem:
+                        link = link_elem['href']
+
+                if not link:
+                    continue
+
+                # Make link absolute
+                if not link.startswith('http'):
+                    link = f"{self.base_url}{link}"
+
+                # Get date if available
+                date_elem = article.find(['time', 'span'], class_=['date', 'timestamp'])
+                pub_date = date_elem.get_text(strip=True) if date_elem else None
+
+                # Get summary/description
+                summary_elem = article.find(['p', 'div'], class_=['summary', 'description', 'excerpt'])
+                summary = summary_elem.get_text(strip=True) if summary_elem else ''
+
+                all_articles.append({
+                    'title': title,
+                    'url': link,
+                    'published_date': pub_date,
+                    'summary': summary,
+                    'source': 'ACR News'
+                })
 
             except Exception as e:
-                print(f"Error fetching ACR endpoint {endpoint}: {str(e)}")
+                logger.warning(f"Error processing ACR article: {str(e)}")
                 continue
 
-        print(f"{self.__class__.__name__}: Found {len(all_articles)} articles")
-        return all_articles[:5]
-
-    def _is_ai_related(self, text):
-        """Check if content is AI-related"""
-        ai_terms = [
-            'artificial intelligence', 'ai', 'machine learning', 'deep learning',
-            'neural network', 'algorithm', 'automation', 'computer-aided',
-            'ai lab', 'data science'
-        ]
-        text = text.lower()
-        return any(term in text for term in ai_terms)
+        return all_articles
+
+    def archive_streams(self):
+        """Each news endpoint is paged independently"""
+        return list(self.news_endpoints)
+
+    async def iter_archive(self, stream, since, until, resume=None):
+        """Page through an ACR listing with ?page=N until it runs past ``since``"""
+        page = int(resume) + 1 if resume else 1
+        while page <= self.max_archive_pages:
+            # An error page must raise rather than end the stream, so a backfill can resume it
+            content = await self.fetch_request({'url': f"{self.base_url}{stream}", 'kind': 'listing',
+                                                'params': {'page': page}})
+            with self._span('parse'):
+                items = self._parse_listing(content)
+            if not items:
+                return
+
+            articles = [article for article in items if prefilter.check(article['title'], 'ai')]
+            yield str(page), self._in_date_range(articles, since, until)
+
+            if self._older_than(items, since):
+                return
+            page += 1
+
+    def crawl_requests(self):
+        return [{'url': f"{self.base_url}{endpoint}", 'kind': 'listing'} for endpoint in self.news_endpoints]
+
+    def backfill_requests(self, stream, since, until):
+        return [{'url': f"{self.base_url}{stream}", 'kind': 'listing', 'params': {'page': 1}}]
+
+    def parse_request(self, request, content, since=None):
+        """Archive pages chain until one runs past ``since``, as in iter_archive()"""
+        if since is None or 'params' not in request:
+            return super().parse_request(request, content, since)
+        items = self._parse_listing(content)
+        articles = [article for article in items if prefilter.check(article['title'], 'ai')]
+        if not items or self._older_than(items, since):
+            return articles, None
+        return articles, self._next_page(request, 'page', self.max_archive_pages)
 
     async def extract_content(self, url):
         """Extract content from an ACR article"""
@@ -111,34 +172,15 @@ class ACRScraper(BaseScraper):
             if not article:
                 return None
 
-            # Get main content
-            text = article.get_text(strip=True)
-
-            # Extract key points
-            takeaways = []
-
-            # Look for highlighted sections
-            highlights = article.find_all(['h2', 'h3', 'strong', 'b'])
-            for highlight in highlights:
-                point = highlight.get_text(strip=True)
-                if len(point) > 20 and len(point) < 200:
-                    takeaways.append(point)
-                    if len(takeaways) == 3:
-                        break
-
-            # If no highlights found, use first few paragraphs
-            if not takeaways:
-                paragraphs = article.find_all('p')
-                for p in paragraphs[:3]:
-                    text = p.get_text(strip=True)
-                    if len(text) > 20:
-                        takeaways.append(text)
+            # Extract main content
+            text = self._article_text(article)
 
+            # Extractive takeaways for all enriched articles are added in one batch (NewsAggregator.enrich)
             return {
                 'text': text,
-                'takeaways': takeaways
+                'takeaways': []
             }
 
         except Exception as e:
-            print(f"Error extracting content from {url}: {str(e)}")
+            logger.warning(f"Error extracting content from {url}: {str(e)}")
             return None
\ No newline at end of file
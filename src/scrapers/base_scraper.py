@@ -1,32 +1,51 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 import aiohttp
 from bs4 import BeautifulSoup
-import time
+import asyncio
+import logging
+import re
+from .fingerprint import fragment_fingerprint
+from .http_client import http_client
+from .sitemap import iter_sitemap
+from ..telemetry import metrics
+
+logger = logging.getLogger(__name__)
 
 class BaseScraper(ABC):
-    def __init__(self, rate_limit=1):
-        self.rate_limit = rate_limit  # Time in seconds between requests
-        self.last_request = 0
-
-    def _respect_rate_limit(self):
-        """Ensure we don't exceed rate limit"""
-        now = time.time()
-        time_passed = now - self.last_request
-        if time_passed < self.rate_limit:
-            time.sleep(self.rate_limit - time_passed)
-        self.last_request = time.time()
-
-    async def _make_request(self, url, headers=None):
-        """Make a rate-limited request"""
-        self._respect_rate_limit()
-        default_headers = {
-            'User-Agent': 'RadiologyAINewsBot/1.0 (Research/Educational Purpose)'
-        }
-        headers = headers or default_headers
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                return await response.text()
+    # Sitemap discovery (see discover()): the site's sitemap or sitemap index,
+    # and per response kind the URL path patterns worth fetching
+    sitemap_url: Optional[str] = None
+    discovery_patterns: Dict[str, List[str]] = {}
+    # Per response kind, the (item markers, item closing tags) that bound the
+    # page's listing fragment (see fingerprint.fragment_fingerprint)
+    fingerprint_markers: Dict[str, Tuple[Tuple[bytes, ...], Tuple[bytes, ...]]] = {}
+
+    def __init__(self):
+        # Pacing is per host, from robots.txt and 429s (see http_client.HttpClient)
+        self.http_client = http_client
+        # A storage.page_fingerprints.PageFingerprints, set by the aggregator
+        self.fingerprints = None
+
+    async def _make_request(self, url, headers=None, params=None, kind='article'):
+        """Make a request paced by the host's crawl delay.
+
+        ``kind`` names the response type for the archive and parse_response().
+        """
+        # The span includes the pacing wait; the 'http' span is the wire time
+        with self._span('request'):
+            return await self.http_client.get(url, headers=headers, params=params,
+                                              archive=self._archive_tags(kind))
+
+    def _archive_tags(self, kind: str) -> Dict[str, str]:
+        return {'source': self.__class__.__name__, 'kind': kind}
+
+    def _span(self, stage: str):
+        """Time a stage of this scraper's work (see telemetry.Metrics.span)"""
+        return metrics.span(stage, source=self.__class__.__name__)
 
     @abstractmethod
     async def get_articles(self):
@@ -36,4 +55,231 @@ class BaseScraper(ABC):
     @abstractmethod
     async def extract_content(self, url):
         """Extract content from an article URL"""
-        pass
\ No newline at end of file
+        pass
+
+    def parse_response(self, kind: str, content: str, url: str = None) -> List[Dict]:
+        """Turn one archived response body of ``kind`` into candidate articles.
+
+        get_articles() uses the same parsing, so reprocessing archived
+        responses reproduces what a live crawl would have found.
+        """
+        return []
+
+    def _parse_fingerprinted(self, kind: str, content: str, url: str) -> List[Dict]:
+        """parse_response(), or the articles parsed last time when the page's
+        listing fragment has not changed since
+        """
+        markers = self.fingerprint_markers.get(kind)
+        fingerprint = fragment_fingerprint(content, markers) if self.fingerprints is not None and markers else None
+        if fingerprint is not None:
+            articles = self.fingerprints.lookup(url, kind, fingerprint)
+            if articles is not None:
+                metrics.inc('parses_skipped', source=self.__class__.__name__)
+                return articles
+        articles = self.parse_response(kind, content, url)
+        if fingerprint is not None:
+            self.fingerprints.record(url, kind, fingerprint, articles)
+        return articles
+
+    @staticmethod
+    def _article_text(article) -> str:
+        """An article element's paragraphs, one per line, so sentences can be split"""
+        paragraphs = [p.get_text(' ', strip=True) for p in article.find_all('p')]
+        return '\n'.join(paragraph for paragraph in paragraphs if paragraph) or article.get_text(' ', strip=True)
+
+    def _parse_page(self, content: str, url: str) -> List[Dict]:
+        """One article from a page's Open Graph and meta tags"""
+        soup = BeautifulSoup(content, 'html.parser')
+
+        def meta(*names):
+            for name in names:
+                tag = soup.find('meta', attrs={'property': name}) or soup.find('meta', attrs={'name': name})
+                if tag and tag.get('content'):
+                    return tag['content'].strip()
+            return None
+
+        title = meta('og:title', 'twitter:title') or (soup.title.get_text(strip=True) if soup.title else None)
+        if not title:
+            return []
+        time_elem = soup.find('time', attrs={'datetime': True})
+        return [{
+            'title': title,
+            'url': url,
+            'published_date': meta('article:published_time', 'dc.date', 'date') or
+                              (time_elem['datetime'] if time_elem else None),
+            'summary': meta('og:description', 'description') or ''
+        }]
+
+    async def discover(self, store, since: datetime, limit: int = 50) -> List[Dict]:
+        """Articles from sitemap URLs added or changed since the last crawl.
+
+        Walks the sitemap index against the lastmod index in ``store``
+        (storage.article_store.ArticleStore): child sitemaps whose lastmod has
+        not moved are skipped unread, and only URLs matching
+        discovery_patterns are fetched. On a source's first run only URLs
+        modified after ``since`` count as new. A URL is recorded once it has
+        been parsed, so failed and over-``limit`` URLs come back next run.
+        """
+        name = self.__class__.__name__
+        known = store.sitemap_lastmods(name)
+        first_run = not known
+        entries, sitemaps, complete = await self._walk_sitemaps(known)
+
+        changed, quiet = {}, []
+        for kind, entry in entries:
+            if entry.loc in known:
+                previous = known[entry.loc]
+                is_new = entry.lastmod is not None and (previous is None or entry.lastmod > previous)
+            else:
+                is_new = not first_run or (entry.lastmod or '') >= since.isoformat()
+            if is_new:
+                changed[entry.loc] = (kind, entry.lastmod)
+            elif entry.loc not in known:
+                quiet.append((entry.loc, entry.lastmod))
+
+        # Newest first, so a capped run still sees the latest changes
+        urls = sorted(changed, key=lambda url: changed[url][1] or '', reverse=True)
+        complete = complete and len(urls) <= limit
+        urls = urls[:limit]
+        results = await asyncio.gather(*[self._fetch_discovered(changed[url][0], url) for url in urls])
+
+        articles, handled = [], list(quiet)
+        for url, result in zip(urls, results):
+            if result is None:
+                complete = False
+                continue
+            articles.extend(result)
+            handled.append((url, changed[url][1]))
+        if complete:
+            # Only then can unchanged child sitemaps be skipped next time
+            handled.extend(sitemaps)
+        store.record_sitemap_entries(name, handled)
+        metrics.inc('discovered_urls', len(urls), source=name)
+        logger.info(f"{name}: {len(changed)} new or changed sitemap URLs, {len(articles)} articles",
+                    extra={'source': name, 'changed': len(changed), 'articles': len(articles)})
+        return articles
+
+    async def _walk_sitemaps(self, known: Dict[str, Optional[str]]):
+        """(kind, entry) for matching pages in every sitemap whose lastmod moved.
+
+        Returns those, the child sitemaps read and whether all were read.
+        """
+        entries, sitemaps, complete = [], [], True
+        pending = [self.sitemap_url]
+        while pending:
+            sitemap = pending.pop()
+            try:
+                with self._span('sitemap'):
+                    async for entry in iter_sitemap(self.http_client, sitemap):
+                        if entry.kind == 'url':
+                            kind = self._discovery_kind(entry.loc)
+                            if kind:
+                                entries.append((kind, entry))
+                        elif entry.lastmod is None or entry.lastmod != known.get(entry.loc):
+                            pending.append(entry.loc)
+                            sitemaps.append((entry.loc, entry.lastmod))
+            except Exception as e:
+                logger.warning(f"{self.__class__.__name__}: error reading sitemap {sitemap} - {str(e)}")
+                complete = False
+        return entries, sitemaps, complete
+
+    def _discovery_kind(self, url: str) -> Optional[str]:
+        path = urlsplit(url).path
+        for kind, patterns in self.discovery_patterns.items():
+            if any(re.search(pattern, path) for pattern in patterns):
+                return kind
+        return None
+
+    async def _fetch_discovered(self, kind: str, url: str) -> Optional[List[Dict]]:
+        try:
+            content = await self._make_request(url, kind=kind)
+            with self._span('parse'):
+                return self._parse_fingerprinted(kind, content, url)
+        except Exception as e:
+            logger.warning(f"{self.__class__.__name__}: error fetching {url} - {str(e)}")
+            return None
+
+    def archive_streams(self) -> List[str]:
+        """Independent archive listings this source can be backfilled from"""
+        return []
+
+    async def iter_archive(self, stream: str, since: datetime, until: datetime,
+                           resume: Optional[str] = None) -> AsyncIterator[Tuple[str, List[Dict]]]:
+        """Page through a source archive, yielding (cursor, articles) per page.
+
+        ``cursor`` identifies the page just read; passing it back as ``resume``
+        continues with the page after it. Sources without archives yield nothing.
+        """
+        return
+        yield
+
+    # Queue workers (crawl_workers.py) run a crawl as independent fetch and
+    # parse jobs. A request is a dict with 'url', 'kind' and optional 'params'.
+    def crawl_requests(self) -> List[Dict]:
+        """Listing requests that make up a regular crawl of this source"""
+        return []
+
+    def backfill_requests(self, stream: str, since: datetime, until: datetime) -> List[Dict]:
+        """First requests of an archive stream; parse_request() chains the rest"""
+        return []
+
+    async def fetch_request(self, request: Dict) -> str:
+        """Fetch a request's body; unlike _make_request() a non-200 status raises, so the job is retried"""
+        with self._span('request'):
+            response = await self.http_client.fetch(request['url'], params=request.get('params'),
+                                                    archive=self._archive_tags(request['kind']))
+        if response.status != 200:
+            raise Exception(f"HTTP {response.status} from {request['url']}")
+        return response.text
+
+    def parse_request(self, request: Dict, content: str,
+                      since: datetime = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Articles in a fetched response, and the request to follow it with (if any)"""
+        return self.parse_response(request['kind'], content, request['url']), None
+
+    @staticmethod
+    def _next_page(request: Dict, param: str, max_pages: int) -> Optional[Dict]:
+        page = request['params'][param]
+        if page >= max_pages:
+            return None
+        return dict(request, params=dict(request['params'], **{param: page + 1}))
+
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[datetime]:
+        """Best-effort parse of the date formats our sources publish"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            return parsed.replace(tzinfo=None)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            pass
+        for fmt in ('%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%m/%d/%Y'):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+        return None
+
+    def _in_date_range(self, articles: List[Dict], since: datetime, until: datetime) -> List[Dict]:
+        """Keep articles published from ``since`` through the whole ``until`` day;
+        undated articles are kept
+        """
+        end = datetime(until.year, until.month, until.day) + timedelta(days=1)
+        kept = []
+        for article in articles:
+            published = self._parse_date(article.get('published_date'))
+            if published is None or since <= published < end:
+                kept.append(article)
+        return kept
+
+    def _older_than(self, articles: List[Dict], since: datetime) -> bool:
+        """True when every dated article on a page predates ``since``"""
+        dates = [self._parse_date(article.get('published_date')) for article in articles]
+        dates = [date for date in dates if date is not None]
+        return bool(dates) and max(dates) < since
@@ -0,0 +1,38 @@
+import hashlib
+import re
+from typing import Optional, Sequence, Tuple, Union
+
+# Mixed into every fingerprint; bump when parsing or the prefilter changes so
+# articles stored under an old fingerprint are not reused
+PARSER_VERSION = 1
+
+# Markup that differs per request without changing the listing: scripts,
+# styles, hidden inputs and token-like attributes
+VOLATILE = re.compile(
+    rb'<script\b.*?</script\s*>|<style\b.*?</style\s*>|<input\b[^>]*\btype=["\']?hidden[^>]*>'
+    rb'|\s(?:nonce|[\w:-]*(?:csrf|token)[\w:-]*)=(?:"[^"]*"|\'[^\']*\'|[^\s>]+)',
+    re.IGNORECASE | re.DOTALL
+)
+
+# (item markers, item closing tags) of RSS and Atom feeds
+FEED_MARKERS = ((b'<item', b'<entry'), (b'</item>', b'</entry>'))
+
+def fragment_fingerprint(content: Union[str, bytes], markers: Tuple[Sequence[bytes], Sequence[bytes]]) -> Optional[str]:
+    """Hash of the part of a page that holds its listing, found without parsing.
+
+    ``markers`` is (item markers, item closing tags). The fragment runs from
+    the tag holding the first item marker to the last closing tag, so it
+    covers every item however the items are nested; volatile markup inside is
+    dropped. None when no item marker occurs.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    starts = [index for index in (data.find(marker) for marker in markers[0]) if index >= 0]
+    if not starts:
+        return None
+    start = max(data.rfind(b'<', 0, min(starts)), 0)
+    end = max(data.rfind(closing) + len(closing) for closing in markers[1])
+    if end <= start:
+        end = len(data)
+    digest = hashlib.blake2b(VOLATILE.sub(b'', data[start:end]), digest_size=16)
+    digest.update(b'v%d' % PARSER_VERSION)
+    return digest.hexdigest()
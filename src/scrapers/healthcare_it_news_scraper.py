@@ -1,59 +1,65 @@
 from .base_scraper import BaseScraper
+from .fingerprint import FEED_MARKERS
+from ..filters.prefilter import prefilter
 from bs4 import BeautifulSoup
+import logging
 import feedparser
 import re
 
+logger = logging.getLogger(__name__)
+
 class HealthcareITNewsScraper(BaseScraper):
+    fingerprint_markers = {'feed': FEED_MARKERS}
+
     def __init__(self):
-        super().__init__(rate_limit=2)
+        super().__init__()
         self.feed_url = 'https://www.healthcareitnews.com/rss/topics/artificial-intelligence'
         self.base_url = 'https://www.healthcareitnews.com'
-        print(f"Initialized {self.__class__.__name__} with feed URL: {self.feed_url}")
+        logger.debug(f"Initialized {self.__class__.__name__} with feed URL: {self.feed_url}")
 
     async def get_articles(self):
         """Fetch articles from Healthcare IT News"""
-        print(f"{self.__class__.__name__}: Starting article fetch...")
+        logger.info(f"{self.__class__.__name__}: Starting article fetch...")
         try:
-            content = await self._make_request(self.feed_url)
-            feed = feedparser.parse(content)
-            print(f"{self.__class__.__name__}: Found {len(feed.entries)} entries in feed")
-            
-            articles = []
-            for entry in feed.entries:
-                # Clean up the URL if needed
-                url = entry.link if entry.link.startswith('http') else f"{self.base_url}{entry.link}"
-                
-                article = {
-                    'title': entry.title,
-                    'url': url,
-                    'published_date': entry.get('published'),
-                    'summary': entry.get('summary', '')
-                }
-                
-                # Only add if it's AI/Healthcare related
-                if self._is_relevant(article):
-                    articles.append(article)
-            
-            print(f"{self.__class__.__name__}: Found {len(articles)} relevant articles")
+            content = await self._make_request(self.feed_url, kind='feed')
+            with self._span('parse'):
+                articles = self._parse_fingerprinted('feed', content, self.feed_url)
+
+            logger.info(f"{self.__class__.__name__}: Found {len(articles)} relevant articles",
+                        extra={'source': self.__class__.__name__, 'articles': len(articles)})
             return articles[:5]
 
         except Exception as e:
-            print(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
+            logger.warning(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
             return []
 
-    def _is_relevant(self, article):
-        """Check if article is relevant to AI in healthcare"""
-        text = f"{article['title']} {article['summary']}".lower()
-        
-        ai_terms = ['artificial intelligence', 'ai', 'machine learning', 'deep learning',
-                   'neural network', 'algorithm', 'automation']
-        healthcare_terms = ['health', 'medical', 'clinical', 'hospital', 'patient',
-                         'care', 'physician', 'provider']
-        
-        has_ai = any(term in text for term in ai_terms)
-        has_healthcare = any(term in text for term in healthcare_terms)
-        
-        return has_ai and has_healthcare
+    def parse_response(self, kind, content, url=None):
+        """Parse the RSS feed into relevant articles"""
+        if kind == 'feed':
+            return self._articles_from_entries(feedparser.parse(content).entries)
+        return []
+
+    def _articles_from_entries(self, entries):
+        """Map relevant feed entries to article dicts"""
+        articles = []
+        for entry in entries:
+            # Clean up the URL if needed
+            url = entry.link if entry.link.startswith('http') else f"{self.base_url}{entry.link}"
+            
+            article = {
+                'title': entry.title,
+                'url': url,
+                'published_date': entry.get('published'),
+                'summary': entry.get('summary', '')
+            }
+            
+            # Only add if it's AI/Healthcare related
+            if prefilter.matches(article, 'ai', 'healthcare'):
+                articles.append(article)
+        return articles
+
+    def crawl_requests(self):
+        return [{'url': self.feed_url, 'kind': 'feed'}]
 
     async def extract_content(self, url):
         """Extract content from a Healthcare IT News article"""
@@ -66,32 +72,14 @@ class HealthcareITNewsScraper(BaseScraper):
                 return None
 
             # Extract main content
-            text = article.get_text(strip=True)
-            
-            # Extract key points
-            takeaways = self._extract_takeaways(article)
+            text = self._article_text(article)
 
+            # Extractive takeaways for all enriched articles are added in one batch (NewsAggregator.enrich)
             return {
                 'text': text,
-                'takeaways': takeaways
+                'takeaways': []
             }
             
         except Exception as e:
-            print(f"Error extracting content from {url}: {str(e)}")
+            logger.warning(f"Error extracting content from {url}: {str(e)}")
             return None
-
-    def _extract_takeaways(self, article):
-        """Extract key takeaways from article"""
-        takeaways = []
-        
-        # Look for highlighted text, subheadings, or strong points
-        key_elements = article.find_all(['h2', 'h3', 'strong', 'b', 'em'])
-        
-        for element in key_elements:
-            text = element.get_text(strip=True)
-            if len(text) > 20 and len(text) < 200:  # Reasonable length for a key point
-                takeaways.append(text)
-                if len(takeaways) == 3:  # Limit to 3 takeaways
-                    break
-        
-        return takeaways
\ No newline at end of file
@@ -0,0 +1,157 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+class HostScheduler:
+    """Spaces out request starts per host.
+
+    Each host's interval is the larger of its robots.txt Crawl-delay (or
+    ``min_delay`` when it has none) and an adaptive penalty. A 429 or 503
+    doubles the penalty and blocks the host until any Retry-After has passed;
+    every successful response shrinks it again, so a host that stops pushing
+    back is soon crawled at its advertised pace.
+    """
+
+    def __init__(self, min_delay: float = 0.5, max_delay: float = 60.0, recovery: float = 0.8):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.recovery = recovery
+        self._crawl_delays: Dict[str, float] = {}
+        # host -> (next free slot, penalty)
+        self._slots: Dict[str, Tuple[float, float]] = {}
+
+    def set_crawl_delay(self, host: str, crawl_delay: Optional[float]):
+        if crawl_delay is None:
+            self._crawl_delays.pop(host, None)
+        else:
+            self._crawl_delays[host] = min(crawl_delay, self.max_delay)
+
+    def delay(self, host: str) -> float:
+        with self._transaction():
+            return self._interval(host, self._load(host)[1])
+
+    def _interval(self, host: str, penalty: float) -> float:
+        return max(self._crawl_delays.get(host, self.min_delay), penalty)
+
+    # State access; SharedHostScheduler keeps the same state in SQLite
+    def _clock(self) -> float:
+        return time.monotonic()
+
+    @contextmanager
+    def _transaction(self):
+        yield
+
+    def _load(self, host: str) -> Tuple[float, float]:
+        return self._slots.get(host, (0.0, 0.0))
+
+    def _store(self, host: str, next_slot: float, penalty: float):
+        self._slots[host] = (next_slot, penalty)
+
+    def _reserve(self, host: str) -> float:
+        """Claim the host's next slot; returns how long to wait for it"""
+        with self._transaction():
+            next_slot, penalty = self._load(host)
+            now = self._clock()
+            slot = max(now, next_slot)
+            self._store(host, slot + self._interval(host, penalty), penalty)
+        return slot - now
+
+    async def wait(self, host: str):
+        """Reserve the host's next slot, then sleep until it comes up.
+
+        Reserving first means concurrent callers queue one interval apart
+        instead of all waking at the same moment.
+        """
+        pause = self._reserve(host)
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    def record(self, host: str, status: int, retry_after: Optional[float] = None):
+        """Adapt the host's pace to a response"""
+        with self._transaction():
+            next_slot, penalty = self._load(host)
+            if status in (429, 503):
+                penalty = min(max(self._interval(host, penalty) * 2, 1.0), self.max_delay)
+                next_slot = max(next_slot, self._clock() + max(retry_after or 0.0, penalty))
+            elif penalty:
+                penalty *= self.recovery
+                if penalty <= self._crawl_delays.get(host, self.min_delay):
+                    penalty = 0.0
+            else:
+                return
+            self._store(host, next_slot, penalty)
+
+class SharedHostScheduler(HostScheduler):
+    """HostScheduler whose slots and penalties live in a SQLite file.
+
+    Every process using the same file, on this machine or another one sharing
+    the filesystem, draws from one schedule per host, so N crawl workers are
+    together as polite as one. Slots are wall-clock times because monotonic
+    clocks are not comparable across processes.
+    """
+
+    def __init__(self, path: str, min_delay: float = 0.5, max_delay: float = 60.0, recovery: float = 0.8):
+        super().__init__(min_delay, max_delay, recovery)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS host_slots (
+                host TEXT PRIMARY KEY,
+                next_slot REAL NOT NULL,
+                penalty REAL NOT NULL
+            )
+        ''')
+        self._lock = threading.Lock()
+
+    def _clock(self) -> float:
+        return time.time()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def _load(self, host: str) -> Tuple[float, float]:
+        row = self.conn.execute('SELECT next_slot, penalty FROM host_slots WHERE host = ?', (host,)).fetchone()
+        return row or (0.0, 0.0)
+
+    def _store(self, host: str, next_slot: float, penalty: float):
+        self.conn.execute('''
+            INSERT INTO host_slots (host, next_slot, penalty) VALUES (?, ?, ?)
+            ON CONFLICT(host) DO UPDATE SET next_slot = excluded.next_slot, penalty = excluded.penalty
+        ''', (host, next_slot, penalty))
+
+    async def wait(self, host: str):
+        # The reservation may wait on another process's lock; keep it off the loop
+        pause = await asyncio.get_running_loop().run_in_executor(None, self._reserve, host)
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    def close(self):
+        self.conn.close()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
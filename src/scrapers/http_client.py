@@ -0,0 +1,232 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import aiohttp
+from yarl import URL
+from .host_scheduler import HostScheduler, parse_retry_after
+from .robots import RobotsCache
+from ..telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+class HttpResponse:
+    """The parts of a response scrapers need once the connection is released"""
+
+    def __init__(self, status: int, text: str, url: str, headers: Dict[str, str]):
+        self.status = status
+        self.text = text
+        self.url = url
+        self.headers = headers
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'RadiologyAINewsBot/1.0 (Research/Educational Purpose)'
+}
+
+class RobotsDisallowed(Exception):
+    """The host's robots.txt does not allow us to fetch this URL"""
+
+class HttpClient:
+    """Pooled aiohttp client shared by all scrapers.
+
+    Keeps one ClientSession per event loop and bounds both the total number of
+    in-flight requests and the number of in-flight requests per host. GETs
+    are checked against the host's robots.txt, and request starts per host
+    are paced by its Crawl-delay and by any 429/503 pushback (see
+    host_scheduler.HostScheduler). Throttled requests that come with a
+    Retry-After are retried up to ``max_retries`` times.
+    """
+
+    def __init__(self, max_concurrency: int = 8, per_host_limit: int = 2, timeout: int = 30,
+                 min_delay: float = 0.5, respect_robots: bool = True, max_retries: int = 2,
+                 max_retry_wait: float = 120):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.respect_robots = respect_robots
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.scheduler = HostScheduler(min_delay)
+        self.robots = RobotsCache(DEFAULT_HEADERS['User-Agent'])
+        self._session = None
+        self._loop = None
+        self._global_limit = None
+        self._host_limits = {}
+        # Optional storage.response_archive.ResponseArchive for raw bodies
+        self.archive = None
+
+    def configure(self, max_concurrency: int = None, per_host_limit: int = None, archive=None,
+                  min_delay: float = None, respect_robots: bool = None, scheduler: HostScheduler = None):
+        """Change limits and politeness (from the next event loop on) or attach an archive.
+
+        ``scheduler`` replaces the per-host pacing, e.g. with a
+        SharedHostScheduler that paces hosts across processes.
+        """
+        if archive is not None:
+            self.archive = archive
+        if scheduler is not None:
+            self.scheduler = scheduler
+        if min_delay is not None:
+            self.scheduler.min_delay = min_delay
+        if respect_robots is not None:
+            self.respect_robots = respect_robots
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        if per_host_limit:
+            self.per_host_limit = per_host_limit
+        self._global_limit = None
+        self._host_limits = {}
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the session (and limits) lazily inside the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                # unsafe=True keeps cookies for IP hosts too (local stand-in servers)
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency,
+                                               limit_per_host=self.per_host_limit)
+            )
+            self._global_limit = None
+            self._host_limits = {}
+            self.robots.reset_pending()
+        if self._global_limit is None:
+            self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self._session
+
+    async def get(self, url: str, headers: Dict = None, params: Dict = None, archive: Dict = None) -> str:
+        """GET a URL within the global and per-host limits and return its body"""
+        response = await self.fetch(url, headers=headers, params=params, archive=archive)
+        return response.text
+
+    async def fetch(self, url: str, method: str = 'GET', headers: Dict = None, params: Dict = None,
+                    data: Dict = None, allow_redirects: bool = True, archive: Dict = None) -> HttpResponse:
+        """Issue a request within the limits and return status, body and final URL.
+
+        ``archive`` tags (source, kind) mark a successful GET body for the
+        response archive, when one is attached.
+        """
+        session = await self._ensure_session()
+        host = urlsplit(url).netloc
+        if method == 'GET' and self.respect_robots:
+            await self._check_robots(url, params)
+        for attempt in range(self.max_retries + 1):
+            # Pacing waits hold only this host's slot, never a global one
+            async with self._host_limit(url):
+                await self.scheduler.wait(host)
+                async with self._global_limit:
+                    response, body = await self._send(session, method, url, host, headers, params,
+                                                      data, allow_redirects)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.scheduler.record(host, response.status, retry_after)
+            if response.status in (429, 503):
+                metrics.inc('http_throttled', host=host)
+                if retry_after is not None and retry_after <= self.max_retry_wait and attempt < self.max_retries:
+                    logger.info(f"{host} throttled ({response.status}), retrying in {retry_after:.0f}s",
+                                extra={'host': host, 'status': response.status})
+                    continue
+            if self.archive is not None and archive is not None and response.status == 200:
+                # Compression and the index write stay off the event loop
+                await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                    self.archive.append, response.url, body, response.status,
+                    response.headers.get('Content-Type', ''), **archive
+                ))
+            return response
+
+    async def stream(self, url: str, headers: Dict = None, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """GET a URL and yield its raw body in chunks, under the same robots.txt
+        check, pacing and limits as fetch(). Raises on any status but 200.
+        """
+        session = await self._ensure_session()
+        host = urlsplit(url).netloc
+        if self.respect_robots:
+            await self._check_robots(url)
+        async with self._host_limit(url):
+            await self.scheduler.wait(host)
+            async with self._global_limit:
+                with metrics.span('http', host=host):
+                    async with session.get(url, headers=headers or DEFAULT_HEADERS) as response:
+                        metrics.inc('http_requests', host=host, status=response.status)
+                        self.scheduler.record(host, response.status,
+                                              parse_retry_after(response.headers.get('Retry-After')))
+                        if response.status != 200:
+                            raise Exception(f"GET {url} failed with status {response.status}")
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            metrics.inc('http_response_bytes', len(chunk), host=host)
+                            yield chunk
+
+    async def _send(self, session: aiohttp.ClientSession, method: str, url: str, host: str,
+                    headers: Dict, params: Dict, data: Dict, allow_redirects: bool) -> Tuple[HttpResponse, bytes]:
+        """One request on the wire; returns the response and its raw body"""
+        with metrics.span('http', host=host):
+            async with session.request(method, url, headers=headers or DEFAULT_HEADERS, params=params,
+                                       data=data, allow_redirects=allow_redirects) as response:
+                body = await response.read()
+                metrics.inc('http_requests', host=host, status=response.status)
+                metrics.inc('http_response_bytes', len(body), host=host)
+                # text() decodes the body read() already buffered
+                return HttpResponse(response.status, await response.text(),
+                                    str(response.url), response.headers.copy()), body
+
+    async def _check_robots(self, url: str, params: Dict = None):
+        """Apply the host's Crawl-delay and raise RobotsDisallowed for blocked URLs"""
+        parts = urlsplit(url)
+        rules = await self.robots.rules(f'{parts.scheme}://{parts.netloc}', self._fetch_robots)
+        self.scheduler.set_crawl_delay(parts.netloc, rules.crawl_delay)
+        target = str(URL(url).update_query(params)) if params else url
+        if not rules.can_fetch(target):
+            metrics.inc('robots_disallowed', host=parts.netloc)
+            raise RobotsDisallowed(f"robots.txt disallows {target}")
+
+    async def _fetch_robots(self, url: str):
+        session = await self._ensure_session()
+        async with self._global_limit:
+            async with session.get(url, headers=DEFAULT_HEADERS) as response:
+                return response.status, await response.text(errors='replace')
+
+    async def load_cookies(self, path: str, base_url: str) -> bool:
+        """Restore cookies saved for ``base_url``; returns False if none were saved"""
+        try:
+            with open(path) as f:
+                cookies = json.load(f)
+        except (OSError, ValueError):
+            return False
+        session = await self._ensure_session()
+        session.cookie_jar.update_cookies(cookies, response_url=URL(base_url))
+        return bool(cookies)
+
+    def save_cookies(self, path: str, base_url: str):
+        """Persist the cookies the shared session would send to ``base_url``"""
+        if self._session is None:
+            return
+        cookies = {name: morsel.value for name, morsel in
+                   self._session.cookie_jar.filter_cookies(URL(base_url)).items()}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cookies, f)
+        os.replace(tmp_path, path)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+# Process-wide client used by every scraper
+http_client = HttpClient()
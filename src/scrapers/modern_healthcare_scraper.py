@@ -1,19 +1,62 @@
 from .base_scraper import BaseScraper
+from .http_client import DEFAULT_HEADERS
 from bs4 import BeautifulSoup
-import aiohttp
+import logging
+import asyncio
 import os
-import json
+
+logger = logging.getLogger(__name__)
 
 class ModernHealthcareScraper(BaseScraper):
+    fingerprint_markers = {'search': ((b'search-result',), (b'</article>',))}
+
     def __init__(self):
-        super().__init__(rate_limit=2)
+        super().__init__()
         self.base_url = 'https://www.modernhealthcare.com'
         self.login_url = 'https://www.modernhealthcare.com/user/login'
         self.search_url = 'https://www.modernhealthcare.com/search'
         self.username = os.getenv('MODERN_HEALTHCARE_USERNAME')
         self.password = os.getenv('MODERN_HEALTHCARE_PASSWORD')
-        self.session = None
-        print(f"Initialized {self.__class__.__name__}")
+        self.account_url = 'https://www.modernhealthcare.com/user'
+        self.cookie_path = os.path.join(os.getenv('BOT_DATA_DIR', 'data'), 'modern_healthcare_cookies.json')
+        self._authenticated_session = None
+        self._login_lock = None
+        self._lock_loop = None
+        self.max_archive_pages = 200
+        # Discovery: technology coverage; article meta tags are public, so
+        # discovered pages need no login
+        self.sitemap_url = f'{self.base_url}/sitemap.xml'
+        self.discovery_patterns = {'page': [r'^/(technology|digital-health)/.+']}
+        logger.debug(f"Initialized {self.__class__.__name__}")
+
+    async def _ensure_login(self):
+        """Make sure the shared HTTP session is authenticated.
+
+        Logs in at most once per HTTP session: cookies persisted by an earlier
+        run are tried first and validated with one cheap request.
+        """
+        if self._login_lock is None or self._lock_loop is not asyncio.get_running_loop():
+            self._lock_loop = asyncio.get_running_loop()
+            self._login_lock = asyncio.Lock()
+
+        async with self._login_lock:
+            if self._authenticated_session is not None and \
+                    self._authenticated_session is self.http_client.session:
+                return
+
+            if await self.http_client.load_cookies(self.cookie_path, self.base_url) and \
+                    await self._session_valid():
+                logger.info(f"{self.__class__.__name__}: Reusing saved session")
+            else:
+                with self._span('login'):
+                    await self._login()
+                self.http_client.save_cookies(self.cookie_path, self.base_url)
+            self._authenticated_session = self.http_client.session
+
+    async def _session_valid(self):
+        """Cheap check: the account page only answers 200 for a logged-in user"""
+        response = await self.http_client.fetch(self.account_url, allow_redirects=False)
+        return response.status == 200
 
     async def _login(self):
         """Login to Modern Healthcare using form-based authentication"""
@@ -21,63 +64,64 @@ class ModernHealthcareScraper(BaseScraper):
             raise ValueError("Modern Healthcare credentials not found")
 
         try:
-            # Create a persistent session
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
             # First get the login page to get any CSRF token
-            async with self.session.get(self.login_url) as response:
-                if response.status != 200:
-                    raise Exception(f"Failed to get login page: {response.status}")
-                text = await response.text()
-                soup = BeautifulSoup(text, 'html.parser')
-                
-                # Find the login form and extract any hidden fields
-                form = soup.find('form', {'id': 'user-login-form'})
-                if not form:
-                    raise Exception("Login form not found")
-                
-                # Build login data including any hidden fields
-                login_data = {
-                    'name': self.username,
-                    'pass': self.password,
-                    'form_id': 'user_login_form'
-                }
-                
-                # Add any hidden fields from the form
-                for hidden in form.find_all('input', type='hidden'):
-                    login_data[hidden.get('name')] = hidden.get('value', '')
+            response = await self.http_client.fetch(self.login_url)
+            if response.status != 200:
+                raise Exception(f"Failed to get login page: {response.status}")
+            soup = BeautifulSoup(response.text, 'html.parser')
+            
+            # Find the login form and extract any hidden fields
+            form = soup.find('form', {'id': 'user-login-form'})
+            if not form:
+                raise Exception("Login form not found")
+            
+            # Build login data including any hidden fields
+            login_data = {
+                'name': self.username,
+                'pass': self.password,
+                'form_id': 'user_login_form'
+            }
+            
+            # Add any hidden fields from the form
+            for hidden in form.find_all('input', type='hidden'):
+                login_data[hidden.get('name')] = hidden.get('value', '')
 
             # Submit login form
-            headers = {
+            headers = dict(DEFAULT_HEADERS, **{
                 'Content-Type': 'application/x-www-form-urlencoded',
                 'Referer': self.login_url
-            }
+            })
             
-            async with self.session.post(
+            response = await self.http_client.fetch(
                 self.login_url,
+                method='POST',
                 data=login_data,
-                headers=headers,
-                allow_redirects=True
-            ) as response:
-                if response.status == 200:
-                    print(f"{self.__class__.__name__}: Successfully logged in")
-                    return self.session
-                else:
-                    raise Exception(f"Login failed with status {response.status}")
+                headers=headers
+            )
+            if response.status == 200:
+                logger.info(f"{self.__class__.__name__}: Successfully logged in")
+            else:
+                raise Exception(f"Login failed with status {response.status}")
 
         except Exception as e:
-            print(f"Login error: {str(e)}")
-            if self.session:
-                await self.session.close()
+            logger.warning(f"Login error: {str(e)}")
             raise
 
+    async def _authed_get(self, url, params=None, kind='article'):
+        """GET behind the login, logging in again once if the session expired"""
+        await self._ensure_login()
+        response = await self.http_client.fetch(url, params=params, archive=self._archive_tags(kind))
+        if response.status in (401, 403) or response.url.startswith(self.login_url):
+            logger.info(f"{self.__class__.__name__}: Session expired, logging in again")
+            self._authenticated_session = None
+            await self._ensure_login()
+            response = await self.http_client.fetch(url, params=params, archive=self._archive_tags(kind))
+        return response
+
     async def get_articles(self):
         """Fetch articles from Modern Healthcare"""
-        print(f"{self.__class__.__name__}: Starting article fetch...")
+        logger.info(f"{self.__class__.__name__}: Starting article fetch...")
         try:
-            session = await self._login()
-            
             # Search for AI-related articles
             params = {
                 'q': 'artificial intelligence',
@@ -85,78 +129,120 @@ class ModernHealthcareScraper(BaseScraper):
                 'date_range': 'last_week'
             }
             
-            async with session.get(self.search_url, params=params) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    soup = BeautifulSoup(text, 'html.parser')
-                    
-                    articles = []
-                    for article in soup.find_all('article', class_='search-result'):
-                        title_elem = article.find('h2')
-                        if title_elem and title_elem.find('a'):
-                            articles.append({
-                                'title': title_elem.text.strip(),
-                                'url': f"{self.base_url}{title_elem.find('a')['href']}",
-                                'published_date': article.find('time').get('datetime') if article.find('time') else None,
-                                'summary': article.find('p', class_='summary').text.strip() if article.find('p', class_='summary') else ''
-                            })
-                    
-                    print(f"{self.__class__.__name__}: Found {len(articles)} articles")
-                    return articles[:5]
-                else:
-                    print(f"Search failed with status {response.status}")
-                    return []
+            response = await self._authed_get(self.search_url, params=params, kind='search')
+            if response.status == 200:
+                with self._span('parse'):
+                    articles = self._parse_fingerprinted('search', response.text, response.url)
+
+                logger.info(f"{self.__class__.__name__}: Found {len(articles)} articles",
+                            extra={'source': self.__class__.__name__, 'articles': len(articles)})
+                return articles[:5]
+            else:
+                logger.warning(f"Search failed with status {response.status}",
+                               extra={'source': self.__class__.__name__, 'status': response.status})
+                return []
 
         except Exception as e:
-            print(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
+            logger.warning(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
             return []
-        finally:
-            if self.session:
-                await self.session.close()
-                self.session = None
+
+    def parse_response(self, kind, content, url=None):
+        """Articles from a search results page, or a discovered article page"""
+        if kind == 'search':
+            return self._parse_search_results(content)
+        if kind == 'page':
+            return self._parse_page(content, url)
+        return []
+
+    def _parse_search_results(self, text):
+        """Parse the result list of a search page"""
+        soup = BeautifulSoup(text, 'html.parser')
+        
+        articles = []
+        for article in soup.find_all('article', class_='search-result'):
+            title_elem = article.find('h2')
+            if title_elem and title_elem.find('a'):
+                articles.append({
+                    'title': title_elem.text.strip(),
+                    'url': f"{self.base_url}{title_elem.find('a')['href']}",
+                    'published_date': article.find('time').get('datetime') if article.find('time') else None,
+                    'summary': article.find('p', class_='summary').text.strip() if article.find('p', class_='summary') else ''
+                })
+        return articles
+
+    def archive_streams(self):
+        return ['search']
+
+    async def iter_archive(self, stream, since, until, resume=None):
+        """Page through date-bounded search results for AI coverage"""
+        page = int(resume) + 1 if resume else 1
+        while page <= self.max_archive_pages:
+            params = {
+                'q': 'artificial intelligence',
+                'sort': 'date',
+                'start_date': since.strftime('%Y-%m-%d'),
+                'end_date': until.strftime('%Y-%m-%d'),
+                'page': page
+            }
+            response = await self._authed_get(self.search_url, params=params, kind='search')
+            if response.status != 200:
+                raise Exception(f"Search failed with status {response.status}")
+
+            with self._span('parse'):
+                articles = self._parse_search_results(response.text)
+            if not articles:
+                return
+            yield str(page), self._in_date_range(articles, since, until)
+            page += 1
+
+    def crawl_requests(self):
+        params = {'q': 'artificial intelligence', 'sort': 'date', 'date_range': 'last_week'}
+        return [{'url': self.search_url, 'kind': 'search', 'params': params}]
+
+    def backfill_requests(self, stream, since, until):
+        params = {
+            'q': 'artificial intelligence',
+            'sort': 'date',
+            'start_date': since.strftime('%Y-%m-%d'),
+            'end_date': until.strftime('%Y-%m-%d'),
+            'page': 1
+        }
+        return [{'url': self.search_url, 'kind': 'search', 'params': params}]
+
+    async def fetch_request(self, request):
+        """Search pages are behind the login"""
+        response = await self._authed_get(request['url'], params=request.get('params'), kind=request['kind'])
+        if response.status != 200:
+            raise Exception(f"Search failed with status {response.status}")
+        return response.text
+
+    def parse_request(self, request, content, since=None):
+        """Archive pages chain until a page comes back empty, as in iter_archive()"""
+        articles = self.parse_response(request['kind'], content, request['url'])
+        if since is None or 'page' not in request.get('params', {}) or not articles:
+            return articles, None
+        return articles, self._next_page(request, 'page', self.max_archive_pages)
 
     async def extract_content(self, url):
         """Extract content from a Modern Healthcare article"""
         try:
-            if not self.session:
-                await self._login()
-
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    soup = BeautifulSoup(text, 'html.parser')
-                    
-                    article = soup.find('article')
-                    if not article:
-                        return None
-
-                    content = article.get_text(strip=True)
-                    takeaways = self._extract_takeaways(article)
-
-                    return {
-                        'text': content,
-                        'takeaways': takeaways
-                    }
-                else:
-                    print(f"Failed to fetch article with status {response.status}")
+            response = await self._authed_get(url)
+            if response.status == 200:
+                soup = BeautifulSoup(response.text, 'html.parser')
+                
+                article = soup.find('article')
+                if not article:
                     return None
 
+                # Extractive takeaways for all enriched articles are added in one batch (NewsAggregator.enrich)
+                return {
+                    'text': self._article_text(article),
+                    'takeaways': []
+                }
+            else:
+                logger.warning(f"Failed to fetch article with status {response.status}")
+                return None
+
         except Exception as e:
-            print(f"Error extracting content from {url}: {str(e)}")
+            logger.warning(f"Error extracting content from {url}: {str(e)}")
             return None
-        finally:
-            if self.session:
-                await self.session.close()
-                self.session = None
-
-    def _extract_takeaways(self, article):
-        """Extract key takeaways from Modern Healthcare article"""
-        takeaways = []
-        key_points = article.find_all(['h2', 'strong', 'b'])
-        
-        for point in key_points[:3]:
-            text = point.get_text(strip=True)
-            if len(text) > 20:
-                takeaways.append(text)
-        
-        return takeaways
\ No newline at end of file
@@ -0,0 +1,248 @@
+from .base_scraper import BaseScraper
+from ..filters.prefilter import prefilter
+from ..telemetry import metrics
+from bs4 import BeautifulSoup
+from datetime import datetime, timedelta
+import logging
+import asyncio
+import json
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+class NewsAPICache:
+    """On-disk TTL cache of NewsAPI responses plus the day's request count.
+
+    Entries normally expire after ``ttl`` seconds, but once the daily quota is
+    spent stale entries are served instead of making another request.
+    """
+
+    _instances = {}
+
+    @classmethod
+    def shared(cls, path: str, ttl: int, daily_quota: int) -> 'NewsAPICache':
+        """One cache object per file, so every scraper sees the same quota"""
+        if path not in cls._instances:
+            cls._instances[path] = cls(path, ttl, daily_quota)
+        return cls._instances[path]
+
+    def __init__(self, path: str, ttl: int, daily_quota: int):
+        self.path = path
+        self.ttl = ttl
+        self.daily_quota = daily_quota
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        self.entries = state.get('entries', {})
+        self.quota = state.get('quota', {})
+
+    def _today(self):
+        return datetime.utcnow().strftime('%Y-%m-%d')
+
+    @property
+    def requests_left(self) -> int:
+        used = self.quota.get('used', 0) if self.quota.get('date') == self._today() else 0
+        return max(self.daily_quota - used, 0)
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        if time.time() - entry['time'] <= self.ttl or not self.requests_left:
+            return entry['data']
+        return None
+
+    def record_request(self):
+        if self.quota.get('date') != self._today():
+            self.quota = {'date': self._today(), 'used': 0}
+        self.quota['used'] += 1
+
+    def exhaust(self):
+        """The API said we are out of quota; believe it for the rest of the day"""
+        self.quota = {'date': self._today(), 'used': self.daily_quota}
+
+    def set(self, key: str, data):
+        self.entries[key] = {'time': time.time(), 'data': data}
+
+    def save(self):
+        # Drop entries that are too old to ever be served again
+        cutoff = time.time() - 7 * 24 * 3600
+        self.entries = {k: v for k, v in self.entries.items() if v['time'] >= cutoff}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'entries': self.entries, 'quota': self.quota}, f)
+        os.replace(tmp_path, self.path)
+
+class NewsAPIScraper(BaseScraper):
+    # Identical requests in flight at the same time share one HTTP call
+    _in_flight = {}
+
+    def __init__(self, api_key=None, base_url=None, target_results=10):
+        super().__init__()
+        self.api_key = api_key or os.getenv('NEWS_API_KEY')
+        # NEWS_API_BASE_URL points the scraper at a local stand-in (benchmarks/stand_in_server.py)
+        self.base_url = (base_url or os.getenv('NEWS_API_BASE_URL', 'https://newsapi.org/v2')).rstrip('/')
+        self.queries = [
+            'artificial intelligence radiology',
+            'artificial intelligence healthcare'
+        ]
+        self.target_results = target_results
+        self.page_size = 100  # NewsAPI maximum; fewer pages means fewer quota hits
+        # One page per query by default, so a run spends at most len(queries) of the
+        # daily quota (NEWS_API_DAILY_QUOTA, 100 on the free plan)
+        self.max_pages = int(os.getenv('NEWS_API_MAX_PAGES', '1'))
+        self.lookback_days = 7
+        self.cache = NewsAPICache.shared(
+            os.path.join(os.getenv('BOT_DATA_DIR', 'data'), 'newsapi_cache.json'),
+            ttl=6 * 3600,
+            daily_quota=int(os.getenv('NEWS_API_DAILY_QUOTA', '100'))
+        )
+        logger.debug(f"Initialized {self.__class__.__name__}")
+
+    async def get_articles(self):
+        """Search NewsAPI for each query until enough relevant results are found"""
+        logger.info(f"{self.__class__.__name__}: Starting article fetch...")
+        if not self.api_key:
+            logger.info(f"{self.__class__.__name__}: NEWS_API_KEY not set, skipping")
+            return []
+
+        try:
+            results = await asyncio.gather(*(self._search(query) for query in self.queries),
+                                           return_exceptions=True)
+        finally:
+            self.cache.save()
+
+        articles = {}
+        for query, result in zip(self.queries, results):
+            if isinstance(result, Exception):
+                logger.error(f"{self.__class__.__name__}: Error searching '{query}': {str(result)}")
+                continue
+            for article in result:
+                articles.setdefault(article['url'], article)
+
+        logger.info(f"{self.__class__.__name__}: Found {len(articles)} relevant articles "
+                    f"({self.cache.requests_left} requests left today)",
+                    extra={'source': self.__class__.__name__, 'articles': len(articles),
+                           'quota_left': self.cache.requests_left})
+        return list(articles.values())
+
+    async def _search(self, query):
+        """Page through one query, stopping as soon as we have enough"""
+        relevant = []
+        for page in range(1, self.max_pages + 1):
+            data = await self._fetch_page(query, page)
+            if not data:
+                break
+
+            with self._span('parse'):
+                relevant.extend(self._relevant_articles(data))
+
+            if len(relevant) >= self.target_results or page * self.page_size >= data.get('totalResults', 0):
+                break
+        return relevant[:self.target_results]
+
+    async def _fetch_page(self, query, page):
+        """Fetch one result page via the cache, coalescing identical requests"""
+        since = (datetime.utcnow() - timedelta(days=self.lookback_days)).strftime('%Y-%m-%d')
+        params = {
+            'q': query,
+            'from': since,
+            'sortBy': 'publishedAt',
+            'language': 'en',
+            'pageSize': self.page_size,
+            'page': page
+        }
+        key = json.dumps(params, sort_keys=True)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics.inc('newsapi_cache_hits')
+            return cached
+
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+
+        if not self.cache.requests_left:
+            logger.info(f"{self.__class__.__name__}: Daily quota spent, skipping '{query}' page {page}")
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            data = await self._request(params)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            # Waiters must see an outcome even when this task is cancelled
+            if not isinstance(e, Exception):
+                e = Exception(f"Request for '{query}' page {page} was cancelled")
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _request(self, params):
+        self.cache.record_request()
+        metrics.inc('newsapi_requests')
+        response = await self.http_client.fetch(
+            f"{self.base_url}/everything",
+            params=params,
+            headers={'X-Api-Key': self.api_key, 'User-Agent': 'RadiologyAINewsBot/1.0'},
+            archive=self._archive_tags('search')
+        )
+        data = json.loads(response.text) if response.text else {}
+        if response.status == 429 or data.get('code') == 'rateLimited':
+            self.cache.exhaust()
+            logger.info(f"{self.__class__.__name__}: Rate limited by NewsAPI")
+            return None
+        if response.status != 200 or data.get('status') != 'ok':
+            raise Exception(f"NewsAPI error {response.status}: {data.get('message', '')}")
+
+        self.cache.set(json.dumps(params, sort_keys=True), data)
+        return data
+
+    def parse_response(self, kind, content, url=None):
+        """Relevant articles from an /everything response"""
+        if kind == 'search':
+            return self._relevant_articles(json.loads(content))
+        return []
+
+    def _relevant_articles(self, data):
+        articles = (self._to_article(item) for item in data.get('articles', []))
+        return [article for article in articles if article and prefilter.matches(article, 'ai', 'healthcare')]
+
+    def _to_article(self, item):
+        if not item.get('url') or not item.get('title'):
+            return None
+        return {
+            'title': item['title'],
+            'url': item['url'],
+            'published_date': item.get('publishedAt'),
+            'summary': item.get('description') or '',
+            'source': (item.get('source') or {}).get('name') or 'NewsAPI'
+        }
+
+    async def extract_content(self, url):
+        """Extract content from an article linked by NewsAPI"""
+        try:
+            content = await self._make_request(url)
+            soup = BeautifulSoup(content, 'html.parser')
+
+            article = soup.find('article') or soup.find('main')
+            if not article:
+                return None
+
+            return {
+                'text': self._article_text(article),
+                'takeaways': []
+            }
+
+        except Exception as e:
+            logger.warning(f"Error extracting content from {url}: {str(e)}")
+            return None
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+class RobotsRules:
+    """The allow/disallow rules and Crawl-delay that apply to one user agent.
+
+    Follows RFC 9309: the most specific (longest) matching rule wins, Allow
+    wins ties, ``*`` matches any run of characters and a trailing ``$``
+    anchors the end of the path. Crawl-delay is not part of the RFC but is
+    honoured as the minimum number of seconds between requests.
+    """
+
+    def __init__(self, rules: List[Tuple[bool, str]] = None, crawl_delay: Optional[float] = None):
+        self.crawl_delay = crawl_delay
+        # (allow, pattern length, compiled pattern), longest first
+        self._rules = sorted(
+            ((allow, len(path), _compile(path)) for allow, path in rules or [] if path),
+            key=lambda rule: (-rule[1], not rule[0])
+        )
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str) -> 'RobotsRules':
+        """Rules from the group naming our product token, else the ``*`` group"""
+        token = user_agent.split('/')[0].strip().lower()
+        groups = {}
+        agents, in_rules = [], False
+        for line in text.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            field, value = (part.strip() for part in line.split(':', 1))
+            field = field.lower()
+            if field == 'user-agent':
+                if in_rules:
+                    agents, in_rules = [], False
+                agents.append(value.lower())
+                for agent in agents:
+                    groups.setdefault(agent, {'rules': [], 'crawl_delay': None})
+            elif field in ('allow', 'disallow', 'crawl-delay') and agents:
+                in_rules = True
+                for agent in agents:
+                    group = groups[agent]
+                    if field == 'crawl-delay':
+                        try:
+                            group['crawl_delay'] = float(value)
+                        except ValueError:
+                            pass
+                    else:
+                        group['rules'].append((field == 'allow', value))
+
+        group = groups.get(token) or groups.get('*')
+        if group is None:
+            return cls()
+        return cls(group['rules'], group['crawl_delay'])
+
+    def can_fetch(self, url: str) -> bool:
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        for allow, _, pattern in self._rules:
+            if pattern.match(path):
+                return allow
+        return True
+
+def _compile(path: str):
+    anchored = path.endswith('$')
+    body = path[:-1] if anchored else path
+    regex = '.*'.join(re.escape(piece) for piece in body.split('*'))
+    return re.compile(regex + ('$' if anchored else ''))
+
+class RobotsCache:
+    """robots.txt per origin, fetched once and kept for ``ttl`` seconds.
+
+    Concurrent requests to a host wait on a single fetch. A 4xx means no
+    restrictions. On a 5xx or network error the last rules seen for the host
+    stay in force; with nothing cached the host is treated as unrestricted
+    and retried after ``error_ttl`` so an unreachable robots.txt cannot stall
+    a run.
+    """
+
+    def __init__(self, user_agent: str, ttl: float = 24 * 3600, error_ttl: float = 300):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._entries: Dict[str, Tuple[float, RobotsRules]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def reset_pending(self):
+        """Forget in-flight fetches (they belong to a previous event loop)"""
+        self._pending = {}
+
+    async def rules(self, origin: str, fetch) -> RobotsRules:
+        """Rules for ``origin`` (scheme://host); ``fetch(url)`` returns (status, text)"""
+        entry = self._entries.get(origin)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        if origin in self._pending:
+            return await asyncio.shield(self._pending[origin])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[origin] = future
+        try:
+            rules = await self._load(origin, fetch, entry[1] if entry else None)
+            future.set_result(rules)
+            return rules
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._pending[origin]
+
+    async def _load(self, origin: str, fetch, stale: Optional[RobotsRules]) -> RobotsRules:
+        ttl = self.ttl
+        try:
+            status, text = await fetch(f'{origin}/robots.txt')
+        except Exception as e:
+            status, text = None, str(e)
+        if status == 200:
+            rules = RobotsRules.parse(text, self.user_agent)
+        elif status is not None and 400 <= status < 500:
+            rules = RobotsRules()
+        else:
+            logger.warning(f"robots.txt unavailable for {origin} ({status or text})",
+                           extra={'origin': origin, 'status': status})
+            rules, ttl = stale or RobotsRules(), self.error_ttl
+        self._entries[origin] = (time.monotonic() + ttl, rules)
+        return rules
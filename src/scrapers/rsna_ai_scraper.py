@@ -1,100 +1,178 @@
 from .base_scraper import BaseScraper
 from bs4 import BeautifulSoup
 from datetime import datetime
+import logging
 import asyncio
 
+logger = logging.getLogger(__name__)
+
 class RSNAAIScraper(BaseScraper):
+    fingerprint_markers = {
+        'toc': ((b'item__content',), (b'</div>',)),
+        'journal_home': ((b'issue-item',), (b'</div>',))
+    }
+
     def __init__(self):
-        super().__init__(rate_limit=3)
+        super().__init__()
         self.base_url = 'https://pubs.rsna.org'
         self.latest_articles_url = 'https://pubs.rsna.org/toc/ai/0/0'
         self.journal_home_url = 'https://pubs.rsna.org/journal/ai'
-        print(f"Initialized {self.__class__.__name__}")
+        self.first_volume_year = 2019
+        self.issues_per_volume = 6
+        # Discovery: issue TOCs, including /toc/ai/0/0 (articles ahead of print)
+        self.sitemap_url = f'{self.base_url}/sitemap.xml'
+        self.discovery_patterns = {'toc': [r'^/toc/ai/\d+/\d+$']}
+        logger.debug(f"Initialized {self.__class__.__name__}")
 
     async def get_articles(self):
         """Fetch articles from RSNA AI journal"""
-        print(f"{self.__class__.__name__}: Starting article fetch...")
+        logger.info(f"{self.__class__.__name__}: Starting article fetch...")
         articles = []
 
         try:
             # Fetch latest articles
-            content = await self._make_request(self.latest_articles_url)
-            soup = BeautifulSoup(content, 'html.parser')
-
-            # Find all article containers
-            article_containers = soup.find_all('div', class_='item__content')
-            for container in article_containers:
-                try:
-                    # Get title and link
-                    title_elem = container.find('h5', class_='item__title')
-                    if not title_elem or not title_elem.find('a'):
-                        continue
-
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.find('a')['href']
-                    if not link.startswith('http'):
-                        link = f"{self.base_url}{link}"
-
-                    # Get publication date
-                    date_elem = container.find('span', class_='article-date')
-                    pub_date = date_elem.get_text(strip=True) if date_elem else None
-
-                    # Get abstract
-                    abstract_elem = container.find('div', class_='item__abstract')
-                    abstract = abstract_elem.get_text(strip=True) if abstract_elem else ''
-
-                    articles.append({
-                        'title': title,
-                        'url': link,
-                        'published_date': pub_date,
-                        'summary': abstract,
-                        'source': 'RSNA AI'
-                    })
-
-                except Exception as e:
-                    print(f"Error processing RSNA article: {str(e)}")
-                    continue
+            content = await self._make_request(self.latest_articles_url, kind='toc')
+            with self._span('parse'):
+                articles = self._parse_fingerprinted('toc', content, self.latest_articles_url)
 
             # If no articles found in latest, try journal home
             if not articles:
-                content = await self._make_request(self.journal_home_url)
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                for article in soup.find_all('div', class_='issue-item'):
-                    try:
-                        title_elem = article.find('h5', class_='issue-item__title')
-                        if not title_elem:
-                            continue
-
-                        title = title_elem.get_text(strip=True)
-                        link = title_elem.find('a')['href'] if title_elem.find('a') else None
-                        if not link:
-                            continue
-
-                        if not link.startswith('http'):
-                            link = f"{self.base_url}{link}"
-
-                        articles.append({
-                            'title': title,
-                            'url': link,
-                            'published_date': None,  # Date might need different parsing
-                            'summary': '',
-                            'source': 'RSNA AI'
-                        })
-
-                    except Exception as e:
-                        print(f"Error processing RSNA article from home: {str(e)}")
-                        continue
-
-            print(f"{self.__class__.__name__}: Found {len(articles)} articles")
+                content = await self._make_request(self.journal_home_url, kind='journal_home')
+                with self._span('parse'):
+                    articles = self._parse_fingerprinted('journal_home', content, self.journal_home_url)
+
+            logger.info(f"{self.__class__.__name__}: Found {len(articles)} articles",
+                        extra={'source': self.__class__.__name__, 'articles': len(articles)})
             return articles[:5]  # Return top 5 articles
 
         except Exception as e:
-            print(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.exception(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
             return []
 
+    def parse_response(self, kind, content, url=None):
+        """Articles from an issue TOC or the journal home page"""
+        if kind == 'toc':
+            return self._parse_toc(content)
+        if kind == 'journal_home':
+            return self._parse_journal_home(content)
+        return []
+
+    def _parse_toc(self, content):
+        """Parse the article containers of a table-of-contents page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        articles = []
+
+        # Find all article containers
+        article_containers = soup.find_all('div', class_='item__content')
+        for container in article_containers:
+            try:
+                # Get title and link
+                title_elem = container.find('h5', class_='item__title')
+                if not title_elem or not title_elem.find('a'):
+                    continue
+
+                title = title_elem.get_text(strip=True)
+                link = title_elem.find('a')['href']
+                if not link.startswith('http'):
+                    link = f"{self.base_url}{link}"
+
+                # Get publication date
+                date_elem = container.find('span', class_='article-date')
+                pub_date = date_elem.get_text(strip=True) if date_elem else None
+
+                # Get abstract
+                abstract_elem = container.find('div', class_='item__abstract')
+                abstract = abstract_elem.get_text(strip=True) if abstract_elem else ''
+
+                articles.append({
+                    'title': title,
+                    'url': link,
+                    'published_date': pub_date,
+                    'summary': abstract,
+                    'source': 'RSNA AI'
+                })
+
+            except Exception as e:
+                logger.warning(f"Error processing RSNA article: {str(e)}")
+                continue
+
+        return articles
+
+    def _parse_journal_home(self, content):
+        """Parse the issue items listed on the journal home page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        articles = []
+
+        for article in soup.find_all('div', class_='issue-item'):
+            try:
+                title_elem = article.find('h5', class_='issue-item__title')
+                if not title_elem:
+                    continue
+
+                title = title_elem.get_text(strip=True)
+                link = title_elem.find('a')['href'] if title_elem.find('a') else None
+                if not link:
+                    continue
+
+                if not link.startswith('http'):
+                    link = f"{self.base_url}{link}"
+
+                articles.append({
+                    'title': title,
+                    'url': link,
+                    'published_date': None,  # Date might need different parsing
+                    'summary': '',
+                    'source': 'RSNA AI'
+                })
+
+            except Exception as e:
+                logger.warning(f"Error processing RSNA article from home: {str(e)}")
+                continue
+
+        return articles
+
+    def archive_streams(self):
+        return ['issues']
+
+    async def iter_archive(self, stream, since, until, resume=None):
+        """Walk issue TOCs (/toc/ai/<volume>/<issue>) from newest to oldest.
+
+        Radiology: Artificial Intelligence started with volume 1 in 2019 and
+        publishes bimonthly, so volume = year - 2018 with issues 1-6.
+        """
+        issues = self._issues(since, until)
+        if resume:
+            done = tuple(int(part) for part in resume.split(':'))
+            issues = issues[issues.index(done) + 1:] if done in issues else issues
+
+        for volume, issue in issues:
+            # An error page must raise rather than be recorded as an empty issue
+            content = await self.fetch_request({'url': f"{self.base_url}/toc/ai/{volume}/{issue}", 'kind': 'toc'})
+            with self._span('parse'):
+                items = self._parse_toc(content)
+            yield f"{volume}:{issue}", self._in_date_range(items, since, until)
+
+            if self._older_than(items, since):
+                return
+
+    def _issues(self, since, until):
+        """(volume, issue) pairs covering [since, until], newest first"""
+        return [
+            (volume, issue)
+            for volume in range(until.year - self.first_volume_year + 1,
+                                since.year - self.first_volume_year, -1)
+            for issue in range(self.issues_per_volume, 0, -1)
+            if volume >= 1
+        ]
+
+    def crawl_requests(self):
+        return [{'url': self.latest_articles_url, 'kind': 'toc'}]
+
+    def backfill_requests(self, stream, since, until):
+        """Every issue TOC in range; they are independent, so workers fetch them in parallel"""
+        return [{'url': f"{self.base_url}/toc/ai/{volume}/{issue}", 'kind': 'toc'}
+                for volume, issue in self._issues(since, until)]
+
     async def extract_content(self, url):
         """Extract content from an RSNA AI article"""
         try:
@@ -108,19 +186,15 @@ class RSNAAIScraper(BaseScraper):
 
             # Extract abstract
             abstract = article.find('div', class_='article-section__abstract')
-            abstract_text = abstract.get_text(strip=True) if abstract else ''
+            abstract_text = self._article_text(abstract) if abstract else ''
 
-            # Extract key points
+            # Key points the article states; otherwise NewsAggregator.enrich extracts them
             key_points = article.find('div', class_='article-section__key-points')
             takeaways = []
             if key_points:
                 points = key_points.find_all('li')
                 for point in points[:3]:
-                    takeaways.append(point.get_text(strip=True))
-            else:
-                # If no key points, use first paragraph of abstract
-                if abstract_text:
-                    takeaways.append(abstract_text[:200] + '...')
+                    takeaways.append(point.get_text(' ', strip=True))
 
             return {
                 'text': abstract_text,
@@ -128,5 +202,5 @@ class RSNAAIScraper(BaseScraper):
             }
 
         except Exception as e:
-            print(f"Error extracting content from {url}: {str(e)}")
+            logger.warning(f"Error extracting content from {url}: {str(e)}")
             return None
\ No newline at end of file
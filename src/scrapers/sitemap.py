@@ -0,0 +1,72 @@
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, NamedTuple, Optional
+from xml.etree.ElementTree import XMLPullParser
+
+class SitemapEntry(NamedTuple):
+    kind: str  # 'sitemap' for a child of a sitemap index, 'url' for a page
+    loc: str
+    lastmod: Optional[str]  # naive UTC ISO timestamp, so entries compare as strings
+
+class SitemapParser:
+    """Incremental parser for sitemaps and sitemap indexes (sitemaps.org).
+
+    Feed it raw chunks as they arrive: gzip is detected from the first bytes,
+    and each <url>/<sitemap> element is dropped once read, so memory stays
+    flat however large the file is.
+    """
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=('end',))
+        self._decompressor = None
+        self._started = False
+        self._loc = None
+        self._lastmod = None
+
+    def feed(self, chunk: bytes) -> Iterator[SitemapEntry]:
+        if not self._started:
+            self._started = True
+            if chunk[:2] == b'\x1f\x8b':
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._decompressor:
+            chunk = self._decompressor.decompress(chunk)
+        self._parser.feed(chunk)
+        return self._entries()
+
+    def close(self) -> Iterator[SitemapEntry]:
+        self._parser.close()
+        return self._entries()
+
+    def _entries(self) -> Iterator[SitemapEntry]:
+        for _, element in self._parser.read_events():
+            tag = element.tag.rsplit('}', 1)[-1]
+            if tag == 'loc':
+                self._loc = (element.text or '').strip()
+            elif tag == 'lastmod':
+                self._lastmod = normalize_lastmod(element.text)
+            elif tag in ('url', 'sitemap'):
+                if self._loc:
+                    yield SitemapEntry('url' if tag == 'url' else 'sitemap', self._loc, self._lastmod)
+                self._loc = self._lastmod = None
+                element.clear()
+
+def normalize_lastmod(value: Optional[str]) -> Optional[str]:
+    """W3C datetime (2024-05-01, 2024-05-01T10:00:00+02:00) as naive UTC ISO"""
+    if not value or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+async def iter_sitemap(http_client, url: str) -> AsyncIterator[SitemapEntry]:
+    """Stream the entries of one sitemap or sitemap index"""
+    parser = SitemapParser()
+    async for chunk in http_client.stream(url):
+        for entry in parser.feed(chunk):
+            yield entry
+    for entry in parser.close():
+        yield entry
@@ -1,40 +1,92 @@
 from .base_scraper import BaseScraper
+from .fingerprint import FEED_MARKERS
+from ..filters.prefilter import prefilter
 from bs4 import BeautifulSoup
+import logging
 import aiohttp
 import feedparser
 
+logger = logging.getLogger(__name__)
+
 class StatScraper(BaseScraper):
+    fingerprint_markers = {'feed': FEED_MARKERS}
+
     def __init__(self):
-        super().__init__(rate_limit=2)
+        super().__init__()
         self.feed_url = 'https://www.statnews.com/feed/'
-        print(f"Initialized {self.__class__.__name__} with feed URL: {self.feed_url}")
+        self.max_archive_pages = 500
+        logger.debug(f"Initialized {self.__class__.__name__} with feed URL: {self.feed_url}")
 
     async def get_articles(self):
         """Fetch articles from STAT News"""
-        print(f"{self.__class__.__name__}: Starting article fetch...")
+        logger.info(f"{self.__class__.__name__}: Starting article fetch...")
         try:
-            content = await self._make_request(self.feed_url)
-            feed = feedparser.parse(content)
-            print(f"{self.__class__.__name__}: Found {len(feed.entries)} entries in feed")
-            
-            articles = []
-            for entry in feed.entries:
-                if self._is_ai_healthcare_related(entry):
-                    articles.append({
-                        'title': entry.title,
-                        'url': entry.link,
-                        'published_date': entry.get('published'),
-                        'summary': entry.get('summary', ''),
-                        'requires_auth': '+' in entry.get('tags', [])
-                    })
-            
-            print(f"{self.__class__.__name__}: Found {len(articles)} AI/healthcare-related articles")
+            content = await self._make_request(self.feed_url, kind='feed')
+            with self._span('parse'):
+                articles = self._parse_fingerprinted('feed', content, self.feed_url)
+
+            logger.info(f"{self.__class__.__name__}: Found {len(articles)} AI/healthcare-related articles",
+                        extra={'source': self.__class__.__name__, 'articles': len(articles)})
             return articles[:5]
 
         except Exception as e:
-            print(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
+            logger.warning(f"{self.__class__.__name__}: Error fetching articles - {str(e)}")
             return []
 
+    def parse_response(self, kind, content, url=None):
+        """Parse the RSS feed into relevant articles"""
+        if kind == 'feed':
+            return self._articles_from_entries(feedparser.parse(content).entries)
+        return []
+
+    def _articles_from_entries(self, entries):
+        """Map AI/healthcare-related feed entries to article dicts"""
+        articles = [{
+            'title': entry.title,
+            'url': entry.link,
+            'published_date': entry.get('published'),
+            'summary': entry.get('summary', ''),
+            'requires_auth': '+' in entry.get('tags', [])
+        } for entry in entries]
+        return [article for article in articles if prefilter.matches(article, 'ai', 'healthcare')]
+
+    def archive_streams(self):
+        return ['feed']
+
+    async def iter_archive(self, stream, since, until, resume=None):
+        """Page through the WordPress feed archive with ?paged=N"""
+        page = int(resume) + 1 if resume else 1
+        while page <= self.max_archive_pages:
+            # An error page must raise rather than end the stream, so a backfill can resume it
+            content = await self.fetch_request({'url': self.feed_url, 'kind': 'feed', 'params': {'paged': page}})
+            with self._span('parse'):
+                feed = feedparser.parse(content)
+                articles = self._articles_from_entries(feed.entries)
+            if not feed.entries:
+                return
+
+            yield str(page), self._in_date_range(articles, since, until)
+
+            if self._older_than([{'published_date': entry.get('published')} for entry in feed.entries], since):
+                return
+            page += 1
+
+    def crawl_requests(self):
+        return [{'url': self.feed_url, 'kind': 'feed'}]
+
+    def backfill_requests(self, stream, since, until):
+        return [{'url': self.feed_url, 'kind': 'feed', 'params': {'paged': 1}}]
+
+    def parse_request(self, request, content, since=None):
+        """Archive pages chain until one runs past ``since``, as in iter_archive()"""
+        if since is None or 'params' not in request:
+            return super().parse_request(request, content, since)
+        entries = feedparser.parse(content).entries
+        articles = self._articles_from_entries(entries)
+        if not entries or self._older_than([{'published_date': entry.get('published')} for entry in entries], since):
+            return articles, None
+        return articles, self._next_page(request, 'paged', self.max_archive_pages)
+
     async def extract_content(self, url):
         """Extract content from a STAT article"""
         try:
@@ -46,48 +98,19 @@ class StatScraper(BaseScraper):
                 return None
 
             # Extract text content
-            text = article.get_text(strip=True)
-            
-            # Extract key points
-            takeaways = self._extract_takeaways(article)
+            text = self._article_text(article)
 
+            # Extractive takeaways for all enriched articles are added in one batch (NewsAggregator.enrich)
             return {
                 'text': text,
-                'takeaways': takeaways,
+                'takeaways': [],
                 'paywall': self._is_paywalled(soup)
             }
             
         except Exception as e:
-            print(f"Error extracting content from {url}: {str(e)}")
+            logger.warning(f"Error extracting content from {url}: {str(e)}")
             return None
 
-    def _is_ai_healthcare_related(self, entry):
-        """Check if article is related to AI in healthcare"""
-        ai_keywords = ['artificial intelligence', 'AI', 'machine learning', 'deep learning',
-                    'neural network', 'algorithm']
-        healthcare_keywords = ['health', 'medical', 'clinical', 'patient', 'hospital',
-                           'doctor', 'physician', 'diagnosis', 'treatment']
-        
-        text = (entry.title + ' ' + entry.get('summary', '')).lower()
-        has_ai = any(keyword.lower() in text for keyword in ai_keywords)
-        has_healthcare = any(keyword.lower() in text for keyword in healthcare_keywords)
-        
-        return has_ai and has_healthcare
-
-    def _extract_takeaways(self, article):
-        """Extract key takeaways from article"""
-        takeaways = []
-        key_sections = article.find_all(['h2', 'h3', 'strong', 'b'])
-        
-        for section in key_sections:
-            text = section.get_text(strip=True)
-            if len(text) > 20 and len(text) < 200:
-                takeaways.append(text)
-                if len(takeaways) == 3:
-                    break
-        
-        return takeaways
-
     def _is_paywalled(self, soup):
         """Check if article is behind paywall"""
         paywall_indicators = [
@@ -0,0 +1,140 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .profiling import stage as profile_stage
+from .telemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+class Stage:
+    def __init__(self, name: str, func: Callable, after: Iterable[str] = (), executor: Optional[str] = None):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        # None runs the stage on the event loop (coroutines, cheap calls);
+        # 'thread' and 'process' move blocking or CPU-bound work off it
+        self.executor = executor
+        self.start = None
+        self.end = None
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+class StageGraph:
+    """Runs stages as soon as the stages they come after have finished.
+
+    Each stage is called with the results of its dependencies as keyword
+    arguments, so independent stages (crawling, rendering the cover, logging
+    in) overlap. After a run, ``critical_path()`` names the chain of stages
+    that determined the total time.
+    """
+
+    def __init__(self, profiler=None):
+        self.stages: Dict[str, Stage] = {}
+        self.profiler = profiler
+        self.started = None
+        self._process_pool = None
+
+    def add(self, name: str, func: Callable, after: Iterable[str] = (), executor: Optional[str] = None):
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage '{name}'")
+        if executor not in (None, 'thread', 'process'):
+            raise ValueError(f"Unknown executor '{executor}' for stage '{name}'")
+        missing = [dependency for dependency in after if dependency not in self.stages]
+        if missing:
+            # Dependencies must be added first, which also rules out cycles
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(missing)}")
+        self.stages[name] = Stage(name, func, after, executor)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every stage and return their results by name.
+
+        The first failure cancels the stages still running and is re-raised.
+        """
+        self.started = time.perf_counter()
+        tasks = {}
+        for stage in self.stages.values():
+            dependencies = [tasks[name] for name in stage.after]
+            tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, dependencies))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            if self._process_pool:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, stage: Stage, dependencies: List[asyncio.Future]):
+        results = await asyncio.gather(*dependencies)
+        kwargs = dict(zip(stage.after, results))
+        stage.start = time.perf_counter()
+        try:
+            with profile_stage(self.profiler, stage.name), metrics.span('pipeline', step=stage.name):
+                if inspect.iscoroutinefunction(stage.func):
+                    return await stage.func(**kwargs)
+                if stage.executor is None:
+                    return stage.func(**kwargs)
+                loop = asyncio.get_running_loop()
+                call = functools.partial(stage.func, **kwargs)
+                if stage.executor == 'process':
+                    if self._process_pool is None:
+                        self._process_pool = ProcessPoolExecutor()
+                    return await loop.run_in_executor(self._process_pool, call)
+                return await loop.run_in_executor(None, call)
+        finally:
+            stage.end = time.perf_counter()
+
+    def critical_path(self) -> List[Stage]:
+        """The finished stages that set the run's end time, first to last.
+
+        Walks back from the stage that finished last, each time to the
+        dependency that finished last (the one the stage waited for).
+        """
+        finished = [stage for stage in self.stages.values() if stage.end is not None]
+        if not finished:
+            return []
+        path = [max(finished, key=lambda stage: stage.end)]
+        while True:
+            dependencies = [self.stages[name] for name in path[-1].after if self.stages[name].end is not None]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=lambda stage: stage.end))
+        return list(reversed(path))
+
+    def report(self) -> Dict:
+        """Start, end and duration of each stage relative to the run start, plus the critical path"""
+        path = self.critical_path()
+        critical = {stage.name for stage in path}
+        stages = [
+            {'stage': stage.name, 'after': list(stage.after), 'critical': stage.name in critical,
+             'start_seconds': round(stage.start - self.started, 3),
+             'end_seconds': round(stage.end - self.started, 3),
+             'seconds': round(stage.seconds, 3)}
+            for stage in self.stages.values() if stage.end is not None
+        ]
+        return {
+            'wall_seconds': round(max(stage.end for stage in path) - self.started, 3) if path else 0.0,
+            'critical_path': [stage.name for stage in path],
+            'stages': stages
+        }
+
+    def log_report(self):
+        """Log the critical path and record each of its stages in the run metrics"""
+        report = self.report()
+        path = self.critical_path()
+        for stage in path:
+            metrics.inc('critical_path_seconds', stage.seconds, step=stage.name)
+        chain = ' -> '.join(f"{stage.name} ({stage.seconds:.2f}s)" for stage in path)
+        logger.info(f"Critical path: {chain}; {report['wall_seconds']:.2f}s wall", extra={'pipeline': report})
+        return report
@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class ArticleStore:
+    """SQLite store of every article we have seen, keyed by URL.
+
+    Also keeps backfill checkpoints so a page of articles and the cursor that
+    produced it are committed in the same transaction, and the sitemap lastmod
+    index that sitemap discovery diffs against.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                source TEXT,
+                published_date TEXT,
+                summary TEXT,
+                data TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_source ON articles (source);
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                job TEXT NOT NULL,
+                stream TEXT NOT NULL,
+                cursor TEXT,
+                done INTEGER NOT NULL DEFAULT 0,
+                updated TEXT NOT NULL,
+                PRIMARY KEY (job, stream)
+            );
+            CREATE TABLE IF NOT EXISTS sitemap_entries (
+                scraper TEXT NOT NULL,
+                url TEXT NOT NULL,
+                lastmod TEXT,
+                updated TEXT NOT NULL,
+                PRIMARY KEY (scraper, url)
+            );
+        ''')
+        self.conn.commit()
+
+    def _upsert(self, articles: List[Dict]):
+        now = datetime.utcnow().isoformat()
+        self.conn.executemany('''
+            INSERT INTO articles (url, title, source, published_date, summary, data, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title,
+                source = excluded.source,
+                published_date = COALESCE(excluded.published_date, articles.published_date),
+                summary = excluded.summary,
+                data = excluded.data,
+                last_seen = excluded.last_seen
+        ''', [
+            (article['url'], article['title'], article.get('source'), article.get('published_date'),
+             article.get('summary', ''), json.dumps(article, default=str), now, now)
+            for article in articles
+        ])
+
+    def upsert_articles(self, articles: List[Dict]):
+        """Insert or refresh articles"""
+        with self.conn:
+            self._upsert(articles)
+
+    def save_page(self, job: str, stream: str, cursor: str, articles: List[Dict]):
+        """Store one archive page and advance its checkpoint atomically"""
+        with self.conn:
+            self._upsert(articles)
+            self._set_checkpoint(job, stream, cursor, done=False)
+
+    def _set_checkpoint(self, job: str, stream: str, cursor: Optional[str], done: bool):
+        self.conn.execute('''
+            INSERT INTO checkpoints (job, stream, cursor, done, updated) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(job, stream) DO UPDATE SET
+                cursor = COALESCE(excluded.cursor, checkpoints.cursor),
+                done = excluded.done,
+                updated = excluded.updated
+        ''', (job, stream, cursor, int(done), datetime.utcnow().isoformat()))
+
+    def mark_done(self, job: str, stream: str):
+        with self.conn:
+            self._set_checkpoint(job, stream, None, done=True)
+
+    def get_checkpoint(self, job: str, stream: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            'SELECT cursor, done FROM checkpoints WHERE job = ? AND stream = ?', (job, stream)
+        ).fetchone()
+        if not row:
+            return None
+        return {'cursor': row[0], 'done': bool(row[1])}
+
+    def jobs(self, prefix: str) -> List[str]:
+        """Names of the checkpointed jobs starting with ``prefix``, in order"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT job FROM checkpoints WHERE job LIKE ? || '%' ORDER BY job", (prefix,)
+        )
+        return [row[0] for row in rows]
+
+    def sitemap_lastmods(self, scraper: str) -> Dict[str, Optional[str]]:
+        """Last recorded lastmod of every sitemap and page URL seen for a scraper"""
+        return dict(self.conn.execute(
+            'SELECT url, lastmod FROM sitemap_entries WHERE scraper = ?', (scraper,)
+        ))
+
+    def record_sitemap_entries(self, scraper: str, entries: List[Tuple[str, Optional[str]]]):
+        """Remember (url, lastmod) pairs as handled"""
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO sitemap_entries (scraper, url, lastmod, updated) VALUES (?, ?, ?, ?)
+                ON CONFLICT(scraper, url) DO UPDATE SET
+                    lastmod = excluded.lastmod,
+                    updated = excluded.updated
+            ''', [(scraper, url, lastmod, now) for url, lastmod in entries])
+
+    def iter_articles(self, source: str = None) -> Iterator[Dict]:
+        """Stream stored articles without loading the whole table"""
+        if source:
+            cursor = self.conn.execute('SELECT data FROM articles WHERE source = ?', (source,))
+        else:
+            cursor = self.conn.execute('SELECT data FROM articles')
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class JobQueue:
+    """Durable work queue in a SQLite file, shared by crawl worker processes.
+
+    A worker leases a job for ``lease_seconds``; if it dies without
+    completing or failing it, the lease expires and another worker picks the
+    job up. A failed job is retried with backoff until ``max_attempts``. Jobs
+    with a ``key`` are enqueued at most once, so re-running a plan is safe.
+    Any process that can open the file (on this machine or over a shared
+    filesystem) can lease jobs.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                key TEXT UNIQUE,
+                payload TEXT NOT NULL,
+                body BLOB,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                lease_expires REAL,
+                not_before REAL NOT NULL DEFAULT 0,
+                error TEXT,
+                created TEXT NOT NULL,
+                updated TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, kind, priority, not_before);
+        ''')
+        self._lock = threading.Lock()
+
+    def _execute(self, query: str, params=()):
+        with self._lock:
+            return self.conn.execute(query, params)
+
+    def enqueue(self, kind: str, payload: Dict, key: str = None, body: bytes = None,
+                priority: int = 0) -> bool:
+        """Add a job; returns False if a job with the same key already exists"""
+        now = datetime.utcnow().isoformat()
+        cursor = self._execute(
+            'INSERT OR IGNORE INTO jobs (kind, key, payload, body, priority, created, updated) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (kind, key, json.dumps(payload, default=str), body, priority, now, now)
+        )
+        return cursor.rowcount == 1
+
+    def lease(self, owner: str, kinds: List[str] = None) -> Optional[Dict]:
+        """Claim the next ready job (highest priority, then oldest), or None"""
+        now = time.time()
+        kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})" if kinds else ''
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Jobs whose worker died on the last attempt are given up on
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'lease expired', updated = ? "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (datetime.utcnow().isoformat(), now, self.max_attempts)
+                )
+                row = self.conn.execute(
+                    "SELECT id, kind, payload, body, attempts FROM jobs "
+                    "WHERE ((status = 'pending' AND not_before <= ?) OR (status = 'leased' AND lease_expires < ?))"
+                    f"{kind_filter} ORDER BY priority DESC, id LIMIT 1",
+                    (now, now, *(kinds or []))
+                ).fetchone()
+                if row:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                        "updated = ? WHERE id = ?",
+                        (owner, now + self.lease_seconds, datetime.utcnow().isoformat(), row[0])
+                    )
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+        if not row:
+            return None
+        return {'id': row[0], 'kind': row[1], 'payload': json.loads(row[2]), 'body': row[3],
+                'attempt': row[4] + 1}
+
+    def heartbeat(self, job_id: int, owner: str) -> bool:
+        """Extend a lease; False means it was lost to another worker"""
+        cursor = self._execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND owner = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, owner: str) -> bool:
+        cursor = self._execute(
+            "UPDATE jobs SET status = 'done', body = NULL, error = NULL, updated = ? "
+            "WHERE id = ? AND owner = ? AND status = 'leased'",
+            (datetime.utcnow().isoformat(), job_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, owner: str, error: str, retry: bool = True, backoff: float = 30):
+        """Release a job for a later retry, or mark it failed for good"""
+        with self._lock:
+            row = self.conn.execute('SELECT attempts FROM jobs WHERE id = ? AND owner = ?',
+                                    (job_id, owner)).fetchone()
+            if not row:
+                return
+            final = not retry or row[0] >= self.max_attempts
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, not_before = ?, owner = NULL, updated = ? "
+                "WHERE id = ? AND owner = ? AND status = 'leased'",
+                ('failed' if final else 'pending', error, time.time() + backoff * row[0],
+                 datetime.utcnow().isoformat(), job_id, owner)
+            )
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of jobs per kind and status"""
+        counts = {}
+        for kind, status, count in self._execute('SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status'):
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def unfinished(self) -> int:
+        """Jobs still pending or leased"""
+        return self._execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
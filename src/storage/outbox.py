@@ -0,0 +1,114 @@
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+class Outbox:
+    """Durable record of formatted digests and their delivery to each sink.
+
+    A digest is keyed by its ISO week and profile, not by its content: a
+    rerun that crawls slightly different articles still maps to the same
+    message, so enqueueing it again is a no-op and a sink that already
+    delivered that week's digest is never asked again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS messages (
+                key TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                image_path TEXT,
+                created TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS deliveries (
+                key TEXT NOT NULL REFERENCES messages (key),
+                sink TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                delivered_at TEXT,
+                PRIMARY KEY (key, sink)
+            );
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(date: str, profile: str) -> str:
+        """'2026-W43:radiology' for any date (YYYY-MM-DD) in that week"""
+        year, week, _ = datetime.strptime(date, '%Y-%m-%d').isocalendar()
+        return f"{year}-W{week:02d}:{profile}"
+
+    def enqueue(self, date: str, profile: str, payload: Dict[str, str],
+                image_path: Optional[str], sinks: List[str]) -> Tuple[str, bool]:
+        """Record a digest (rendered targets) for delivery to ``sinks``.
+
+        Returns the key and whether the digest was new; when the week's digest
+        for ``profile`` is already queued, nothing is changed.
+        """
+        key = self.make_key(date, profile)
+        with self.conn:
+            inserted = self.conn.execute(
+                'INSERT OR IGNORE INTO messages (key, date, profile, payload, image_path, created) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, date, profile, json.dumps(payload), image_path, datetime.utcnow().isoformat())
+            ).rowcount == 1
+            if inserted:
+                self.conn.executemany(
+                    'INSERT INTO deliveries (key, sink) VALUES (?, ?)',
+                    [(key, sink) for sink in sinks]
+                )
+        return key, inserted
+
+    def pending(self, keys: List[str] = None, max_age: timedelta = None,
+                max_attempts: int = 5) -> List[Dict]:
+        """Undelivered (message, sink) pairs that still have attempts left,
+        limited to ``keys`` and to messages queued within ``max_age``
+        """
+        query = '''
+            SELECT m.key, m.date, m.profile, m.payload, m.image_path, d.sink, d.attempts
+            FROM deliveries d JOIN messages m ON m.key = d.key
+            WHERE d.status != 'delivered' AND d.attempts < ?
+        '''
+        params = [max_attempts]
+        if keys is not None:
+            query += f" AND m.key IN ({', '.join('?' * len(keys))})"
+            params.extend(keys)
+        if max_age is not None:
+            query += ' AND m.created >= ?'
+            params.append((datetime.utcnow() - max_age).isoformat())
+        rows = self.conn.execute(query + ' ORDER BY m.created, d.sink', params).fetchall()
+        return [
+            {'key': key, 'date': date, 'profile': profile, 'payload': json.loads(payload),
+             'image_path': image_path, 'sink': sink, 'attempts': attempts}
+            for key, date, profile, payload, image_path, sink, attempts in rows
+        ]
+
+    def mark_delivered(self, key: str, sink: str):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE deliveries SET status = 'delivered', attempts = attempts + 1, "
+                "last_error = NULL, delivered_at = ? WHERE key = ? AND sink = ?",
+                (datetime.utcnow().isoformat(), key, sink)
+            )
+
+    def mark_failed(self, key: str, sink: str, error: str):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE deliveries SET status = 'failed', attempts = attempts + 1, last_error = ? "
+                "WHERE key = ? AND sink = ?",
+                (error, key, sink)
+            )
+
+    def status(self, key: str) -> Dict[str, str]:
+        rows = self.conn.execute('SELECT sink, status FROM deliveries WHERE key = ?', (key,))
+        return dict(rows.fetchall())
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,48 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class PageFingerprints:
+    """Per URL and response kind, the fingerprint of the page's listing
+    fragment (see scrapers/fingerprint.py) and the articles parsed from it.
+
+    A page whose fragment is unchanged gets its stored articles back instead
+    of being parsed again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                articles TEXT NOT NULL,
+                updated TEXT NOT NULL,
+                PRIMARY KEY (url, kind)
+            );
+        ''')
+        self.conn.commit()
+
+    def lookup(self, url: str, kind: str, fingerprint: str) -> Optional[List[Dict]]:
+        """The articles parsed from ``url`` when its fingerprint was ``fingerprint``"""
+        row = self.conn.execute(
+            'SELECT articles FROM pages WHERE url = ? AND kind = ? AND fingerprint = ?',
+            (url, kind, fingerprint)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record(self, url: str, kind: str, fingerprint: str, articles: List[Dict]):
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (url, kind, fingerprint, articles, updated) VALUES (?, ?, ?, ?, ?)',
+                (url, kind, fingerprint, json.dumps(articles, default=str), datetime.utcnow().isoformat())
+            )
+
+    def close(self):
+        self.conn.close()
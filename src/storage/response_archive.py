@@ -0,0 +1,167 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+class ResponseArchive:
+    """Append-only, compressed archive of raw response bodies.
+
+    Records are laid out like WARC ``resource`` records, each one its own gzip
+    member, in segment files under ``directory``; a SQLite index maps every
+    record to (segment, offset, length). A body identical to the last one
+    stored for the same URL is not written again, only its last_seen moves.
+    Each process appends to its own segment, so concurrent crawlers never
+    interleave writes.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                source TEXT,
+                kind TEXT,
+                status INTEGER,
+                digest TEXT NOT NULL,
+                fetched TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS records_url ON records (url, digest);
+            CREATE INDEX IF NOT EXISTS records_source ON records (source, kind, last_seen);
+        ''')
+        self.conn.commit()
+        self._lock = threading.Lock()
+        self._segment = None
+        self._file = None
+
+    def _open_segment(self):
+        if self._file and self._file.tell() < self.max_segment_bytes:
+            return
+        if self._file:
+            self._file.close()
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        self._segment = f"responses-{stamp}-{os.getpid()}-{uuid.uuid4().hex[:6]}.warc.gz"
+        self._file = open(os.path.join(self.directory, self._segment), 'ab')
+
+    def append(self, url: str, body: bytes, status: int = 200, content_type: str = '',
+               source: str = None, kind: str = None) -> bool:
+        """Archive one response body; returns False if it was unchanged since last time"""
+        digest = hashlib.sha256(body).hexdigest()
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT id, digest FROM records WHERE url = ? ORDER BY id DESC LIMIT 1', (url,)
+            ).fetchone()
+            if row and row[1] == digest:
+                with self.conn:
+                    self.conn.execute('UPDATE records SET last_seen = ? WHERE id = ?', (now, row[0]))
+                return False
+
+            header = '\r\n'.join([
+                'WARC/1.1',
+                'WARC-Type: resource',
+                f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+                f'WARC-Date: {now}Z',
+                f'WARC-Target-URI: {url}',
+                f'WARC-Payload-Digest: sha256:{digest}',
+                f'Content-Type: {content_type or "application/octet-stream"}',
+                f'X-Source: {source or ""}',
+                f'X-Kind: {kind or ""}',
+                f'X-Status: {status}',
+                f'Content-Length: {len(body)}',
+                '', ''
+            ]).encode('utf-8')
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # gzip member
+            record = compressor.compress(header) + compressor.compress(body) + \
+                compressor.compress(b'\r\n\r\n') + compressor.flush()
+
+            self._open_segment()
+            offset = self._file.tell()
+            self._file.write(record)
+            self._file.flush()
+            with self.conn:
+                self.conn.execute(
+                    'INSERT INTO records (segment, offset, length, url, source, kind, status, digest, '
+                    'fetched, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (self._segment, offset, len(record), url, source, kind, status, digest, now, now)
+                )
+        return True
+
+    def records(self, since: datetime = None, until: datetime = None, sources: List[str] = None,
+                kinds: List[str] = None) -> List[Dict]:
+        """Index entries whose body was current at some point between ``since``
+        and the end of the ``until`` day
+        """
+        query = 'SELECT id, segment, offset, length, url, source, kind, status, fetched, last_seen ' \
+                'FROM records WHERE 1 = 1'
+        params = []
+        if since:
+            query += ' AND last_seen >= ?'
+            params.append(since.isoformat())
+        if until:
+            query += ' AND fetched < ?'
+            params.append((datetime(until.year, until.month, until.day) + timedelta(days=1)).isoformat())
+        if sources:
+            query += f" AND source IN ({','.join('?' * len(sources))})"
+            params.extend(sources)
+        if kinds:
+            query += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        query += ' ORDER BY segment, offset'
+        columns = ['id', 'segment', 'offset', 'length', 'url', 'source', 'kind', 'status',
+                   'fetched', 'last_seen']
+        return [dict(zip(columns, row)) for row in self.conn.execute(query, params)]
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        self.conn.close()
+
+def parse_record(data: bytes) -> Dict:
+    """Split a decompressed record into its headers and body"""
+    head_end = data.index(b'\r\n\r\n')
+    lines = data[:head_end].decode('utf-8').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    length = int(headers['Content-Length'])
+    return {'headers': headers, 'body': data[head_end + 4:head_end + 4 + length]}
+
+def read_record(buffer, offset: int, length: int) -> Dict:
+    """Decompress the record at ``offset`` straight from a mapped segment.
+
+    Slicing the memoryview does not copy, so only the decompressed record is
+    materialized.
+    """
+    with memoryview(buffer) as whole, whole[offset:offset + length] as view:
+        return parse_record(zlib.decompressobj(31).decompress(view))
+
+class SegmentReader:
+    """Keeps segments memory-mapped while records are read from them"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._maps = {}
+
+    def read(self, segment: str, offset: int, length: int) -> Dict:
+        if segment not in self._maps:
+            with open(os.path.join(self.directory, segment), 'rb') as f:
+                self._maps[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return read_record(self._maps[segment], offset, length)
+
+    def close(self):
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
@@ -0,0 +1,78 @@
+import glob
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Bump when the snapshot layout changes; older snapshots are then refused
+SNAPSHOT_VERSION = 1
+
+class CandidateSnapshots:
+    """Gzipped JSON snapshots of each crawl's raw candidate set.
+
+    Every crawl writes ``candidates-<UTC time>.json.gz`` with the unfiltered
+    articles and the takeaways fetched for the selected ones, so filtering,
+    ranking and formatting can be re-run offline (``test_bot.py
+    --from-snapshot``). Only the newest ``keep`` snapshots are kept. The
+    digest of the last preview is kept next to them for diffing.
+    """
+
+    def __init__(self, directory: str, keep: int = 20):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, articles: List[Dict], takeaways: Dict[str, List[str]] = None, meta: Dict = None) -> str:
+        created = datetime.utcnow()
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'created': created.isoformat() + 'Z',
+            'meta': meta or {},
+            'articles': articles,
+            'takeaways': takeaways or {}
+        }
+        path = os.path.join(self.directory, f"candidates-{created.strftime('%Y%m%dT%H%M%S%f')}.json.gz")
+        data = json.dumps(snapshot, separators=(',', ':'), default=str).encode('utf-8')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=6))
+        os.replace(tmp_path, path)
+        for old in self.paths()[:-self.keep]:
+            os.remove(old)
+        return path
+
+    def paths(self) -> List[str]:
+        """Snapshot files, oldest first"""
+        return sorted(glob.glob(os.path.join(self.directory, 'candidates-*.json.gz')))
+
+    def load(self, path: Optional[str] = None) -> Dict:
+        """A snapshot by path, or the newest one"""
+        if path is None:
+            paths = self.paths()
+            if not paths:
+                raise FileNotFoundError(f"No candidate snapshots in {self.directory}")
+            path = paths[-1]
+        with open(path, 'rb') as f:
+            snapshot = json.loads(gzip.decompress(f.read()))
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is snapshot version {snapshot.get('version')}, "
+                             f"this code reads version {SNAPSHOT_VERSION}")
+        snapshot['path'] = path
+        return snapshot
+
+    @property
+    def digest_path(self) -> str:
+        return os.path.join(self.directory, 'last_digest.json')
+
+    def save_digest(self, digest: Dict):
+        tmp_path = f"{self.digest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(digest, f, default=str)
+        os.replace(tmp_path, self.digest_path)
+
+    def last_digest(self) -> Optional[Dict]:
+        if not os.path.exists(self.digest_path):
+            return None
+        with open(self.digest_path, encoding='utf-8') as f:
+            return json.load(f)
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+ROW_DTYPE = np.dtype([
+    ('url', '<u8'),       # first 8 bytes of the URL's blake2b hash
+    ('seen', '<i4'),      # day the crawl saw the article, days since 1970-01-01
+    ('source', '<u2'),    # index into the partition's sources
+    ('priority', 'u1')
+])
+
+def week_of(day: datetime) -> str:
+    """The ISO week partition a date falls in, e.g. '2026-W42'"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def week_start(week: str) -> datetime:
+    """The Monday an ISO week partition starts on"""
+    return datetime.strptime(f"{week}-1", '%G-W%V-%u')
+
+def url_key(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class TrendHistory:
+    """Columnar history of crawled articles, one directory per ISO week.
+
+    A week holds ``articles.npy`` (one ROW_DTYPE row per article),
+    ``counts.npy`` (keyword match counts as a keyword x article uint16
+    matrix, so each keyword's column is contiguous) and ``meta.json`` (the
+    keyword and source vocabularies). Partitions are memory-mapped when
+    queried, so aggregates over years of weeks read only the columns they
+    use. An article seen again in the same week replaces its earlier row.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # week -> (meta.json mtime, memory-mapped columns); finished weeks never
+        # change, so repeated queries skip reopening them
+        self._cache: Dict[str, tuple] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def weeks(self) -> List[str]:
+        # Partitions being rewritten end in .tmp or .old
+        return sorted(name for name in os.listdir(self.directory)
+                      if '.' not in name and os.path.exists(os.path.join(self.directory, name, 'meta.json')))
+
+    def due(self, day: datetime, interval_weeks: int) -> bool:
+        """Whether a crawl on ``day`` should be recorded: the latest recorded
+        week is at least ``interval_weeks`` before ``day``'s week
+        """
+        weeks = self.weeks()
+        return not weeks or week_start(week_of(day)) - week_start(weeks[-1]) >= timedelta(weeks=interval_weeks)
+
+    def append(self, articles: List[Dict], keywords: Sequence[str], counts: np.ndarray,
+               seen: datetime = None):
+        """Add a crawl's articles with their keyword match counts
+        (``counts[k, i]`` is how often ``keywords[k]`` occurs in article ``i``)
+        """
+        if not articles:
+            return
+        seen = seen or datetime.utcnow()
+        week = week_of(seen)
+        old = self._load(week)
+        sources = list(old['sources']) if old else []
+        for article in articles:
+            if article.get('source') not in sources:
+                sources.append(article.get('source'))
+
+        rows = np.empty(len(articles), dtype=ROW_DTYPE)
+        rows['url'] = [url_key(article['url']) for article in articles]
+        rows['seen'] = (seen - datetime(1970, 1, 1)).days
+        rows['source'] = [sources.index(article.get('source')) for article in articles]
+        rows['priority'] = [min(article.get('priority', 0), 255) for article in articles]
+        counts = np.minimum(np.asarray(counts), np.iinfo(np.uint16).max).astype(np.uint16)
+
+        columns = list(keywords)
+        if old:
+            # Keywords added since the week started count as zero for its earlier rows
+            columns = list(old['keywords']) + [keyword for keyword in columns if keyword not in old['keywords']]
+            counts = np.concatenate([self._align(old['counts'], old['keywords'], columns),
+                                     self._align(counts, keywords, columns)], axis=1)
+            rows = np.concatenate([old['articles'], rows])
+        # Newest row per URL wins
+        _, last = np.unique(rows['url'][::-1], return_index=True)
+        keep = np.sort(len(rows) - 1 - last)
+        self._write(week, rows[keep], counts[:, keep], columns, sources)
+
+    @staticmethod
+    def _align(counts: np.ndarray, keywords: Sequence[str], target: Sequence[str]) -> np.ndarray:
+        """Reorder count rows from ``keywords`` to ``target``, zero-filling missing keywords"""
+        index = {keyword: k for k, keyword in enumerate(keywords)}
+        aligned = np.zeros((len(target), counts.shape[1]), dtype=np.uint16)
+        for k, keyword in enumerate(target):
+            if keyword in index:
+                aligned[k] = counts[index[keyword]]
+        return aligned
+
+    def _write(self, week: str, rows: np.ndarray, counts: np.ndarray, keywords: List[str], sources: List):
+        # Write a fresh directory and swap it in, so readers never see half a week
+        path = os.path.join(self.directory, week)
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        np.save(os.path.join(tmp_path, 'articles.npy'), rows)
+        np.save(os.path.join(tmp_path, 'counts.npy'), np.ascontiguousarray(counts))
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({'keywords': keywords, 'sources': sources, 'rows': len(rows)}, f)
+        old_path = f"{path}.old"
+        if os.path.exists(path):
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    def _load(self, week: str) -> Optional[Dict]:
+        """A week's columns, memory-mapped"""
+        path = os.path.join(self.directory, week)
+        try:
+            mtime = os.stat(os.path.join(path, 'meta.json')).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        cached = self._cache.get(week)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        data = {
+            'keywords': meta['keywords'],
+            'index': {keyword: k for k, keyword in enumerate(meta['keywords'])},
+            'sources': meta['sources'],
+            'articles': np.load(os.path.join(path, 'articles.npy'), mmap_mode='r'),
+            'counts': np.load(os.path.join(path, 'counts.npy'), mmap_mode='r')
+        }
+        self._cache[week] = (mtime, data)
+        return data
+
+    def _select(self, weeks: Optional[Sequence[str]]) -> List[str]:
+        return list(weeks) if weeks is not None else self.weeks()
+
+    def mentions(self, keywords: Sequence[str], weeks: Sequence[str] = None) -> Dict[str, Dict[str, int]]:
+        """Per week, how many articles mention each keyword"""
+        result = {}
+        for week in self._select(weeks):
+            data = self._load(week)
+            if data is None:
+                continue
+            index = data['index']
+            result[week] = {
+                keyword: int(np.count_nonzero(data['counts'][index[keyword]])) if keyword in index else 0
+                for keyword in keywords
+            }
+        return result
+
+    def totals(self, weeks: Sequence[str] = None) -> Dict[str, int]:
+        """Articles recorded per week"""
+        return {week: len(data['articles']) for week in self._select(weeks)
+                for data in [self._load(week)] if data is not None}
+
+    def source_share(self, weeks: Sequence[str] = None) -> Dict[str, Dict[str, float]]:
+        """Per week, each source's share of the articles"""
+        result = {}
+        for week in self._select(weeks):
+            data = self._load(week)
+            if data is None or not len(data['articles']):
+                continue
+            counts = np.bincount(data['articles']['source'], minlength=len(data['sources']))
+            result[week] = {str(source): float(count) / len(data['articles'])
+                            for source, count in zip(data['sources'], counts) if count}
+        return result
+
+    def trends(self, week: str, keywords: Sequence[str], lookback: int = 4, top: int = 3,
+               min_mentions: int = 3) -> List[Dict]:
+        """Keywords mentioned in a larger share of ``week``'s articles
+        than over the ``lookback`` weeks before it, most excess mentions first.
+
+        Each entry has the keyword, this week's mentions, the mentions the
+        earlier share would predict and the change relative to that share
+        (None when the keyword is new).
+        """
+        weeks = self.weeks()
+        previous = [other for other in weeks if other < week][-lookback:]
+        if not previous or week not in weeks:
+            return []
+        keywords = list(dict.fromkeys(keywords))
+        now = self.mentions(keywords, [week])[week]
+        total = self.totals([week])[week]
+        before = self.mentions(keywords, previous)
+        before_total = sum(self.totals(previous).values())
+        if not total or not before_total:
+            return []
+
+        rising = []
+        for keyword in keywords:
+            share = sum(counts[keyword] for counts in before.values()) / before_total
+            expected = share * total
+            if now[keyword] >= min_mentions and now[keyword] > expected:
+                rising.append({
+                    'keyword': keyword,
+                    'mentions': now[keyword],
+                    'expected': round(expected, 1),
+                    'change': (now[keyword] / total) / share - 1 if share else None
+                })
+        rising.sort(key=lambda trend: trend['mentions'] - trend['expected'], reverse=True)
+        return rising[:top]
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with ``extra=`` fields as top-level keys"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + 'Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Readable console lines; ``extra=`` fields are appended as key=value"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s', '%H:%M:%S')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = [f"{key}={value}" for key, value in vars(record).items()
+                  if key not in _RECORD_ATTRS and not key.startswith('_')]
+        return f"{line}  {' '.join(fields)}" if fields else line
+
+def configure_logging(level: str = None, fmt: str = None):
+    """Route all logging to stderr as JSON lines or text.
+
+    Defaults come from LOG_LEVEL (INFO) and LOG_FORMAT (text; ``json`` for
+    machine-readable runs such as CI).
+    """
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _key(name: str, labels: Dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class Metrics:
+    """In-process spans and counters for one run.
+
+    Spans record count, total and max duration per (stage, labels); counters
+    are monotonically increasing totals. Both are cheap enough to leave on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.spans = {}
+            self.counters = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, stage: str, seconds: float, error: bool = False, **labels):
+        key = _key(stage, labels)
+        with self._lock:
+            span = self.spans.setdefault(key, {'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0})
+            span['count'] += 1
+            span['errors'] += int(error)
+            span['total'] += seconds
+            span['max'] = max(span['max'], seconds)
+
+    @contextmanager
+    def span(self, stage: str, **labels):
+        """Time a block; exceptions are counted as errors and re-raised"""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, error, **labels)
+
+    def report(self) -> Dict:
+        """Structured summary of the run so far"""
+        with self._lock:
+            spans = [
+                {'stage': name, 'labels': dict(labels), 'count': s['count'], 'errors': s['errors'],
+                 'total_seconds': round(s['total'], 6), 'max_seconds': round(s['max'], 6)}
+                for (name, labels), s in sorted(self.spans.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+        return {
+            'started': datetime.utcfromtimestamp(self.started).isoformat() + 'Z',
+            'duration_seconds': round(time.time() - self.started, 3),
+            'stages': self._stage_totals(spans),
+            'spans': spans,
+            'counters': counters
+        }
+
+    @staticmethod
+    def _stage_totals(spans: List[Dict]) -> Dict[str, Dict]:
+        totals = {}
+        for span in spans:
+            stage = totals.setdefault(span['stage'], {'count': 0, 'errors': 0, 'total_seconds': 0.0,
+                                                      'max_seconds': 0.0})
+            stage['count'] += span['count']
+            stage['errors'] += span['errors']
+            stage['total_seconds'] = round(stage['total_seconds'] + span['total_seconds'], 6)
+            stage['max_seconds'] = max(stage['max_seconds'], span['max_seconds'])
+        return totals
+
+    def prometheus(self, prefix: str = 'radbot') -> str:
+        """Prometheus text exposition format (for the node_exporter textfile collector)"""
+        report = self.report()
+        lines = [
+            f'# HELP {prefix}_stage_seconds Time spent per pipeline stage',
+            f'# TYPE {prefix}_stage_seconds summary'
+        ]
+        for span in report['spans']:
+            labels = _format_labels({'stage': span['stage'], **span['labels']})
+            lines.append(f'{prefix}_stage_seconds_sum{labels} {span["total_seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{labels} {span["count"]}')
+        lines.append(f'# TYPE {prefix}_stage_max_seconds gauge')
+        for span in report['spans']:
+            labels = _format_labels({'stage': span['stage'], **span['labels']})
+            lines.append(f'{prefix}_stage_max_seconds{labels} {span["max_seconds"]}')
+        lines.append(f'# TYPE {prefix}_stage_errors_total counter')
+        for span in report['spans']:
+            labels = _format_labels({'stage': span['stage'], **span['labels']})
+            lines.append(f'{prefix}_stage_errors_total{labels} {span["errors"]}')
+
+        typed = set()
+        for counter in report['counters']:
+            name = f'{prefix}_{counter["name"]}_total'
+            if name not in typed:
+                lines.append(f'# TYPE {name} counter')
+                typed.add(name)
+            lines.append(f'{name}{_format_labels(counter["labels"])} {counter["value"]}')
+
+        lines.append(f'# TYPE {prefix}_run_duration_seconds gauge')
+        lines.append(f'{prefix}_run_duration_seconds {report["duration_seconds"]}')
+        lines.append(f'# TYPE {prefix}_run_timestamp_seconds gauge')
+        lines.append(f'{prefix}_run_timestamp_seconds {int(self.started)}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str, name: str = 'run') -> Dict[str, str]:
+        """Write ``<name>_report.json`` and ``<name>.prom`` atomically"""
+        os.makedirs(directory, exist_ok=True)
+        paths = {
+            'report': os.path.join(directory, f'{name}_report.json'),
+            'prometheus': os.path.join(directory, f'{name}.prom')
+        }
+        _write_atomic(paths['report'], json.dumps(self.report(), indent=2))
+        _write_atomic(paths['prometheus'], self.prometheus())
+        return paths
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+def _write_atomic(path: str, content: str):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+# Process-wide registry shared by every stage
+metrics = Metrics()
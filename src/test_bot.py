@@ -1,44 +1,95 @@
+import argparse
 import asyncio
+import difflib
 import os
 from datetime import datetime
 import pytz
 from src.aggregator.news_aggregator import NewsAggregator
+from src.config import CONFIG
+from src.filters.profiles import get_profiles
+from src.image_generator import render_batch
 from src.post_formatter import PostFormatter
+from src.storage.page_fingerprints import PageFingerprints
+from src.storage.response_archive import ResponseArchive
+from src.storage.snapshot import CandidateSnapshots
+from src.storage.trend_history import TrendHistory
+from src.profiling import add_profile_arguments, make_profiler, stage
+from src.telemetry import configure_logging, metrics
 
-async def test_news_gathering():
-    """Test news gathering functionality with detailed logging"""
+async def test_news_gathering(profiler=None, snapshot=None):
+    """Test news gathering functionality with detailed logging.
+
+    With ``snapshot`` (a path, or 'latest') the candidates of an earlier crawl
+    are replayed instead of crawling.
+    """
     print('\n=== Testing News Gathering ===')
     
     try:
         # Initialize components
         print('Initializing components...')
-        aggregator = NewsAggregator()
-        formatter = PostFormatter()
-        
-        # Test credentials
-        print('\nChecking credentials...')
-        if os.getenv('MODERN_HEALTHCARE_USERNAME'):
-            print('Modern Healthcare username is set')
-        if os.getenv('MODERN_HEALTHCARE_PASSWORD'):
-            print('Modern Healthcare password is set')
-            
-        # Gather news
-        print('\nGathering news from all sources...')
-        news = await aggregator.gather_news()
+        archive = ResponseArchive(CONFIG['response_archive_dir']) if CONFIG['archive_responses'] and not snapshot else None
+        snapshots = CandidateSnapshots(CONFIG['snapshot_dir']) if CONFIG['candidate_snapshots'] or snapshot else None
+        fingerprints = PageFingerprints(CONFIG['fingerprint_path']) if CONFIG['listing_fingerprints'] else None
+        history = TrendHistory(CONFIG['history_dir']) if CONFIG['trend_history'] else None
+        aggregator = NewsAggregator(archive, snapshots=None if snapshot else snapshots, fingerprints=fingerprints,
+                                    history=None if snapshot else history)
+        formatter = PostFormatter(history if CONFIG['post_trends'] else None)
+        profiles = get_profiles(CONFIG['digest_profiles'])
         
-        # Generate test post
-        print('\nGenerating post preview...')
+        if snapshot:
+            candidates = snapshots.load(None if snapshot == 'latest' else snapshot)
+            print(f"\nReplaying {len(candidates['articles'])} candidates from {candidates['path']} "
+                  f"(crawled {candidates['created']})")
+            if candidates['meta'].get('planned'):
+                print('Note: crawled with the crawl planner, so sources that could not change that '
+                      "run's digest are missing; set CRAWL_PLANNER=false when taking snapshots for tuning")
+            with stage(profiler, 'replay'):
+                digests = aggregator.replay(candidates, profiles)
+        else:
+            # Test credentials
+            print('\nChecking credentials...')
+            if os.getenv('MODERN_HEALTHCARE_USERNAME'):
+                print('Modern Healthcare username is set')
+            if os.getenv('MODERN_HEALTHCARE_PASSWORD'):
+                print('Modern Healthcare password is set')
+
+            # Gather news
+            print('\nGathering news from all sources...')
+            with stage(profiler, 'gather'):
+                digests = await aggregator.gather_profiles(profiles)
+            print(f"Total sources checked: {len(aggregator.scrapers)}")
         current_date = datetime.now(pytz.timezone('US/Eastern'))
-        post_content = formatter.format_post(news, current_date)
+
+        with stage(profiler, 'cover'):
+            image_paths = render_batch([{'date': current_date, 'title': profile.title} for profile in profiles])
+        for profile, image_path in zip(profiles, image_paths):
+            print(f"Cover image for '{profile.name}': {image_path}")
         
-        # Print results summary
         print('\n=== Results Summary ===')
-        print(f"Total sources checked: {len(aggregator.scrapers)}")
-        print(f"Radiology AI articles found: {len(news.get('radiology', []))}")
-        print(f"Healthcare AI articles found: {len(news.get('healthcare', []))}")
-        
-        print('\n=== Generated Post Preview ===')
-        print(post_content)
+        preview = {}
+        for profile in profiles:
+            news = digests[profile.name]
+            
+            # Generate test post
+            print(f"\nGenerating post preview for profile '{profile.name}'...")
+            with stage(profiler, 'format'):
+                post_content = formatter.format_post(news, current_date, profile)
+            
+            # Print results summary
+            print(f"{profile.domain_section.capitalize()} AI articles found: {len(news.get(profile.domain_section, []))}")
+            print(f"Healthcare AI articles found: {len(news.get('healthcare', []))}")
+            
+            print('\n=== Generated Post Preview ===')
+            print(post_content)
+            preview[profile.name] = {
+                'sections': {section: [{'title': article['title'], 'url': article['url']} for article in articles]
+                             for section, articles in news.items()},
+                'post': post_content
+            }
+
+        if snapshots is not None:
+            print_digest_diff(snapshots.last_digest(), preview)
+            snapshots.save_digest(preview)
         
         return True
 
@@ -48,6 +99,65 @@ async def test_news_gathering():
         print(traceback.format_exc())
         return False
 
+def print_digest_diff(previous, current):
+    """Print what changed since the previous preview: articles per section, then the post text"""
+    print('\n=== Changes Since Previous Preview ===')
+    if previous is None:
+        print('No previous preview to compare with')
+        return
+    changed = False
+    for name, digest in current.items():
+        old = previous.get(name)
+        if old is None:
+            print(f"[{name}] new profile")
+            changed = True
+            continue
+        for section, articles in digest['sections'].items():
+            old_urls = [article['url'] for article in old['sections'].get(section, [])]
+            new_urls = [article['url'] for article in articles]
+            titles = {article['url']: article['title']
+                      for article in old['sections'].get(section, []) + articles}
+            lines = [f"  + {titles[url]}" for url in new_urls if url not in old_urls]
+            lines += [f"  - {titles[url]}" for url in old_urls if url not in new_urls]
+            lines += [f"  ~ {titles[url]} (#{old_urls.index(url) + 1} -> #{position + 1})"
+                      for position, url in enumerate(new_urls)
+                      if url in old_urls and old_urls.index(url) != position]
+            if lines:
+                print(f"[{name}] {section}:")
+                print('\n'.join(lines))
+                changed = True
+        post_diff = list(difflib.unified_diff(old['post'].splitlines(), digest['post'].splitlines(),
+                                              'previous', 'current', n=0, lineterm=''))
+        if post_diff:
+            print(f"[{name}] post:")
+            print('\n'.join(post_diff))
+            changed = True
+    if not changed:
+        print('No changes')
+
+def print_stage_summary(report):
+    """Print where the run spent its time, slowest stage first"""
+    print('\n=== Stage Timings ===')
+    stages = sorted(report['stages'].items(), key=lambda item: item[1]['total_seconds'], reverse=True)
+    for stage, totals in stages:
+        print(f"{stage:10s} {totals['total_seconds']:8.3f}s total  {totals['max_seconds']:8.3f}s max  "
+              f"{totals['count']:5d} calls  {totals['errors']} errors")
+
 if __name__ == "__main__":
-    success = asyncio.run(test_news_gathering())
+    parser = argparse.ArgumentParser(description='Preview the digest for every configured profile')
+    parser.add_argument('--from-snapshot', nargs='?', const='latest', metavar='PATH',
+                        help='Re-rank a saved candidate snapshot (default: the latest) instead of crawling')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    configure_logging('DEBUG' if os.getenv('DEBUG_MODE') == 'true' else None)
+
+    profiler = make_profiler(args.profile, CONFIG['profile_dir'], 'test', args.profile_interval)
+    if profiler:
+        with profiler.run():
+            success = asyncio.run(test_news_gathering(profiler, args.from_snapshot))
+    else:
+        success = asyncio.run(test_news_gathering(snapshot=args.from_snapshot))
+    print_stage_summary(metrics.report())
+    paths = metrics.write(CONFIG['metrics_dir'], 'test')
+    print(f"Run report: {paths['report']}")
     exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""Query the weekly trend history recorded by each crawl.
+
+    PYTHONPATH=. python src/trends.py mentions mammography fda --weeks 12
+    PYTHONPATH=. python src/trends.py sources --weeks 4
+    PYTHONPATH=. python src/trends.py rising --profile radiology
+"""
+import argparse
+import json
+from datetime import datetime
+from src.config import CONFIG
+from src.filters.profiles import get_profile
+from src.storage.trend_history import TrendHistory, week_of
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Query the weekly trend history')
+    parser.add_argument('--weeks', type=int, help='Only the most recent N weeks')
+    commands = parser.add_subparsers(dest='command', required=True)
+    mentions = commands.add_parser('mentions', help='Articles mentioning each keyword per week')
+    mentions.add_argument('keywords', nargs='+')
+    commands.add_parser('sources', help="Each source's share of the articles per week")
+    rising = commands.add_parser('rising', help="Keywords rising in a week's crawls")
+    rising.add_argument('--profile', default='radiology')
+    rising.add_argument('--week', help='ISO week, e.g. 2026-W42 (default: this week)')
+    rising.add_argument('--lookback', type=int, default=4)
+    rising.add_argument('--top', type=int, default=10)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    history = TrendHistory(CONFIG['history_dir'])
+    weeks = history.weeks()[-args.weeks:] if args.weeks else None
+    if args.command == 'mentions':
+        result = history.mentions([keyword.lower() for keyword in args.keywords], weeks)
+    elif args.command == 'sources':
+        result = history.source_share(weeks)
+    else:
+        filter_ = get_profile(args.profile).content_filter
+        result = history.trends(args.week or week_of(datetime.utcnow()),
+                                filter_.rad_keywords + filter_.healthcare_keywords,
+                                lookback=args.lookback, top=args.top)
+    print(json.dumps(result, indent=2))